@@ -0,0 +1,54 @@
+import os, sys, json, time
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+from safetensors_file import SafeTensorsFile
+
+# Compares header parsing in SafeTensorsFile.open() with the old two-pass approach, which
+# parsed the header once to collect key names for the duplicate check, then again to build
+# the dict. Run it with: python benchmark/bench_header_parse.py [number of tensors ...]
+
+def make_header(ntensors:int) -> bytes:
+    js={"__metadata__":{"ss_network_module":"networks.lora","ss_tag_frequency":json.dumps({"tag%d"%i:i for i in range(1000)})}}
+    offset:int=0
+    for i in range(ntensors):
+        shape=[320,(i%8)+1]
+        nbytes=2*shape[0]*shape[1]
+        js[f"lora_unet_down_blocks_{i%4}_attentions_{i%2}_transformer_blocks_{i}_attn1_to_k.lora_down.weight"]={"dtype":"F16","shape":shape,"data_offsets":[offset,offset+nbytes]}
+        offset+=nbytes
+    return json.dumps(js,separators=(',',':')).encode('utf-8')
+
+def two_pass_parse(hdrbuf:bytes) -> dict:
+    def parse_object_pairs(pairs):
+        return [k for k,_ in pairs]
+    keys=json.loads(hdrbuf,object_pairs_hook=parse_object_pairs)
+    d={}
+    for k in keys:
+        if k in d: d[k]=d[k]+1
+        else: d[k]=1
+    return json.loads(hdrbuf)
+
+def single_pass_parse(hdrbuf:bytes) -> dict:
+    s=SafeTensorsFile()
+    s.filename="<benchmark>"
+    s.hdrbuf=hdrbuf
+    s._ParseHeader()
+    return s.header
+
+def best_of(fn,arg,repeat:int=5) -> float:
+    best=float("inf")
+    for _ in range(repeat):
+        t0=time.perf_counter()
+        fn(arg)
+        best=min(best,time.perf_counter()-t0)
+    return best
+
+def main(sizes:list[int]):
+    print(f"{'tensors':>8} {'header bytes':>13} {'two-pass ms':>12} {'single-pass ms':>15} {'speedup':>8}")
+    for n in sizes:
+        hdrbuf=make_header(n)
+        assert two_pass_parse(hdrbuf)==single_pass_parse(hdrbuf)
+        t2=best_of(two_pass_parse,hdrbuf)
+        t1=best_of(single_pass_parse,hdrbuf)
+        print(f"{n:>8} {len(hdrbuf):>13} {t2*1000:>12.2f} {t1*1000:>15.2f} {t2/t1:>7.2f}x")
+
+if __name__ == '__main__':
+    main([int(x) for x in sys.argv[1:]] or [100,1000,10000,100000])
@@ -0,0 +1,133 @@
+import os, sys, re, time, tempfile, threading, http.server
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+from safetensors_file import SafeTensorsFile, read_at
+import safetensors_http
+try:
+    from benchmark import synth
+except ImportError: #run as a script
+    import synth
+
+# Reads synthetic files through safetensors_http from a local server that supports Range
+# requests, and checks that headers and tensor data are the same as in the local files,
+# and how many requests and bytes that takes. The stdlib http.server ignores Range, so
+# the server here answers them itself; it can also redirect, and be told to ignore Range,
+# which must give a clear error instead of wrong data. Run it with:
+#
+#   python benchmark/bench_http.py
+
+CASES={ #name: (tensors, data bytes, tags in ss_tag_frequency)
+    "t100_1MB":(100,1<<20,0),
+    "t1000_16MB":(1000,16<<20,0),
+    "tags200k":(1000,1<<20,200000), #header much bigger than the prefetch
+}
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version="HTTP/1.1" #keep-alive, like real servers
+    disable_nagle_algorithm=True #headers and body are separate writes
+    root:str=None
+    ranges:bool=True
+
+    def log_message(self,*args):
+        pass
+
+    def _empty(self,status:int,headers:dict={}):
+        self.send_response(status)
+        for k,v in headers.items(): self.send_header(k,v)
+        self.send_header("Content-Length","0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.startswith("/redirect/"):
+            return self._empty(302,{"Location":self.path[len("/redirect"):]})
+        fn=os.path.join(self.root,os.path.basename(self.path))
+        if not os.path.isfile(fn): return self._empty(404)
+        size:int=os.path.getsize(fn)
+        m=re.fullmatch(r"bytes=(\d+)-(\d+)",self.headers.get("Range",""))
+        if m is None or not self.ranges:
+            self.send_response(200)
+            self.send_header("Content-Length",str(size))
+            self.end_headers()
+            with open(fn,"rb") as f:
+                try:
+                    while buf:=f.read(1<<20): self.wfile.write(buf)
+                except (BrokenPipeError,ConnectionResetError): #client took what it needed
+                    self.close_connection=True
+            return
+        start,end=int(m.group(1)),min(int(m.group(2)),size-1)
+        if start>=size: return self._empty(416,{"Content-Range":f"bytes */{size}"})
+        self.send_response(206)
+        self.send_header("Content-Range",f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length",str(end-start+1))
+        self.end_headers()
+        with open(fn,"rb") as f:
+            f.seek(start)
+            self.wfile.write(f.read(end-start+1))
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads=True
+
+    def handle_error(self,request,client_address):
+        if isinstance(sys.exc_info()[1],ConnectionError): return #client closed a connection it didn't read to the end
+        super().handle_error(request,client_address)
+
+def start_server(root:str,ranges:bool=True) -> http.server.ThreadingHTTPServer:
+    '''Serves the files in directory root on a free port of 127.0.0.1, in a thread.'''
+    handler=type("Handler",(_Handler,),{"root":root,"ranges":ranges})
+    server=_Server(("127.0.0.1",0),handler)
+    threading.Thread(target=server.serve_forever,daemon=True).start()
+    return server
+
+def check_file(fn:str,url:str) -> tuple[float,int,int]:
+    '''Reads header and all tensors of url, compares them with local file fn. Returns time,
+    requests and bytes received.'''
+    t0=time.perf_counter()
+    s=SafeTensorsFile.open_file(url,quiet=True)
+    header=s.get_header()
+    with open(fn,"rb") as f:
+        local=SafeTensorsFile.open_file(fn,quiet=True)
+        assert header==local.get_header(),f"{url}: header differs"
+        for k,v in header.items():
+            if k=="__metadata__": continue
+            o=v['data_offsets']
+            assert read_at(s.f,o[1]-o[0],8+s.headerlen+o[0])==read_at(f,o[1]-o[0],8+local.headerlen+o[0]),f"{url}: {k} differs"
+        local.close_file()
+    requests,received=s.f.requests,s.f.bytes_received
+    s.close_file()
+    return time.perf_counter()-t0,requests,received
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        for name,(ntensors,data_bytes,tags) in CASES.items():
+            synth.make_file(os.path.join(workdir,name+".safetensors"),ntensors,data_bytes,tags,fill=True)
+        server=start_server(workdir)
+        norange=start_server(workdir,ranges=False)
+        base=f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            print(f"{'file':<14} {'header req':>10} {'total req':>10} {'MB recv':>8} {'ms':>8}")
+            for name in CASES:
+                fn=os.path.join(workdir,name+".safetensors")
+                s=SafeTensorsFile.open_file(f"{base}/{name}.safetensors",quiet=True)
+                s.get_header()
+                header_requests=s.f.requests
+                s.close_file()
+                t,requests,received=check_file(fn,f"{base}/redirect/{name}.safetensors")
+                print(f"{name:<14} {header_requests:>10} {requests:>10} {received/(1<<20):>8.1f} {t*1000:>8.1f}")
+
+            # a server that ignores Range: the header still comes with the first response,
+            # reading past it must fail with a clear error
+            s=SafeTensorsFile.open_file(f"http://127.0.0.1:{norange.server_address[1]}/t100_1MB.safetensors",quiet=True)
+            s.get_header()
+            try:
+                read_at(s.f,1<<20,8+s.headerlen)
+                raise AssertionError("read past the first response of a server without Range support")
+            except OSError as e:
+                assert "does not support Range requests" in str(e),e
+            s.close_file()
+            print("server without Range support: header read, data read raises a clear error")
+        finally:
+            safetensors_http.close_connections()
+            server.shutdown()
+            norange.shutdown()
+
+if __name__ == '__main__':
+    main()
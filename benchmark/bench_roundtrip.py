@@ -0,0 +1,157 @@
+import os, sys, json, time, shutil, hashlib, filecmp, tempfile, subprocess
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+from safetensors_file import SafeTensorsFile
+import safetensors_store
+try:
+    from benchmark import synth
+except ImportError: #run as a script
+    import synth
+
+# Runs the commands that delete or replace files the user has, through the command line
+# like a user would, on synthetic files, and checks that nothing is lost: dedup add -r and
+# restore give back the files byte for byte, also after an object in the store was
+# damaged, and writemd -i and patchmd change the metadata but not the tensors, whether
+# the new header fits in place or the file is rewritten. Prints the time of every step.
+# Run it with:
+#
+#   python benchmark/bench_roundtrip.py
+
+UTIL=os.path.join(os.path.dirname(os.path.abspath(__file__)),"..","safetensors_util.py")
+
+FILES={ #name: (tensors, data bytes, tags in ss_tag_frequency)
+    "a":(100,8<<20,0),
+    "b":(100,8<<20,0), #same tensors as a
+    "c":(300,8<<20,1000),
+}
+
+def run(*args,ok:bool=True) -> tuple[float,str]:
+    '''Runs safetensors_util.py with args, checks that it succeeds (or fails if not ok),
+    returns the time it took and its output.'''
+    t0=time.perf_counter()
+    r=subprocess.run([sys.executable,UTIL,"-q",*args],capture_output=True,text=True)
+    t=time.perf_counter()-t0
+    if (r.returncode==0)!=ok:
+        raise AssertionError(f"{' '.join(args)}: exit code {r.returncode}\n{r.stdout}{r.stderr}")
+    return t,r.stdout
+
+def tensors(fn:str) -> tuple[dict,dict,str]:
+    '''Returns metadata, tensor entries of the header and sha256 of the data section.'''
+    s=SafeTensorsFile.open_file(fn,quiet=True)
+    header=dict(s.get_header())
+    md=header.pop("__metadata__",{})
+    h=hashlib.sha256()
+    with open(fn,"rb") as f:
+        f.seek(8+s.headerlen)
+        while buf:=f.read(1<<20): h.update(buf)
+    s.close_file()
+    return md,header,h.hexdigest()
+
+def same_files(a:str,b:str) -> bool:
+    return filecmp.cmp(a,b,shallow=False)
+
+def no_leftovers(d:str):
+    left=[fn for fn in os.listdir(d) if os.path.isfile(os.path.join(d,fn)) and not fn.endswith((".safetensors",safetensors_store.MANIFEST_SUFFIX,".json"))]
+    assert len(left)==0,f"{d}: files left behind: {left}"
+
+def report(step:str,result:tuple[float,str]):
+    t,_=result
+    print(f"{step:<52} {t*1000:>8.1f} ms")
+
+def check_dedup(workdir:str):
+    orig=os.path.join(workdir,"orig")
+    lib=os.path.join(workdir,"lib")
+    store=os.path.join(workdir,"store")
+    shutil.copytree(orig,lib)
+    names=[n+".safetensors" for n in FILES]
+
+    report("dedup add",run("dedup","add",store,lib))
+    for n in names:
+        assert same_files(os.path.join(orig,n),os.path.join(lib,n)),f"{n} changed by dedup add"
+    report("dedup add -r, files already in store",run("dedup","add","-r",store,lib))
+    for n in names:
+        assert not os.path.exists(os.path.join(lib,n)),f"{n} not removed by dedup add -r"
+    report("dedup restore",run("dedup","restore",store,lib))
+    for n in names:
+        assert same_files(os.path.join(orig,n),os.path.join(lib,n)),f"{n} differs after restore"
+    no_leftovers(lib)
+
+    # damage one object of a (and b, which has the same tensors): restore must fail
+    # without touching the output, add -r of the good file must repair it
+    manifest=safetensors_store.read_manifest(os.path.join(lib,"a.safetensors"+safetensors_store.MANIFEST_SUFFIX))
+    sha256=next(p["sha256"] for p in manifest["parts"] if "sha256" in p)
+    path=safetensors_store.TensorStore(store).object_path(sha256)
+    with open(path,"r+b") as f:
+        b=f.read(1)
+        f.seek(0)
+        f.write(bytes([b[0]^1]))
+    a=os.path.join(lib,"a.safetensors")
+    report("dedup restore -f, damaged object (fails)",run("dedup","restore","-f",store,a+safetensors_store.MANIFEST_SUFFIX,ok=False))
+    assert same_files(os.path.join(orig,"a.safetensors"),a),"a.safetensors changed by a failed restore"
+    no_leftovers(lib)
+    report("dedup add -r, repairs damaged object",run("dedup","add","-r",store,a))
+    assert not os.path.exists(a),"a.safetensors not removed by dedup add -r"
+    assert safetensors_store.TensorStore(store).check_object(path,sha256,os.path.getsize(path)),"damaged object not repaired"
+    b=os.path.join(lib,"b.safetensors")
+    os.remove(b)
+    report("dedup restore after repair",run("dedup","restore",store,a+safetensors_store.MANIFEST_SUFFIX,b+safetensors_store.MANIFEST_SUFFIX))
+    for n in names:
+        assert same_files(os.path.join(orig,n),os.path.join(lib,n)),f"{n} differs after restore"
+    no_leftovers(lib)
+    no_leftovers(os.path.join(store,"tmp"))
+
+def check_writemd(workdir:str):
+    src=os.path.join(workdir,"orig","c.safetensors")
+    fn=os.path.join(workdir,"w.safetensors")
+    meta=os.path.join(workdir,"meta.json")
+    _,entries,data=tensors(src)
+    with open(meta,"wt") as f:
+        json.dump({"__metadata__":{"title":"reserved"}},f)
+    report("writemd -r 4096, new file",run("writemd","-r","4096",src,meta,fn))
+    for step,md,rewritten in (("writemd -i, header fits",{"title":"in place","x":"y"},False),
+                              ("writemd -i, header doesn't fit",{"big":"x"*65536},True)):
+        with open(meta,"wt") as f:
+            json.dump({"__metadata__":md},f)
+        size=os.path.getsize(fn)
+        report(step,run("writemd","-i",fn,meta))
+        assert (os.path.getsize(fn)!=size)==rewritten,f"{step}: file was rewritten or not"
+        assert tensors(fn)==(md,entries,data),f"{step}: wrong metadata or tensors"
+    no_leftovers(workdir)
+
+def check_patchmd(workdir:str):
+    d=os.path.join(workdir,"patch")
+    shutil.copytree(os.path.join(workdir,"orig"),d)
+    before={n:tensors(os.path.join(d,n+".safetensors")) for n in FILES}
+    copies={n:os.path.join(workdir,n+".copy") for n in FILES}
+    for n in FILES: shutil.copyfile(os.path.join(d,n+".safetensors"),copies[n])
+    report("patchmd -n",run("patchmd","-n","--set","x=y",d))
+    for n in FILES:
+        assert same_files(os.path.join(d,n+".safetensors"),copies[n]),f"{n} changed by patchmd -n"
+
+    patch=os.path.join(d,"patch.json")
+    with open(patch,"wt") as f:
+        json.dump({"ss_network_dim":None,"big":"x"*65536},f)
+    for step,args,method in (("patchmd --rename --set -r, header doesn't fit",["--rename","ss_output_name=name","--set","x="+"y"*100,"-r","70000"],"rewritten"),
+                             ("patchmd -p, header fits in reserve",["-p",patch],"in place")):
+        result=run("patchmd",*args,d)
+        report(step,result)
+        methods={json.loads(line).get("method") for line in result[1].splitlines()}
+        assert methods=={method},f"{step}: files {methods}, not {method}"
+        for n in FILES:
+            md,entries,data=tensors(os.path.join(d,n+".safetensors"))
+            assert (entries,data)==before[n][1:],f"{step}: tensors of {n} changed"
+            assert md.get("x")=="y"*100 and "ss_output_name" not in md and md.get("name")=="synthetic",f"{step}: wrong metadata of {n}"
+    assert all("ss_network_dim" not in tensors(os.path.join(d,n+".safetensors"))[0] for n in FILES),"patch not applied"
+    no_leftovers(d)
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        os.mkdir(os.path.join(workdir,"orig"))
+        for name,(ntensors,data_bytes,tags) in FILES.items():
+            synth.make_file(os.path.join(workdir,"orig",name+".safetensors"),ntensors,data_bytes,tags,fill=True)
+        check_dedup(workdir)
+        check_writemd(workdir)
+        check_patchmd(workdir)
+    print("all files round-tripped byte for byte")
+
+if __name__ == '__main__':
+    main()
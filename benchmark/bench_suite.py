@@ -0,0 +1,185 @@
+import os, sys, json, time, platform, subprocess, tempfile
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+from safetensors_file import SafeTensorsFile, pad_header
+import safetensors_worker
+try:
+    from benchmark import synth
+except ImportError: #run as a script
+    import synth
+
+# Times the main code paths on synthetic files and saves the results as JSON, so runs on
+# different commits can be compared. Every operation runs in a child process of its own,
+# so its peak RSS isn't hidden by an earlier, bigger one. Times are the best of a few
+# runs with a warm page cache.
+#
+#   python benchmark/bench_suite.py -o before.json
+#   python benchmark/bench_suite.py -o after.json --compare before.json
+
+CASES={ #name: (tensors, data bytes, tags in ss_tag_frequency, nesting depth of ss_dataset_dirs)
+    "t100_1MB":(100,1<<20,0,0),
+    "t1000_100MB":(1000,100<<20,0,0),
+    "t10000_100MB":(10000,100<<20,0,0),
+    "t100000_1GB":(100000,1<<30,0,0),
+    "tags200k":(1000,10<<20,200000,0),
+    "nested8":(100,1<<20,0,8),
+}
+LARGE_CASES={
+    "t1000_50GB":(1000,50<<30,1000,2),
+}
+OPS=["open","parse","PrintHeader","PrintMetadata","ExtractData","WriteMetadataToHeader","copy_data_to_file"]
+COPY_OPS={"WriteMetadataToHeader","copy_data_to_file"} #write the whole data section
+
+# every op returns a function that does the work once, and the number of bytes it handles
+def _op_open(fn:str,tmpdir:str):
+    def run():
+        SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False).close_file()
+    s=SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False)
+    return run,8+s.headerlen
+
+def _op_parse(fn:str,tmpdir:str):
+    s=SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False)
+    def run():
+        s.header=None
+        s._ParseHeader()
+    return run,s.headerlen
+
+def _op_PrintHeader(fn:str,tmpdir:str):
+    s=SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False)
+    return lambda:safetensors_worker.PrintHeader({'quiet':True,'format':"json"},fn),s.headerlen
+
+def _op_PrintMetadata(fn:str,tmpdir:str):
+    s=SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False)
+    return lambda:safetensors_worker.PrintMetadata({'quiet':True,'parse_more':True},fn),s.headerlen
+
+def _op_ExtractData(fn:str,tmpdir:str):
+    with SafeTensorsFile.open_file(fn,quiet=True) as s:
+        js=s.get_header()
+        key=max((k for k in js if k!="__metadata__"),key=lambda k:js[k]['data_offsets'][1]-js[k]['data_offsets'][0])
+        o=js[key]['data_offsets']
+    out=os.path.join(tmpdir,"tensor.bin")
+    return lambda:safetensors_worker.ExtractData({'quiet':True,'force_overwrite':True},fn,key,out),o[1]-o[0]
+
+def _op_WriteMetadataToHeader(fn:str,tmpdir:str):
+    with SafeTensorsFile.open_file(fn,quiet=True) as s:
+        md=dict(s.get_metadata() or {},ss_benchmark="1")
+    md_file=os.path.join(tmpdir,"metadata.json")
+    with open(md_file,"w",encoding="utf-8") as f:
+        json.dump({"__metadata__":md},f)
+    out=os.path.join(tmpdir,"out.safetensors")
+    cmdLine={'quiet':True,'force_overwrite':True,'in_place':False,'reserve':0}
+    return lambda:safetensors_worker.WriteMetadataToHeader(cmdLine,fn,md_file,out),os.path.getsize(fn)
+
+def _op_copy_data_to_file(fn:str,tmpdir:str):
+    out=os.path.join(tmpdir,"out.safetensors")
+    def run():
+        with SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False) as s, open(out,"wb") as fo:
+            fo.write(pad_header(s.hdrbuf))
+            s.copy_data_to_file(fo)
+    with SafeTensorsFile.open_file(fn,quiet=True,parseHeader=False) as s:
+        return run,s.st.st_size-8-s.headerlen
+
+def _peak_rss_mb() -> float:
+    # on Linux, ru_maxrss survives fork and exec, so a child would report the parent's peak
+    try:
+        with open("/proc/self/status","rt") as f:
+            for line in f:
+                if line.startswith("VmHWM:"): return int(line.split()[1])/1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError: #Windows
+        return None
+    rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss/(1024*1024) if sys.platform=="darwin" else rss/1024 #bytes on macOS, KB on Linux
+
+def child(op:str,fn:str,tmpdir:str,repeat:int):
+    '''Runs one op in this process and prints its result as JSON on the original stdout.'''
+    result_fd=os.dup(1)
+    devnull=os.open(os.devnull,os.O_WRONLY)
+    os.dup2(devnull,1) #the worker functions print their output
+    sys.stdout=open(1,"w",closefd=False)
+    run,nbytes=globals()["_op_"+op](fn,tmpdir)
+    best=float("inf")
+    for _ in range(repeat):
+        t0=time.perf_counter()
+        run()
+        best=min(best,time.perf_counter()-t0)
+    sys.stdout.flush()
+    os.write(result_fd,json.dumps({"seconds":best,"bytes":nbytes,"peak_rss_mb":_peak_rss_mb()}).encode()+b"\n")
+
+def _git_commit() -> str:
+    try:
+        r=subprocess.run(["git","rev-parse","--short","HEAD"],capture_output=True,text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+        return r.stdout.strip() or None
+    except OSError:
+        return None
+
+def run_suite(cases:dict,ops:list[str],workdir:str,repeat:int,max_copy_bytes:int,fill:bool) -> list[dict]:
+    results=[]
+    for name,(ntensors,data_bytes,tags,depth) in cases.items():
+        fn=os.path.join(workdir,name+".safetensors")
+        t0=time.perf_counter()
+        size=synth.make_file(fn,ntensors,data_bytes,tags,depth,fill)
+        print(f"{name}: {size} bytes, generated in {time.perf_counter()-t0:.1f} s",file=sys.stderr)
+        for op in ops:
+            if op in COPY_OPS and data_bytes>max_copy_bytes:
+                print(f"  {op:<22} skipped, data section bigger than --max-copy-mb",file=sys.stderr)
+                continue
+            r=subprocess.run([sys.executable,os.path.abspath(__file__),"--child",op,fn,workdir,str(repeat)],
+                             capture_output=True,text=True)
+            if r.returncode!=0:
+                print(f"  {op:<22} failed:\n{r.stderr}",file=sys.stderr)
+                continue
+            rec=json.loads(r.stdout.strip().splitlines()[-1])
+            rec={"case":name,"op":op,**rec,"mb_per_s":rec["bytes"]/(1<<20)/rec["seconds"] if rec["seconds"]>0 else None}
+            print(f"  {op:<22} {rec['seconds']*1000:>10.2f} ms {rec['mb_per_s'] or 0:>10.1f} MB/s {rec['peak_rss_mb'] or 0:>8.1f} MB peak RSS",file=sys.stderr)
+            results.append(rec)
+        os.remove(fn)
+    return results
+
+def compare(results:list[dict],baseline_file:str,threshold:float):
+    '''Prints time ratios against an earlier run, marks ops that got slower than threshold
+    and more than 1 ms slower.'''
+    with open(baseline_file,"rt",encoding="utf-8") as f:
+        old={(r["case"],r["op"]):r for r in json.load(f)["results"]}
+    print(f"\n{'case':<14} {'op':<22} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    for r in results:
+        o=old.get((r["case"],r["op"]))
+        if o is None: continue
+        ratio=r["seconds"]/o["seconds"] if o["seconds"]>0 else float("inf")
+        mark=" REGRESSION" if ratio>1+threshold and r["seconds"]-o["seconds"]>0.001 else "" #ignore noise of tiny ops
+        print(f"{r['case']:<14} {r['op']:<22} {o['seconds']*1000:>10.2f} {r['seconds']*1000:>10.2f} {ratio:>6.2f}x{mark}")
+
+def main():
+    import argparse
+    ap=argparse.ArgumentParser(description="time safetensors_util code paths on synthetic files")
+    ap.add_argument("-o","--output",help="save results to this JSON file")
+    ap.add_argument("--compare",metavar="JSON_FILE",help="compare with the results of an earlier run")
+    ap.add_argument("--threshold",type=float,default=0.1,help="report ops more than this much slower, 0.1 is 10%%")
+    ap.add_argument("--case",action="append",help="run only this case, can be used multiple times")
+    ap.add_argument("--op",action="append",choices=OPS,help="run only this op, can be used multiple times")
+    ap.add_argument("--large",action="store_true",help="also run cases with tens of GB of (sparse) data")
+    ap.add_argument("--fill",action="store_true",help="write random data instead of sparse data sections")
+    ap.add_argument("--max-copy-mb",type=int,default=2048,help="skip ops that copy the data section of bigger files")
+    ap.add_argument("--repeat",type=int,default=5,help="run every op this many times, report the fastest")
+    ap.add_argument("--dir",help="where to create the files, default is a temporary directory")
+    a=ap.parse_args()
+
+    cases=dict(CASES,**LARGE_CASES) if a.large else dict(CASES)
+    if a.case: cases={k:v for k,v in dict(CASES,**LARGE_CASES).items() if k in a.case}
+    with tempfile.TemporaryDirectory(dir=a.dir) as workdir:
+        results=run_suite(cases,a.op or OPS,workdir,a.repeat,a.max_copy_mb<<20,a.fill)
+    report={"commit":_git_commit(),"date":time.strftime("%Y-%m-%dT%H:%M:%S"),"python":platform.python_version(),
+            "platform":platform.platform(),"results":results}
+    if a.output:
+        with open(a.output,"w",encoding="utf-8") as f:
+            json.dump(report,f,indent=1)
+    if a.compare: compare(results,a.compare,a.threshold)
+
+if __name__ == '__main__':
+    if len(sys.argv)==6 and sys.argv[1]=="--child":
+        child(sys.argv[2],sys.argv[3],sys.argv[4],int(sys.argv[5]))
+    else:
+        main()
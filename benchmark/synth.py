@@ -0,0 +1,67 @@
+import os, sys, json, random
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+from safetensors_file import pad_header
+
+# Generates synthetic .safetensors files for benchmarks: any number of tensors with
+# LoRA-like names, a data section of any size, and optionally a big ss_tag_frequency
+# and metadata values that are JSON strings nested in JSON strings, like the ones
+# _ParseMore() takes apart. The data section is left sparse (all zero, no disk space
+# used) unless fill is set, so files of tens of GB are created instantly.
+#
+#   python benchmark/synth.py out.safetensors --tensors 10000 --data-mb 100 --tags 100000
+
+_FILL_BLOCK=16*1024*1024
+
+def make_metadata(tags:int=0,nested_depth:int=0) -> dict:
+    md={"ss_network_module":"networks.lora","ss_network_dim":"32","ss_network_alpha":"16",
+        "ss_output_name":"synthetic","modelspec.title":"synthetic benchmark file"}
+    if tags>0:
+        rnd=random.Random(tags)
+        md["ss_tag_frequency"]=json.dumps({"10_dataset":{f"tag_{i}_{rnd.randrange(1<<30):x}":rnd.randrange(1,500) for i in range(tags)}})
+    if nested_depth>0:
+        # every level is a dict with a few plain items and the next level as a JSON string
+        v={"n_repeats":10,"img_count":100}
+        for i in range(nested_depth):
+            v={f"level{i}":json.dumps(v),"items":list(range(8)),"name":f"dataset {i}"}
+        md["ss_dataset_dirs"]=json.dumps(v)
+    return md
+
+def make_header(ntensors:int,data_bytes:int,metadata:dict=None) -> dict:
+    '''Header with ntensors F16 tensors of about the same size, filling data_bytes bytes.'''
+    js={} if metadata is None else {"__metadata__":metadata}
+    per:int=max(data_bytes//ntensors//2*2,0)
+    offset:int=0
+    for i in range(ntensors):
+        n=per if i<ntensors-1 else (data_bytes-offset)//2*2
+        js[f"lora_unet_down_blocks_{i%4}_attentions_{i%2}_transformer_blocks_{i}_attn1_to_k.lora_down.weight"]={
+            "dtype":"F16","shape":[n//2],"data_offsets":[offset,offset+n]}
+        offset+=n
+    return js
+
+def make_file(fn:str,ntensors:int,data_bytes:int,tags:int=0,nested_depth:int=0,fill:bool=False) -> int:
+    '''Writes the file, returns its size.'''
+    js=make_header(ntensors,data_bytes,make_metadata(tags,nested_depth))
+    hdr=pad_header(json.dumps(js,separators=(',',':')).encode('utf-8'))
+    data_bytes=data_bytes//2*2
+    with open(fn,"wb") as f:
+        f.write(hdr)
+        if fill:
+            block=random.Random(0).randbytes(_FILL_BLOCK)
+            left:int=data_bytes
+            while left>0:
+                left-=f.write(block[:min(left,_FILL_BLOCK)])
+        f.truncate(len(hdr)+data_bytes)
+    return len(hdr)+data_bytes
+
+if __name__ == '__main__':
+    import argparse
+    ap=argparse.ArgumentParser(description="write a synthetic .safetensors file")
+    ap.add_argument("output_file")
+    ap.add_argument("--tensors",type=int,default=1000)
+    ap.add_argument("--data-mb",type=float,default=100)
+    ap.add_argument("--tags",type=int,default=0,help="number of tags in ss_tag_frequency")
+    ap.add_argument("--nested-depth",type=int,default=0,help="levels of JSON strings nested in ss_dataset_dirs")
+    ap.add_argument("--fill",action="store_true",help="write random data instead of leaving the data section sparse")
+    a=ap.parse_args()
+    size=make_file(a.output_file,a.tensors,int(a.data_mb*1024*1024),a.tags,a.nested_depth,a.fill)
+    print(f"{a.output_file}: {size} bytes")
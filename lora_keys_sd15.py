@@ -1,795 +0,0 @@
-# SD 1.5 LoRA keys
-_lora_keys:list[tuple[str,bool]]=[
-('lora_te_text_model_encoder_layers_0_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_0_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_0_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_0_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_0_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_0_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_0_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_0_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_0_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_1_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_1_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_1_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_1_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_1_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_1_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_1_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_2_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_2_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_2_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_2_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_2_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_2_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_2_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_3_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_3_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_3_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_3_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_3_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_3_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_3_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_4_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_4_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_4_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_4_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_4_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_4_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_4_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_5_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_5_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_5_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_5_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_5_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_5_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_5_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_6_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_6_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_6_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_6_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_6_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_6_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_6_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_7_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_7_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_7_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_7_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_7_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_7_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_7_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_8_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_8_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_8_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_8_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_8_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_8_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_8_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_9_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_9_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_9_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_9_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_9_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_9_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_9_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_10_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_10_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_10_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_10_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_10_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_10_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_10_self_attn_v_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_mlp_fc1.alpha', True),
-('lora_te_text_model_encoder_layers_11_mlp_fc1.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_mlp_fc1.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_mlp_fc2.alpha', True),
-('lora_te_text_model_encoder_layers_11_mlp_fc2.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_mlp_fc2.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_k_proj.alpha', True),
-('lora_te_text_model_encoder_layers_11_self_attn_k_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_k_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_out_proj.alpha', True),
-('lora_te_text_model_encoder_layers_11_self_attn_out_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_out_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_q_proj.alpha', True),
-('lora_te_text_model_encoder_layers_11_self_attn_q_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_q_proj.lora_up.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_v_proj.alpha', True),
-('lora_te_text_model_encoder_layers_11_self_attn_v_proj.lora_down.weight', False),
-('lora_te_text_model_encoder_layers_11_self_attn_v_proj.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_proj_in.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_proj_out.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_proj_in.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_proj_out.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_0_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_proj_in.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_proj_out.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_proj_in.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_proj_out.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_proj_in.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_proj_out.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_proj_in.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_proj_out.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_down_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_proj_in.alpha', True),
-('lora_unet_mid_block_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_proj_out.alpha', True),
-('lora_unet_mid_block_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_mid_block_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_proj_in.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_proj_out.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_proj_in.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_proj_out.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_proj_in.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_proj_out.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_1_attentions_2_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_proj_in.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_proj_out.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_proj_in.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_proj_out.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_proj_in.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_proj_out.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_2_attentions_2_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_proj_in.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_proj_out.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_0_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_proj_in.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_proj_out.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_1_transformer_blocks_0_ff_net_2.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_proj_in.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_proj_in.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_proj_in.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_proj_out.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_proj_out.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_proj_out.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn1_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_k.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_k.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_k.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_out_0.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_out_0.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_q.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_q.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_q.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_v.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_v.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_attn2_to_v.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_0_proj.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_0_proj.lora_up.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_2.alpha', True),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_2.lora_down.weight', False),
-('lora_unet_up_blocks_3_attentions_2_transformer_blocks_0_ff_net_2.lora_up.weight', False)
-]
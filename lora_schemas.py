@@ -0,0 +1,173 @@
+import re, functools
+
+# Expected LoRA/LyCORIS keys of supported model architectures. A key is a module name and
+# a suffix, e.g. "lora_unet_mid_block_attentions_0_proj_in" and "lora_down.weight". Module
+# names are written as patterns with {a,b} alternatives and {0..11} index ranges, and only
+# expanded into the module index when a file is checked for the first time, so importing
+# this module costs the same no matter how many architectures are supported.
+
+_TE_MODULES="{mlp_fc1,mlp_fc2,self_attn_k_proj,self_attn_q_proj,self_attn_v_proj,self_attn_out_proj}"
+_ATTN_MODULES="{{attn1,attn2}_{to_q,to_k,to_v,to_out_0},ff_net_{0_proj,2}}"
+
+# Every architecture has groups of modules, a file must have all modules of the "te" and
+# "unet" groups. Modules of the "conv" group (LoCon/LyCORIS conv layers) are recognized,
+# but optional, because which conv layers are trained differs between trainers.
+_SD1_CONV=["lora_unet_{down_blocks_{0..3}_resnets_{0..1},mid_block_resnets_{0..1},up_blocks_{0..3}_resnets_{0..2}}_{conv1,conv2,time_emb_proj,conv_shortcut}",
+           "lora_unet_down_blocks_{0..2}_downsamplers_0_conv",
+           "lora_unet_up_blocks_{0..2}_upsamplers_0_conv"]
+_SD1_UNET=["lora_unet_{down_blocks_{0..2}_attentions_{0..1},mid_block_attentions_0,up_blocks_{1..3}_attentions_{0..2}}_"
+           "{proj_in,proj_out,transformer_blocks_0_"+_ATTN_MODULES+"}"]
+
+SCHEMAS={
+    "sd1":("SD 1.x",{
+        "te":["lora_te_text_model_encoder_layers_{0..11}_"+_TE_MODULES],
+        "unet":_SD1_UNET,
+        "conv":_SD1_CONV}),
+    "sd2":("SD 2.x",{
+        "te":["lora_te_text_model_encoder_layers_{0..22}_"+_TE_MODULES],
+        "unet":_SD1_UNET,
+        "conv":_SD1_CONV}),
+    "sdxl":("SDXL",{
+        "te":["lora_te1_text_model_encoder_layers_{0..11}_"+_TE_MODULES,
+              "lora_te2_text_model_encoder_layers_{0..31}_"+_TE_MODULES],
+        "unet":["lora_unet_{input_blocks_{4,5}_1,output_blocks_{3,4,5}_1}_{proj_in,proj_out,transformer_blocks_{0..1}_"+_ATTN_MODULES+"}",
+                "lora_unet_{input_blocks_{7,8}_1,middle_block_1,output_blocks_{0,1,2}_1}_{proj_in,proj_out,transformer_blocks_{0..9}_"+_ATTN_MODULES+"}"],
+        "conv":["lora_unet_{input_blocks_{1,2,4,5,7,8}_0,middle_block_{0,2},output_blocks_{0..8}_0}_{in_layers_2,out_layers_3,emb_layers_1,skip_connection}",
+                "lora_unet_input_blocks_{3,6}_0_op",
+                "lora_unet_output_blocks_{2,5}_2_conv"]}),
+}
+REQUIRED_GROUPS=("te","unet")
+
+class NetworkType:
+    def __init__(self,name:str,slots:list[list[tuple[str,...]]],optional:tuple[str,...]):
+        self.name=name
+        self.scalars=("alpha",)  #suffixes of scalar tensors, every module has them
+        self.slots=slots         #for every slot, a module needs one of these sets of suffixes
+        self.optional=optional   #suffixes that may or may not be there
+        self.suffixes=frozenset(self.scalars+optional+tuple(x for slot in slots for alt in slot for x in alt))
+
+NETWORK_TYPES=[
+    NetworkType("LoRA",[[("lora_down.weight",)],[("lora_up.weight",)]],("lora_mid.weight","dora_scale")),
+    NetworkType("LoHa",[[("hada_w1_a",)],[("hada_w1_b",)],[("hada_w2_a",)],[("hada_w2_b",)]],("hada_t1","hada_t2","dora_scale")),
+    NetworkType("LoKr",[[("lokr_w1",),("lokr_w1_a","lokr_w1_b")],[("lokr_w2",),("lokr_w2_a","lokr_w2_b")]],("lokr_t2","dora_scale")),
+]
+
+def _expand(pattern:str) -> list[str]:
+    '''Expands "a_{b,c}_{0..2}" into a_b_0, a_b_1, a_b_2, a_c_0, ...; braces can be nested.'''
+    i:int=pattern.find('{')
+    if i<0: return [pattern]
+    depth:int=0
+    alts:list[str]=[]
+    start:int=i+1
+    for j in range(i,len(pattern)):
+        c=pattern[j]
+        if c=='{': depth+=1
+        elif c=='}':
+            depth-=1
+            if depth==0: break
+        elif c==',' and depth==1:
+            alts.append(pattern[start:j])
+            start=j+1
+    alts.append(pattern[start:j])
+
+    heads:list[str]=[]
+    for a in alts:
+        m=re.fullmatch(r"(\d+)\.\.(\d+)",a)
+        if m: heads.extend(str(x) for x in range(int(m.group(1)),int(m.group(2))+1))
+        else: heads.extend(_expand(a))
+    tails=_expand(pattern[j+1:])
+    return [pattern[:i]+h+t for h in heads for t in tails]
+
+_module_index=None #module name -> tuple of (schema name, group name), built on first use
+
+def get_module_index() -> dict[str,tuple[tuple[str,str],...]]:
+    global _module_index
+    if _module_index is None:
+        index={}
+        for schema,(_,groups) in SCHEMAS.items():
+            for group,patterns in groups.items():
+                for p in patterns:
+                    for m in _expand(p):
+                        index[m]=index.get(m,())+((schema,group),)
+        _module_index=index
+    return _module_index
+
+@functools.lru_cache(maxsize=None)
+def expected_modules(schema:str,group:str) -> tuple[str,...]:
+    return tuple(m for p in SCHEMAS[schema][1][group] for m in _expand(p))
+
+class CheckResult:
+    def __init__(self):
+        self.schema:str=None          #detected or requested architecture, None if nothing matched
+        self.network_type:NetworkType=None
+        self.unknowns:list[str]=[]      #unrecognized keys
+        self.missing_scalars:list[str]=[]
+        self.missing_nonscalars:list[str]=[]
+        self.bad_scalars:list[str]=[]     #expected to be scalar, but are not
+        self.bad_nonscalars:list[str]=[]  #expected to be nonscalar, but are scalar
+
+    def has_error(self) -> bool:
+        return self.schema is None or len(self.missing_scalars)+len(self.missing_nonscalars)+len(self.bad_scalars)+len(self.bad_nonscalars)>0
+
+def check(js:dict,schema:str=None) -> CheckResult:
+    '''Checks header js against the expected keys of architecture schema, or of the architecture
+    that best matches the file if schema is None, in one pass over the header.'''
+    index=get_module_index()
+    modules:dict[str,dict[str,bool]]={} #module -> {suffix: is scalar}, for modules found in index
+    matched:dict[str,set[str]]={k:set() for k in SCHEMAS} #schema -> recognized modules
+    unknowns:list[str]=[]
+    for key,v in js.items():
+        if key=="__metadata__": continue
+        module,_,suffix=key.partition('.')
+        hits=index.get(module)
+        if hits is None:
+            unknowns.append(key)
+            continue
+        modules.setdefault(module,{})[suffix]=(v['shape']==[])
+        for s,_ in hits: matched[s].add(module)
+
+    if schema is None:
+        # best match: most recognized modules, fewest missing ones and fewest modules
+        # that belong to other architectures only
+        best=None
+        for s,(_,groups) in SCHEMAS.items():
+            if len(matched[s])==0: continue
+            nMissing=sum(1 for g in REQUIRED_GROUPS for m in expected_modules(s,g) if m not in modules)
+            score=len(matched[s])-nMissing-(len(modules)-len(matched[s]))
+            if best is None or score>best[0]: best=(score,s)
+        if best is not None: schema=best[1]
+
+    r=CheckResult()
+    r.unknowns=unknowns
+    if schema is None: return r
+    r.schema=schema
+    for m in modules:
+        if m not in matched[schema]: r.unknowns.extend(m+'.'+x for x in modules[m])
+
+    # every module uses the suffixes of one network type, the most common one is the file's
+    counts={nt.name:0 for nt in NETWORK_TYPES}
+    for m in matched[schema]:
+        for nt in NETWORK_TYPES:
+            if any(x in nt.suffixes and x not in nt.scalars for x in modules[m]): counts[nt.name]+=1
+    r.network_type=max(NETWORK_TYPES,key=lambda nt:counts[nt.name])
+
+    for g in SCHEMAS[schema][1]:
+        for m in expected_modules(schema,g):
+            suffixes=modules.get(m)
+            if suffixes is None:
+                if g not in REQUIRED_GROUPS: continue
+                suffixes={}
+            nt=r.network_type
+            for t in NETWORK_TYPES:
+                if any(x in t.suffixes and x not in t.scalars for x in suffixes): nt=t
+            for x in nt.scalars:
+                if x not in suffixes: r.missing_scalars.append(m+'.'+x)
+                elif suffixes[x]==False: r.bad_scalars.append(m+'.'+x)
+            for slot in nt.slots:
+                alt=next((a for a in slot if all(x in suffixes for x in a)),None)
+                if alt is None:
+                    r.missing_nonscalars.extend(m+'.'+x for x in slot[0])
+                    continue
+                r.bad_nonscalars.extend(m+'.'+x for x in alt if suffixes[x]==True)
+            r.unknowns.extend(m+'.'+x for x in suffixes if x not in nt.suffixes)
+    return r
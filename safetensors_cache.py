@@ -0,0 +1,120 @@
+import os, json, time, sqlite3, threading
+
+# Persistent cache of safetensors headers and file hashes, so repeated queries on the same
+# files don't have to read and parse the headers, or hash the files, again. Entries are
+# keyed by (device, inode) and are only used if size and modification time still match,
+# so a changed file is re-read automatically. Least recently used headers are evicted
+# when the total header size in the cache goes over max_bytes. Every change is committed
+# right away in a short transaction, so many processes (or a long-running server) can use
+# the same cache file; if another process has it locked for too long, the file is treated
+# as not cached, or isn't cached this time.
+
+_BUSY_TIMEOUT=1.0 #seconds to wait for another process's write transaction
+_BUSY_BACKOFF=10.0 #after waiting in vain, don't try to write for this many seconds
+
+class HeaderCacheEntry:
+    def __init__(self,headerlen:int,hdrbuf:bytes,summary:dict,metadata):
+        self.headerlen=headerlen
+        self.hdrbuf=hdrbuf
+        self.summary=summary    #see SafeTensorsFile.get_summary()
+        self.metadata=metadata  #__metadata__ item of header, None if there isn't one
+
+class HeaderCache:
+    def __init__(self,dbfile:str,max_bytes:int=256*1024*1024):
+        self.dbfile=dbfile
+        self.max_bytes=max_bytes
+        self.lock=threading.Lock() #scan uses the cache from multiple threads
+        self.no_writes_until:float=0.0
+        self.db=sqlite3.connect(dbfile,timeout=_BUSY_TIMEOUT,check_same_thread=False,isolation_level=None) #autocommit
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS headers(
+            dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER,
+            headerlen INTEGER, hdrbuf BLOB, summary TEXT, metadata TEXT, last_used REAL,
+            PRIMARY KEY(dev,ino))""")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS hashes(
+            dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER, hashes TEXT,
+            PRIMARY KEY(dev,ino))""")
+        self.total_bytes:int=self.db.execute("SELECT IFNULL(SUM(LENGTH(hdrbuf)),0) FROM headers").fetchone()[0]
+
+    def close(self):
+        if self.db is not None:
+            with self.lock:
+                self.db.close()
+                self.db=None
+
+    def _transaction(self,func) -> bool:
+        '''Runs func() in a write transaction, and commits it. Returns False if the database
+        stayed locked by another process, then nothing is changed. Call with self.lock held.'''
+        if time.monotonic()<self.no_writes_until: return False
+        try:
+            self.db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError: #database is locked
+            self.no_writes_until=time.monotonic()+_BUSY_BACKOFF
+            return False
+        try:
+            func()
+            self.db.execute("COMMIT")
+        except BaseException as e:
+            self.db.execute("ROLLBACK")
+            if isinstance(e,sqlite3.OperationalError): return False
+            raise
+        return True
+
+    def get(self,st:os.stat_result) -> HeaderCacheEntry:
+        '''Returns cached entry for the file with stat result st, or None.'''
+        key=(st.st_dev,st.st_ino)
+        with self.lock:
+            try:
+                row=self.db.execute("SELECT size,mtime_ns,headerlen,hdrbuf,summary,metadata FROM headers WHERE dev=? AND ino=?",
+                                    key).fetchone()
+            except sqlite3.OperationalError: #database is locked
+                return None
+            if row is None: return None
+            if row[0]!=st.st_size or row[1]!=st.st_mtime_ns: #file changed since it was cached
+                if self._transaction(lambda:self.db.execute("DELETE FROM headers WHERE dev=? AND ino=?",key)):
+                    self.total_bytes-=len(row[3])
+                return None
+            self._transaction(lambda:self.db.execute("UPDATE headers SET last_used=? WHERE dev=? AND ino=?",(time.time(),*key)))
+        return HeaderCacheEntry(row[2],row[3],json.loads(row[4]),json.loads(row[5]))
+
+    def put(self,st:os.stat_result,headerlen:int,hdrbuf:bytes,summary:dict,metadata):
+        '''Adds or replaces the entry for the file with stat result st. hdrbuf must have
+        passed all the checks done by SafeTensorsFile.open().'''
+        if len(hdrbuf)>self.max_bytes: return
+        def insert():
+            row=self.db.execute("SELECT LENGTH(hdrbuf) FROM headers WHERE dev=? AND ino=?",(st.st_dev,st.st_ino)).fetchone()
+            self.db.execute("INSERT OR REPLACE INTO headers VALUES(?,?,?,?,?,?,?,?,?)",
+                            (st.st_dev,st.st_ino,st.st_size,st.st_mtime_ns,headerlen,hdrbuf,
+                             json.dumps(summary),json.dumps(metadata,ensure_ascii=False),time.time()))
+            total:int=self.total_bytes+len(hdrbuf)-(row[0] if row is not None else 0)
+            if total>self.max_bytes: total=self._evict(total)
+            self.total_bytes=total
+        with self.lock:
+            self._transaction(insert)
+
+    def _evict(self,total:int) -> int:
+        # drop least recently used entries until the cache is 10% below its limit
+        target:int=self.max_bytes*9//10
+        for dev,ino,n in self.db.execute("SELECT dev,ino,LENGTH(hdrbuf) FROM headers ORDER BY last_used").fetchall():
+            if total<=target: break
+            self.db.execute("DELETE FROM headers WHERE dev=? AND ino=?",(dev,ino))
+            total-=n
+        return total
+
+    def get_hashes(self,st:os.stat_result) -> dict:
+        '''Returns hashes saved by put_hashes() for the file with stat result st, or None.'''
+        with self.lock:
+            try:
+                row=self.db.execute("SELECT size,mtime_ns,hashes FROM hashes WHERE dev=? AND ino=?",(st.st_dev,st.st_ino)).fetchone()
+            except sqlite3.OperationalError: #database is locked
+                return None
+            if row is None: return None
+            if row[0]!=st.st_size or row[1]!=st.st_mtime_ns:
+                self._transaction(lambda:self.db.execute("DELETE FROM hashes WHERE dev=? AND ino=?",(st.st_dev,st.st_ino)))
+                return None
+        return json.loads(row[2])
+
+    def put_hashes(self,st:os.stat_result,hashes:dict):
+        with self.lock:
+            self._transaction(lambda:self.db.execute("INSERT OR REPLACE INTO hashes VALUES(?,?,?,?,?)",
+                              (st.st_dev,st.st_ino,st.st_size,st.st_mtime_ns,json.dumps(hashes,ensure_ascii=False))))
@@ -1,4 +1,4 @@
-import os, sys, json
+import os, io, sys, json, stat, errno, struct, mmap, math, tempfile, threading
 
 class SafeTensorsException(Exception):
     def __init__(self, msg:str):
@@ -13,6 +13,349 @@ class SafeTensorsException(Exception):
     def __str__(self):
         return self.msg
 
+def pad_header(hdrbuf:bytes,reserve:int=0,align:int=8) -> bytes:
+    '''Returns the 8-byte header length followed by hdrbuf padded with spaces. The padding
+    is at least reserve bytes and makes the header length a multiple of 8, and the start of
+    the data section a multiple of align, a power of two of at least 8. Reserved padding
+    lets later header edits be written in place, see SafeTensorsFile.write_header_in_place().'''
+    hdrlen:int=len(hdrbuf)+max(reserve,0)
+    hdrlen=((8+hdrlen+align-1)&(~(align-1)))-8 #pad so 8+hdrlen is a multiple of align
+    return hdrlen.to_bytes(8,'little')+hdrbuf+b' '*(hdrlen-len(hdrbuf))
+
+_MAX_BLOCK_PAD=64*1024 #pad_header_like() gives up on file systems with bigger blocks
+
+def pad_header_like(hdrbuf:bytes,reserve:int,old_headerlen:int,blksize:int) -> bytes:
+    '''Like pad_header(), but pads the header so the data section starts at the same offset
+    within a file system block of blksize bytes as in a file with header length old_headerlen.
+    Reflinks (btrfs, XFS) can only share whole blocks at the same offset in both files, so
+    then copy_range() shares the data section of the old file instead of copying it. Costs
+    up to blksize-1 more bytes of padding, which later in-place edits can use.'''
+    if blksize<=0 or blksize>_MAX_BLOCK_PAD: return pad_header(hdrbuf,reserve)
+    need:int=len(hdrbuf)+max(reserve,0)
+    hdrlen:int=need+(old_headerlen-need)%blksize
+    return hdrlen.to_bytes(8,'little')+hdrbuf+b' '*(hdrlen-len(hdrbuf))
+
+# size in bytes of one element of every dtype in the safetensors format
+DTYPE_SIZES={"BOOL":1,"U8":1,"I8":1,"F8_E5M2":1,"F8_E4M3":1,"I16":2,"U16":2,"F16":2,"BF16":2,
+             "I32":4,"U32":4,"F32":4,"I64":8,"U64":8,"F64":8}
+
+_FICLONERANGE=0x4020940d  #_IOW(0x94, 13, struct file_clone_range), Linux only
+_FIDEDUPERANGE=0xc0189436 #_IOWR(0x94, 54, struct file_dedupe_range), Linux only
+_COPY_BLOCK_SIZE=16*1024*1024 #copy in blocks of 16 MB
+_DROP_CACHE_WINDOW=64*1024*1024 #with OutputFile.drop_cache, drop copied data from the page cache every 64 MB
+_DIRECT_ALIGN=4096 #alignment of O_DIRECT writes
+# errors that mean "this copy method doesn't work for these two files", try the next one
+_COPY_FALLBACK_ERRNOS={errno.EXDEV,errno.EINVAL,errno.ENOSYS,errno.EOPNOTSUPP,errno.ENOTTY,errno.EBADF,errno.EPERM,
+                       errno.ENOTSOCK} #macOS sendfile() only writes to sockets
+_seek_lock=threading.Lock() #_pread() and _pwrite() without os.pread() (Windows) seek, one at a time
+
+def _pread(fd:int,n:int,offset:int) -> bytes:
+    '''os.pread(), or where there is none, a read at offset that puts the file position back.'''
+    if hasattr(os,"pread"): return os.pread(fd,n,offset)
+    with _seek_lock:
+        pos:int=os.lseek(fd,0,os.SEEK_CUR)
+        try:
+            os.lseek(fd,offset,os.SEEK_SET)
+            return os.read(fd,n)
+        finally:
+            os.lseek(fd,pos,os.SEEK_SET)
+
+def _pwrite(fd:int,buf,offset:int) -> int:
+    '''Writes all of buf at offset, with os.pwrite() or like _pread(). Returns len(buf).'''
+    mv=memoryview(buf).cast('B')
+    done:int=0
+    if hasattr(os,"pwrite"):
+        while done<len(mv): done+=os.pwrite(fd,mv[done:],offset+done)
+        return done
+    with _seek_lock:
+        pos:int=os.lseek(fd,0,os.SEEK_CUR)
+        try:
+            os.lseek(fd,offset,os.SEEK_SET)
+            while done<len(mv): done+=os.write(fd,mv[done:])
+        finally:
+            os.lseek(fd,pos,os.SEEK_SET)
+    return done
+
+def _reflink_range(fdin:int,fdout:int,offset_in:int,offset_out:int,count:int) -> bool:
+    '''Shares the extents of the source range with the destination (btrfs, XFS, ...), so
+    nothing is copied at all. Offsets must be aligned to the file system block size.'''
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        fcntl.ioctl(fdout,_FICLONERANGE,struct.pack("qQQQ",fdin,offset_in,count,offset_out))
+    except OSError as e:
+        if e.errno in _COPY_FALLBACK_ERRNOS: return False
+        raise
+    return True
+
+def dedupe_range(fsrc,fdst,offset_src:int,offset_dst:int,count:int) -> int:
+    '''Asks the file system to share the extents of a range of file fsrc with a range of file
+    fdst that holds the same bytes (btrfs, XFS, ...). The kernel compares the ranges first,
+    so file contents never change. Offsets must be aligned to the file system block size.
+    Returns number of bytes shared, 0 if the file system can't do it or the ranges differ.'''
+    try:
+        import fcntl
+    except ImportError:
+        return 0
+    done:int=0
+    while done<count:
+        # struct file_dedupe_range with one struct file_dedupe_range_info
+        arg=bytearray(struct.pack("QQHHIqQQiI",offset_src+done,count-done,1,0,0,fdst.fileno(),offset_dst+done,0,0,0))
+        try:
+            fcntl.ioctl(fsrc.fileno(),_FIDEDUPERANGE,arg)
+        except OSError as e:
+            if e.errno in _COPY_FALLBACK_ERRNOS: break
+            raise
+        deduped,status=struct.unpack_from("Qi",arg,40)
+        if status!=0 or deduped==0: break #ranges differ, or an error for this destination
+        done+=deduped
+    return done
+
+def _fadvise(fd:int,offset:int,count:int,advice:str):
+    '''posix_fadvise() where there is one. It's only a hint, so errors are ignored.'''
+    if not hasattr(os,"posix_fadvise"): return
+    try:
+        os.posix_fadvise(fd,offset,count,getattr(os,advice))
+    except OSError:
+        pass
+
+def _drop_pages(fd:int,offset:int,count:int,written:bool=False):
+    '''Tells the OS that a range of a file isn't needed in the page cache anymore. The OS
+    only drops clean pages, so pages just written are flushed to disk first.'''
+    if not hasattr(os,"posix_fadvise") or count<=0: return
+    if written: os.fdatasync(fd)
+    _fadvise(fd,offset,count,"POSIX_FADV_DONTNEED")
+
+def _copy_fd(fdin:int,fdout:int,offset_in:int,offset_out:int,count:int) -> int:
+    '''copy_range() without reflink: os.copy_file_range(), os.sendfile(), then pread()/pwrite().'''
+    done:int=0
+    if hasattr(os,"copy_file_range"):
+        try:
+            while done<count:
+                n=os.copy_file_range(fdin,fdout,min(count-done,1<<30),offset_in+done,offset_out+done)
+                if n==0: break #some file systems silently copy nothing, fall back
+                done+=n
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS: raise
+        if done==count: return done
+
+    if hasattr(os,"sendfile"):
+        # sendfile() writes at the file position of fdout, put it back when done
+        pos:int=os.lseek(fdout,0,os.SEEK_CUR)
+        try:
+            os.lseek(fdout,offset_out+done,os.SEEK_SET)
+            while done<count:
+                n=os.sendfile(fdout,fdin,offset_in+done,min(count-done,1<<30))
+                if n==0: break
+                done+=n
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS: raise
+        finally:
+            os.lseek(fdout,pos,os.SEEK_SET)
+        if done==count: return done
+
+    while done<count:
+        buf=_pread(fdin,min(count-done,_COPY_BLOCK_SIZE),offset_in+done)
+        if len(buf)==0: break #source file shorter than expected
+        _pwrite(fdout,buf,offset_out+done)
+        done+=len(buf)
+    return done
+
+def _copy_direct(fdin:int,fdout:int,fddirect:int,offset_in:int,offset_out:int,count:int) -> int:
+    '''Copies a range with O_DIRECT writes to fddirect, bypassing the page cache. O_DIRECT
+    needs offsets, sizes and buffer addresses aligned to the device block size, so the
+    unaligned start and end of the range are written through fdout.'''
+    begin:int=min(-(-offset_out//_DIRECT_ALIGN)*_DIRECT_ALIGN,offset_out+count)
+    end:int=max((offset_out+count)//_DIRECT_ALIGN*_DIRECT_ALIGN,begin)
+    done:int=_copy_fd(fdin,fdout,offset_in,offset_out,begin-offset_out)
+    if done!=begin-offset_out: return done
+    if end>begin:
+        buf=mmap.mmap(-1,min(_COPY_BLOCK_SIZE,end-begin)) #page aligned
+        mv=memoryview(buf)
+        try:
+            while offset_out+done<end:
+                n:int=min(len(buf),end-offset_out-done)
+                got:int=os.preadv(fdin,[mv[:n]],offset_in+done)
+                if got<n: #source file shorter than expected, write what there is
+                    return done+_copy_fd(fdin,fdout,offset_in+done,offset_out+done,got)
+                w:int=0
+                while w<n: w+=os.pwrite(fddirect,mv[w:n],offset_out+done+w)
+                done+=n
+        finally:
+            mv.release()
+            buf.close()
+    return done+_copy_fd(fdin,fdout,offset_in+done,offset_out+done,count-done)
+
+def copy_range(fin,fout,offset_in:int,offset_out:int,count:int) -> int:
+    '''Copies count bytes at offset_in of file fin to offset_out of file fout, using the fastest
+    method that works: reflink, os.copy_file_range(), os.sendfile(), then read()/write() as a
+    last resort. fin and fout are file objects opened in binary mode, their file positions
+    are not used or changed. If fout is an OutputFile, its drop_cache and direct settings
+    apply. Returns number of bytes copied.'''
+    fout.flush()
+    if hasattr(fin,"pread"): #not a local file, e.g. safetensors_http.HTTPRangeFile
+        done:int=0
+        while done<count:
+            buf=fin.pread(min(count-done,_COPY_BLOCK_SIZE),offset_in+done)
+            if len(buf)==0: break
+            _pwrite(fout.fileno(),buf,offset_out+done)
+            done+=len(buf)
+        return done
+    fdin:int=fin.fileno()
+    fdout:int=fout.fileno()
+    if count<=0: return 0
+    if _reflink_range(fdin,fdout,offset_in,offset_out,count): return count
+
+    if count>=_COPY_BLOCK_SIZE: _fadvise(fdin,offset_in,count,"POSIX_FADV_SEQUENTIAL")
+    fddirect:int=getattr(fout,"direct_fd",None)
+    drop_cache:bool=getattr(fout,"drop_cache",False)
+    done:int=0
+    while done<count:
+        n:int=count-done
+        # with drop_cache, copy in windows, and drop every window from the page cache
+        if drop_cache: n=min(n,_DROP_CACHE_WINDOW-(offset_out+done)%_DROP_CACHE_WINDOW)
+        if fddirect is not None: m=_copy_direct(fdin,fdout,fddirect,offset_in+done,offset_out+done,n)
+        else: m=_copy_fd(fdin,fdout,offset_in+done,offset_out+done,n)
+        if drop_cache:
+            _drop_pages(fdin,offset_in+done,m)
+            _drop_pages(fdout,offset_out+done,m,written=True)
+        done+=m
+        if m!=n: break
+    return done
+
+def _get_umask() -> int:
+    mask:int=os.umask(0)
+    os.umask(mask)
+    return mask
+
+_UMASK=_get_umask() #read once at import, os.umask() can't be read without setting it
+
+class OutputFile(io.FileIO):
+    '''Output file that is written as a temporary file next to filename, and replaces filename
+    only when commit() is called, so an interrupted or failed write never leaves a partial
+    file behind, and the input file can be the output file. If filename is a symlink, the
+    file it points to is replaced, and an existing file keeps its mode and, where we are
+    allowed to set them, owner and group. If size is known, the file is preallocated,
+    so it ends up in few extents and a full disk is found before copying. With drop_cache,
+    copy_range() drops what it copies from the page cache, of the input file too, so copying
+    a big file doesn't push other files out of it. With direct, copy_range() writes with
+    O_DIRECT (Linux), past the page cache.'''
+    def __init__(self,filename:str,size:int=None,drop_cache:bool=False,direct:bool=False):
+        self.filename=os.path.realpath(filename)
+        dirname,basename=os.path.split(self.filename)
+        fd,self.tmp_name=tempfile.mkstemp(prefix="."+basename+".",suffix=".tmp",dir=dirname)
+        super().__init__(fd,"w")
+        self.drop_cache=drop_cache
+        self.direct_fd:int=None
+        self.committed=False
+        try:
+            if size is not None and size>0 and hasattr(os,"posix_fallocate"):
+                try:
+                    os.posix_fallocate(self.fileno(),0,size)
+                except OSError as e:
+                    if e.errno not in (errno.EOPNOTSUPP,errno.EINVAL,errno.ENOSYS): raise
+            if direct:
+                if not hasattr(os,"O_DIRECT"):
+                    raise SafeTensorsException("O_DIRECT writes are not supported on this system")
+                self.direct_fd=os.open(self.tmp_name,os.O_WRONLY|os.O_DIRECT)
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self):
+        self._close_direct()
+        super().close()
+        try:
+            os.unlink(self.tmp_name)
+        except FileNotFoundError:
+            pass
+
+    def _close_direct(self):
+        if self.direct_fd is not None:
+            os.close(self.direct_fd)
+            self.direct_fd=None
+
+    def _copy_permissions(self):
+        # mkstemp() creates the file with mode 0600
+        try:
+            st=os.stat(self.filename)
+        except FileNotFoundError:
+            os.chmod(self.tmp_name,0o666&~_UMASK) #like open() would
+            return
+        os.chmod(self.tmp_name,stat.S_IMODE(st.st_mode))
+        if not hasattr(os,"chown"): return
+        try:
+            os.chown(self.tmp_name,st.st_uid,st.st_gid)
+        except PermissionError: #only root can give files away, but the group may work
+            try:
+                os.chown(self.tmp_name,-1,st.st_gid)
+            except PermissionError:
+                pass
+
+    def commit(self):
+        '''Closes the file and renames it to filename.'''
+        self._close_direct()
+        super().close()
+        self._copy_permissions()
+        os.replace(self.tmp_name,self.filename)
+        self.committed=True
+
+    def close(self):
+        '''Closes and deletes the temporary file, unless commit() was called.'''
+        if not self.committed and not self.closed: self._discard()
+        else: super().close()
+
+def copy_ranges(fin,fout,ranges:list[tuple[int,int,int]]) -> int:
+    '''Copies (offset_in,offset_out,count) ranges from file fin to file fout with copy_range(),
+    merging ranges that are next to each other in both files into one copy. Returns number
+    of bytes copied, which is less than the total count if fin is too short.'''
+    total:int=0
+    run=None
+    for r in sorted(ranges)+[None]:
+        if run is not None and r is not None and r[0]==run[0]+run[2] and r[1]==run[1]+run[2]:
+            run=(run[0],run[1],run[2]+r[2])
+            continue
+        if run is not None:
+            n:int=copy_range(fin,fout,run[0],run[1],run[2])
+            total+=n
+            if n!=run[2]: break
+        run=r
+    return total
+
+def is_url(fn:str) -> bool:
+    '''Returns True if fn is an http:// or https:// URL, which is opened with safetensors_http.
+    That module is imported only then, http.client and ssl take long to import.'''
+    return fn.startswith(("http://","https://"))
+
+def read_at(f,n:int,offset:int) -> bytes:
+    '''Returns n bytes at offset of file f (fewer at the end of the file), without using or
+    changing the file position.'''
+    if hasattr(f,"pread"): return f.pread(n,offset) #not a local file
+    return _pread(f.fileno(),n,offset)
+
+def write_at(f,buf,offset:int) -> int:
+    '''Writes all of buf at offset of file f, without using or changing the file position.
+    Returns len(buf).'''
+    return _pwrite(f.fileno(),buf,offset)
+
+def same_bytes(fa,fb,offset_a:int,offset_b:int,count:int) -> bool:
+    '''Returns True if count bytes at offset_a of file fa are the same as count bytes at
+    offset_b of file fb. Blocks are compared from the start, beginning with a small one and
+    doubling, so ranges that differ early are found after reading very little.'''
+    block:int=64*1024
+    pos:int=0
+    while pos<count:
+        n:int=min(block,count-pos)
+        a=read_at(fa,n,offset_a+pos)
+        if len(a)!=n or a!=read_at(fb,n,offset_b+pos): return False
+        pos+=n
+        block=min(block*2,4*1024*1024)
+    return True
+
+_sqlite_local=threading.local() #in-memory SQLite connection of each thread, for scan_header()
+
 class SafeTensorsChunk:
     def __init__(self,name:str,dtype:str,shape:list[int],offset0:int,offset1:int):
         self.name=name
@@ -26,6 +369,9 @@ class SafeTensorsFile:
         self.f=None         #file handle
         self.hdrbuf=None    #header byte buffer
         self.header=None    #parsed header as a dict
+        self.mm=None        #memory map of the whole file, only when opened with useMmap=True
+        self.mv=None        #memoryview of self.mm, tensor views are slices of it
+        self.cached=None    #HeaderCacheEntry if header came from a HeaderCache, header is then parsed on demand
         self.error=0
 
     def __del__(self):
@@ -38,42 +384,88 @@ class SafeTensorsFile:
         self.close_file()
 
     def close_file(self):
+        if self.mv is not None:
+            self.mv.release()
+            self.mv=None
+        if self.mm is not None:
+            try:
+                self.mm.close()
+            except BufferError:
+                pass #tensor views still in use, mapping goes away with the last one
+            self.mm=None
         if self.f is not None:
             self.f.close()
             self.f=None
             self.filename=""
 
     #test file: duplicate_keys_in_header.safetensors
-    def _CheckDuplicateHeaderKeys(self):
+    def _ParseHeader(self):
+        # Parse the header and look for duplicate keys in one json.loads() pass. The hook is
+        # called for every JSON object, but only duplicate keys in the top-level object,
+        # i.e. the dict returned by json.loads(), are errors.
+        dups:list[tuple[dict,list]]=[]
         def parse_object_pairs(pairs):
-            return [k for k,_ in pairs]
-
-        keys=json.loads(self.hdrbuf,object_pairs_hook=parse_object_pairs)
-        #print(keys)
-        d={}
-        for k in keys:
-            if k in d: d[k]=d[k]+1
-            else: d[k]=1
+            d=dict(pairs)
+            if len(d)!=len(pairs):
+                counts={}
+                for k,_ in pairs: counts[k]=counts.get(k,0)+1
+                dups.append((d,[(k,v) for k,v in counts.items() if v>1]))
+            return d
+
+        header=json.loads(self.hdrbuf,object_pairs_hook=parse_object_pairs)
         hasError=False
-        for k,v in d.items():
-            if v>1:
+        for d,kv in dups:
+            if d is not header: continue
+            for k,v in kv:
                 print(f"key {k} used {v} times in header",file=sys.stderr)
                 hasError=True
         if hasError:
             raise SafeTensorsException.invalid_file(self.filename,"duplicate keys in header")
+        self.header=header
 
     @staticmethod
-    def open_file(filename:str,quiet=False,parseHeader=True):
+    def open_file(filename:str,quiet=False,parseHeader=True,useMmap=False,cache=None):
         s=SafeTensorsFile()
-        s.open(filename,quiet,parseHeader)
+        s.open(filename,quiet,parseHeader,useMmap,cache)
         return s
 
-    def open(self,fn:str,quiet=False,parseHeader=True)->int:
-        st=os.stat(fn)
+    def open(self,fn:str,quiet=False,parseHeader=True,useMmap=False,cache=None)->int:
+        '''cache is an optional safetensors_cache.HeaderCache, if the header of this file is in it,
+        the header is not read from the file, and only parsed when get_header() is called.'''
+        if is_url(fn):
+            import safetensors_http
+            if useMmap==True:
+                raise SafeTensorsException(f"{fn}: files on a web server can't be memory-mapped, download the file first")
+            f=safetensors_http.HTTPRangeFile(fn)
+            st=f.stat()
+            cache=None #cache entries are keyed by inode
+        else:
+            st=os.stat(fn)
+            f=None
         if st.st_size<8: #test file: zero_len_file.safetensors
+            if f is not None: f.close()
             raise SafeTensorsException.invalid_file(fn,"length less than 8 bytes")
 
-        f=open(fn,"rb")
+        if f is None: f=open(fn,"rb")
+        if cache is not None and parseHeader==True:
+            entry=cache.get(st)
+            if entry is not None:
+                if quiet==False:
+                    print(f"{fn}: length={st.st_size}, header length={entry.headerlen}")
+                self._SetOpened(fn,f,st,entry.hdrbuf,entry.headerlen,useMmap)
+                self.cached=entry
+                return 0
+
+        headerlen,hdrbuf=self._ReadHeader(fn,f,st,quiet)
+        self._SetOpened(fn,f,st,hdrbuf,headerlen,useMmap)
+        if parseHeader==True:
+            self._ParseHeader()
+            if cache is not None:
+                cache.put(st,headerlen,hdrbuf,self.get_summary(),self.get_metadata())
+        return 0
+
+    @staticmethod
+    def _ReadHeader(fn:str,f,st:os.stat_result,quiet:bool) -> tuple[int,bytes]:
         b8=f.read(8) #read header size
         if len(b8)!=8:
             raise SafeTensorsException.invalid_file(fn,f"read only {len(b8)} bytes at start of file")
@@ -87,23 +479,137 @@ class SafeTensorsFile:
         hdrbuf=f.read(headerlen)
         if len(hdrbuf)!=headerlen:
             raise SafeTensorsException.invalid_file(fn,f"header size is {headerlen}, but read {len(hdrbuf)} bytes")
+        return headerlen,hdrbuf
+
+    def _SetOpened(self,fn:str,f,st:os.stat_result,hdrbuf:bytes,headerlen:int,useMmap:bool):
         self.filename=fn
         self.f=f
         self.st=st
         self.hdrbuf=hdrbuf
         self.error=0
         self.headerlen=headerlen
-        if parseHeader==True:
-            self._CheckDuplicateHeaderKeys()
-            self.header=json.loads(self.hdrbuf)
-        return 0
+        if useMmap==True:
+            self.mm=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+            self.mv=memoryview(self.mm)
 
     def get_header(self):
+        if self.header is None and self.cached is not None:
+            self.header=json.loads(self.hdrbuf) #cached headers were checked when first read
         return self.header
 
+    def get_metadata(self):
+        '''Returns the __metadata__ item of the header, or None if there isn't one. If the
+        header was not parsed when the file was opened, only __metadata__ is parsed.'''
+        if self.header is None:
+            if self.cached is not None: return self.cached.metadata
+            return self.scan_header(("__metadata__",)).get("__metadata__")
+        return self.header.get("__metadata__")
+
+    def scan_header(self,keys) -> dict:
+        '''Returns a dict of the top-level header items named in keys. The header is checked
+        for valid JSON and duplicate keys like a full parse does, but in one pass by SQLite's
+        json_each(), so only the returned items become Python objects, and tensor entries
+        cost next to nothing. Falls back to a full parse if SQLite can't tell strict JSON
+        from JSON5, or doesn't accept the header.'''
+        keys=list(keys)
+        result=None
+        try:
+            result=self._ScanHeaderSQLite(keys)
+        except (ImportError,UnicodeDecodeError):
+            pass
+        if result is None:
+            # not valid JSON, or not a JSON object: parse it all, which also raises the same
+            # errors as open() would
+            self._ParseHeader()
+            result={k:v for k,v in self.header.items() if k in keys}
+        return result
+
+    def _ScanHeaderSQLite(self,keys:list[str]) -> dict:
+        import sqlite3
+        # SQLite 3.42 and later also accept JSON5, which json.loads() doesn't, 3.45 and later
+        # can be told not to
+        if sqlite3.sqlite_version_info>=(3,45,0): strict="json_valid(:h,1)"
+        elif sqlite3.sqlite_version_info<(3,42,0): strict="1"
+        else: return None
+        text:str=self.hdrbuf.decode('utf-8')
+        # SQLite stops at NUL, json.loads() rejects it
+        if text.lstrip(" \t\r\n")[:1]!='{' or '\x00' in text: return None
+        db=getattr(_sqlite_local,"db",None)
+        if db is None:
+            db=_sqlite_local.db=sqlite3.connect(":memory:")
+        params={"h":text}
+        params.update((f"k{i}",k) for i,k in enumerate(keys))
+        wanted=",".join(f":k{i}" for i in range(len(keys))) or "NULL"
+        try:
+            rows=db.execute(f"SELECT (SELECT {strict}),key,type,CASE WHEN key IN ({wanted}) THEN value END FROM json_each(:h)",params).fetchall()
+        except sqlite3.Error: #not valid JSON, or NaN/Infinity which only json.loads() accepts
+            return None
+        # the subquery runs once, not for every row
+        if len(rows)>0 and rows[0][0]!=1: return None
+        if len(rows)==0 and db.execute(f"SELECT {strict}",params).fetchone()[0]!=1: return None
+
+        names=[r[1] for r in rows]
+        if len(set(names))!=len(names):
+            counts={}
+            for k in names: counts[k]=counts.get(k,0)+1
+            for k,v in counts.items():
+                if v>1: print(f"key {k} used {v} times in header",file=sys.stderr)
+            raise SafeTensorsException.invalid_file(self.filename,"duplicate keys in header")
+
+        result={}
+        wanted_keys=set(keys)
+        for _,k,t,v in rows:
+            if k not in wanted_keys: continue
+            if t=="object" or t=="array": v=json.loads(v)
+            elif t=="true" or t=="false": v=(t=="true")
+            elif t=="integer" and not isinstance(v,int): return None #more than 64 bits, SQLite made it a float
+            result[k]=v
+        return result
+
+    def get_summary(self) -> dict:
+        '''Returns sizes, tensor count, parameter count and dtype counts of the opened file.'''
+        if self.cached is not None: return dict(self.cached.summary)
+        nTensors:int=0
+        nParams:int=0
+        dtypes:dict[str,int]={}
+        for k,v in self.header.items():
+            if k=="__metadata__": continue
+            nTensors+=1
+            nParams+=math.prod(v['shape'])
+            dtypes[v['dtype']]=dtypes.get(v['dtype'],0)+1
+        return {"size":self.st.st_size,"header_length":self.headerlen,"tensors":nTensors,"parameters":nParams,"dtypes":dtypes}
+
+    def write_header_in_place(self,newhdrbuf:bytes) -> bool:
+        '''Overwrites the header of the opened file with newhdrbuf, padding it with spaces to
+        the current header length, so the data section is not touched. Returns False without
+        writing anything if newhdrbuf does not fit in the current header.'''
+        if len(newhdrbuf)>self.headerlen: return False
+        buf=self.headerlen.to_bytes(8,'little')+newhdrbuf+b' '*(self.headerlen-len(newhdrbuf))
+        with open(self.filename,"r+b") as f:
+            wn=f.write(buf)
+        if wn!=len(buf):
+            raise SafeTensorsException(f"{self.filename}: tried to write {len(buf)} bytes of header, only wrote {wn} bytes")
+        self.hdrbuf=buf[8:]
+        return True
+
+    def tensor_view(self,tensor_name:str) -> memoryview:
+        '''Returns a read-only memoryview of the tensor's bytes in the memory map, nothing is
+        copied. Only available if the file was opened with useMmap=True.'''
+        if self.mv is None:
+            raise SafeTensorsException(f"{self.filename}: tensor views need the file to be opened with useMmap=True")
+        t=self.get_header().get(tensor_name)
+        if t is None: return None
+        begin:int=8+self.headerlen+t['data_offsets'][0]
+        end:int=8+self.headerlen+t['data_offsets'][1]
+        if end>len(self.mv) or begin>end:
+            raise SafeTensorsException.invalid_file(self.filename,f"data_offsets of {tensor_name} are out of range")
+        return self.mv[begin:end]
+
     def load_one_tensor(self,tensor_name:str):
-        self.get_header()
-        if tensor_name not in self.header: return None
+        '''Returns tensor's bytes, as a memoryview into the memory map if the file was
+        opened with useMmap=True, otherwise as a newly read bytes object.'''
+        if tensor_name not in self.get_header(): return None
+        if self.mv is not None: return self.tensor_view(tensor_name)
 
         t=self.header[tensor_name]
         self.f.seek(8+self.headerlen+t['data_offsets'][0])
@@ -113,13 +619,38 @@ class SafeTensorsFile:
             print(f"{tensor_name}: length={bytesToRead}, only read {len(bytes)} bytes",file=sys.stderr)
         return bytes
 
-    def copy_data_to_file(self,file_handle) -> int:
-
-        self.f.seek(8+self.headerlen)
-        bytesLeft:int=self.st.st_size - 8 - self.headerlen
-        while bytesLeft>0:
-            chunklen:int=min(bytesLeft,int(16*1024*1024)) #copy in blocks of 16 MB
-            file_handle.write(self.f.read(chunklen))
-            bytesLeft-=chunklen
+    def read_tensors(self,tensor_names:list[str],max_gap:int=1024*1024,max_read:int=64*1024*1024):
+        '''Yields (name,memoryview of tensor bytes) for tensor_names in file order, reading the
+        file front to back once. Tensors less than max_gap bytes apart are read together with
+        one read() of up to max_read bytes (or one tensor, if bigger).'''
+        js=self.get_header()
+        ranges=sorted((js[k]['data_offsets'][0],js[k]['data_offsets'][1],k) for k in tensor_names)
+        base:int=8+self.headerlen
+        i:int=0
+        while i<len(ranges):
+            begin,end=ranges[i][0],ranges[i][1]
+            j:int=i+1
+            while j<len(ranges) and ranges[j][0]-end<=max_gap and max(end,ranges[j][1])-begin<=max_read:
+                end=max(end,ranges[j][1])
+                j+=1
+            self.f.seek(base+begin)
+            buf=self.f.read(end-begin)
+            if len(buf)!=end-begin:
+                raise SafeTensorsException.invalid_file(self.filename,f"data_offsets of {ranges[i][2]} are past end of file")
+            mv=memoryview(buf)
+            for t0,t1,name in ranges[i:j]:
+                yield name,mv[t0-begin:t1-begin]
+            i=j
 
+    def copy_data_to_file(self,file_handle) -> int:
+        '''Appends the data section of this file to file_handle at its current position,
+        without passing the data through Python if the OS can copy it for us.'''
+        file_handle.flush()
+        offset_out:int=file_handle.tell()
+        bytesToCopy:int=self.st.st_size - 8 - self.headerlen
+        n:int=copy_range(self.f,file_handle,8+self.headerlen,offset_out,bytesToCopy)
+        file_handle.seek(offset_out+n)
+        if n!=bytesToCopy:
+            print(f"{self.filename}: data section length={bytesToCopy}, only copied {n} bytes",file=sys.stderr)
+            return -1
         return 0
@@ -0,0 +1,75 @@
+import hashlib
+from safetensors_file import SafeTensorsFile, read_at
+
+# Computes the hashes used to identify models in one sequential pass over the file:
+#   sha256           - sha256 of the whole file
+#   autov2           - first 10 hex digits of sha256, as shown by AUTOMATIC1111 webui
+#   sshs_model_hash  - sha256 of the data section only, what kohya's scripts store in
+#                      __metadata__, unaffected by metadata changes
+#   sshs_legacy_hash - first 8 hex digits of the sha256 of the 64 KB at offset 1 MB
+#   tensors          - optional sha256 of every tensor's bytes
+
+_BLOCK_SIZE=8*1024*1024
+_LEGACY_OFFSET=0x100000
+_LEGACY_LENGTH=0x10000
+
+def hash_file(s:SafeTensorsFile,per_tensor:bool=False) -> dict:
+    '''s must be opened with its header parsed. The file is read in large blocks, and every
+    block is fed to all the hashers that need it, hashlib releases the GIL while hashing.'''
+    data_start:int=8+s.headerlen
+    file_hash=hashlib.sha256()
+    data_hash=hashlib.sha256()
+    legacy_hash=hashlib.sha256()
+
+    tensors=[] #(begin,end,name,hasher) in file offsets, sorted by begin
+    if per_tensor:
+        for k,v in s.get_header().items():
+            if k=="__metadata__": continue
+            o=v['data_offsets']
+            tensors.append((data_start+o[0],data_start+o[1],k,hashlib.sha256()))
+        tensors.sort(key=lambda x:x[0])
+    first:int=0 #tensors before this one are done
+
+    buf=bytearray(_BLOCK_SIZE)
+    mv=memoryview(buf)
+    f=s.f
+    f.seek(0)
+    pos:int=0
+    while True:
+        n:int=f.readinto(buf)
+        if n==0: break
+        block=mv[:n]
+        end:int=pos+n
+        file_hash.update(block)
+        if end>data_start:
+            data_hash.update(block[max(data_start-pos,0):])
+        if pos<_LEGACY_OFFSET+_LEGACY_LENGTH and end>_LEGACY_OFFSET:
+            legacy_hash.update(block[max(_LEGACY_OFFSET-pos,0):min(_LEGACY_OFFSET+_LEGACY_LENGTH-pos,n)])
+        i:int=first
+        while i<len(tensors) and tensors[i][0]<end:
+            t0,t1,_,h=tensors[i]
+            if t1>pos: h.update(block[max(t0-pos,0):min(t1-pos,n)])
+            i+=1
+        while first<len(tensors) and tensors[first][1]<=end: first+=1
+        pos=end
+
+    sha256:str=file_hash.hexdigest()
+    result={"sha256":sha256,"autov2":sha256[:10],"sshs_model_hash":data_hash.hexdigest(),
+            "sshs_legacy_hash":legacy_hash.hexdigest()[:8]}
+    if per_tensor:
+        result["tensors"]={name:h.hexdigest() for _,_,name,h in tensors}
+    return result
+
+def hash_ranges(f,ranges:list[tuple[int,int]]) -> list[str]:
+    '''Returns sha256 of every (offset,length) range of file f.'''
+    result:list[str]=[]
+    for offset,n in ranges:
+        h=hashlib.sha256()
+        pos:int=0
+        while pos<n:
+            b=read_at(f,min(_BLOCK_SIZE,n-pos),offset+pos)
+            if len(b)==0: raise EOFError(f"file ends at offset {offset+pos}, before the end of a tensor")
+            h.update(b)
+            pos+=len(b)
+        result.append(h.hexdigest())
+    return result
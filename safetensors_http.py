@@ -0,0 +1,152 @@
+import os, re, threading, http.client, urllib.parse
+
+# Read-only file over HTTP(S), for looking at models on a server without downloading them.
+# Every read is a ranged GET, and the first request also fetches the start of the header,
+# so opening a file and reading its header usually takes one request of a few KB. After
+# a redirect (e.g. to a CDN), later requests go straight to the final URL. Connections are
+# kept alive and shared by all files of the same server, so going through a batch of
+# files doesn't pay for a TCP and TLS handshake per request.
+
+PREFETCH_SIZE=16*1024 #first request reads this much, enough for most LoRA headers
+_MAX_REDIRECTS=5
+_TIMEOUT=60
+_MAX_IDLE=16 #idle connections kept per server
+
+_idle:dict[tuple[str,str],list[http.client.HTTPConnection]]={} #(scheme,host:port) -> idle connections
+_idle_lock=threading.Lock()
+
+def _get_connection(scheme:str,netloc:str) -> tuple[http.client.HTTPConnection,bool]:
+    '''Returns a connection to the server, and True if it was used before.'''
+    with _idle_lock:
+        conns=_idle.get((scheme,netloc))
+        if conns: return conns.pop(),True
+    if scheme=="https": return http.client.HTTPSConnection(netloc,timeout=_TIMEOUT),False
+    return http.client.HTTPConnection(netloc,timeout=_TIMEOUT),False
+
+def _put_connection(scheme:str,netloc:str,conn:http.client.HTTPConnection):
+    with _idle_lock:
+        conns=_idle.setdefault((scheme,netloc),[])
+        if len(conns)<_MAX_IDLE:
+            conns.append(conn)
+            return
+    conn.close()
+
+def close_connections():
+    with _idle_lock:
+        for conns in _idle.values():
+            for conn in conns: conn.close()
+        _idle.clear()
+
+class HTTPRangeFile:
+    def __init__(self,url:str,prefetch:int=PREFETCH_SIZE):
+        self.name=url
+        self.url=url         #where requests go, the final URL after redirects
+        self.pos:int=0
+        self.requests:int=0  #number of GET requests, and bytes received, for profiling and tests
+        self.bytes_received:int=0
+        self.size:int=0
+        self.prefetched:bytes=b''
+        self.prefetched,self.size=self._get(0,prefetch)
+
+    def _get(self,offset:int,n:int) -> tuple[bytes,int]:
+        '''GETs n bytes at offset, returns them (fewer at the end of the file) and the file size.'''
+        for _ in range(_MAX_REDIRECTS+1):
+            u=urllib.parse.urlsplit(self.url)
+            path=u.path or "/"
+            if u.query: path+="?"+u.query
+            headers={"Range":f"bytes={offset}-{offset+n-1}","Accept-Encoding":"identity","User-Agent":"safetensors_util"}
+            conn,reused=_get_connection(u.scheme,u.netloc)
+            try:
+                conn.request("GET",path,headers=headers)
+                r=conn.getresponse()
+            except (http.client.RemoteDisconnected,ConnectionResetError,BrokenPipeError):
+                conn.close()
+                if not reused: raise
+                # server closed an idle connection, try once more on a new one
+                conn,_=_get_connection(u.scheme,u.netloc)
+                conn.request("GET",path,headers=headers)
+                r=conn.getresponse()
+            self.requests+=1
+
+            if r.status in (301,302,303,307,308):
+                r.read()
+                location=r.getheader("Location")
+                if r.will_close: conn.close()
+                else: _put_connection(u.scheme,u.netloc,conn)
+                if location is None: raise OSError(f"{self.name}: HTTP {r.status} without Location")
+                self.url=urllib.parse.urljoin(self.url,location)
+                continue
+            if r.status==416: #offset is at or past the end of the file
+                r.read()
+                if r.will_close: conn.close()
+                else: _put_connection(u.scheme,u.netloc,conn)
+                m=re.fullmatch(r"bytes \*/(\d+)",r.getheader("Content-Range") or "")
+                return b'',int(m.group(1)) if m else self.size
+            if r.status==200 and offset==0:
+                # server doesn't do ranges: take what we need and drop the connection
+                size=int(r.getheader("Content-Length") or -1)
+                data=r.read(n)
+                conn.close()
+                if size<0: raise OSError(f"{self.name}: server sends neither Content-Range nor Content-Length")
+                self.bytes_received+=len(data)
+                return data,size
+            if r.status==200: #the whole file again, not the part asked for
+                conn.close()
+                raise OSError(f"{self.name}: server does not support Range requests, download the file first")
+            if r.status!=206:
+                conn.close()
+                raise OSError(f"{self.name}: HTTP {r.status} {r.reason}")
+            m=re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)",r.getheader("Content-Range") or "")
+            if m is None or int(m.group(1))!=offset:
+                conn.close()
+                raise OSError(f"{self.name}: server sent Content-Range {r.getheader('Content-Range')!r} for bytes {offset}-{offset+n-1}")
+            data=r.read()
+            if r.will_close: conn.close()
+            else: _put_connection(u.scheme,u.netloc,conn)
+            self.bytes_received+=len(data)
+            return data,int(m.group(3))
+        raise OSError(f"{self.name}: more than {_MAX_REDIRECTS} redirects")
+
+    def pread(self,n:int,offset:int) -> bytes:
+        '''Returns n bytes at offset, fewer at the end of the file, like os.pread().'''
+        n=max(min(n,self.size-offset),0)
+        if n==0: return b''
+        if offset+n<=len(self.prefetched): return self.prefetched[offset:offset+n]
+        if offset<len(self.prefetched): #starts in the prefetched part, only get the rest
+            head=self.prefetched[offset:]
+            return head+self._get(len(self.prefetched),n-len(head))[0]
+        return self._get(offset,n)[0]
+
+    def read(self,n:int=-1) -> bytes:
+        if n<0: n=self.size-self.pos
+        b=self.pread(n,self.pos)
+        self.pos+=len(b)
+        return b
+
+    def readinto(self,buf) -> int:
+        b=self.pread(len(buf),self.pos)
+        buf[:len(b)]=b
+        self.pos+=len(b)
+        return len(b)
+
+    def seek(self,offset:int,whence:int=os.SEEK_SET) -> int:
+        if whence==os.SEEK_CUR: offset+=self.pos
+        elif whence==os.SEEK_END: offset+=self.size
+        self.pos=offset
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def stat(self) -> os.stat_result:
+        '''A stat result with the file size, and everything else zero.'''
+        return os.stat_result((0o100444,0,0,1,0,0,self.size,0,0,0))
+
+    def close(self):
+        self.prefetched=b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.close()
@@ -0,0 +1,205 @@
+import numpy as np
+
+# numpy views of tensor data. Importing this module needs numpy, so commands that use it
+# import it only when they run, and the rest of the program works without numpy.
+
+# dtypes numpy can use as they are, all little-endian like the safetensors format
+NUMPY_DTYPES={"BOOL":np.dtype(np.bool_),"U8":np.dtype("u1"),"I8":np.dtype("i1"),"I16":np.dtype("<i2"),
+              "U16":np.dtype("<u2"),"F16":np.dtype("<f2"),"I32":np.dtype("<i4"),"U32":np.dtype("<u4"),
+              "F32":np.dtype("<f4"),"I64":np.dtype("<i8"),"U64":np.dtype("<u8"),"F64":np.dtype("<f8")}
+# dtypes numpy doesn't have, stored as unsigned integers of the same size
+RAW_DTYPES={"BF16":np.dtype("<u2"),"F8_E5M2":np.dtype("u1"),"F8_E4M3":np.dtype("u1")}
+FLOAT_DTYPES=("F16","BF16","F32","F64","F8_E5M2","F8_E4M3")
+
+def _f8_table(exp_bits:int,bias:int,has_inf:bool) -> np.ndarray:
+    '''Returns float32 value of all 256 bit patterns of an 8-bit float.'''
+    man_bits:int=7-exp_bits
+    t=np.zeros(256,dtype=np.float32)
+    for i in range(256):
+        sign=-1.0 if i&0x80 else 1.0
+        e=(i>>man_bits)&((1<<exp_bits)-1)
+        m=i&((1<<man_bits)-1)
+        if e==(1<<exp_bits)-1 and (has_inf or m==(1<<man_bits)-1):
+            # E5M2 has inf and NaNs like IEEE formats, E4M3 (fn) only has NaN, no inf
+            t[i]=sign*np.inf if has_inf and m==0 else np.nan
+        elif e==0:
+            t[i]=sign*m*2.0**(1-bias-man_bits)
+        else:
+            t[i]=sign*(1+m/(1<<man_bits))*2.0**(e-bias)
+    return t
+
+_F8_TABLES={"F8_E5M2":None,"F8_E4M3":None}
+
+def raw_array(data,dtype:str) -> np.ndarray:
+    '''Returns a 1-D array over the tensor bytes in data without copying, BF16 and F8 tensors
+    as unsigned integers, see to_float32().'''
+    dt=NUMPY_DTYPES.get(dtype) or RAW_DTYPES.get(dtype)
+    if dt is None: raise ValueError(f"unsupported dtype {dtype}")
+    return np.frombuffer(data,dtype=dt)
+
+def to_float32(a:np.ndarray,dtype:str) -> np.ndarray:
+    '''Converts part of an array returned by raw_array() to float32.'''
+    if dtype=="BF16":
+        return (a.astype(np.uint32)<<16).view(np.float32)
+    if dtype in _F8_TABLES:
+        t=_F8_TABLES[dtype]
+        if t is None:
+            t=_F8_TABLES[dtype]=_f8_table(5,15,True) if dtype=="F8_E5M2" else _f8_table(4,7,False)
+        return t[a]
+    return a.astype(np.float32)
+
+def float32_to_bf16(a:np.ndarray) -> np.ndarray:
+    '''Rounds float32 array to nearest even BF16, returns the BF16 bit patterns as uint16.'''
+    u=a.astype(np.float32,copy=False).view(np.uint32)
+    rounded=((u+(0x7fff+((u>>16)&1)))>>16).astype(np.uint16)
+    # rounding must not turn NaN into inf, keep NaN quiet
+    nan=np.isnan(a)
+    if nan.any(): rounded[nan]=((u[nan]>>16)|0x40).astype(np.uint16)
+    return rounded
+
+def _to_float64(a:np.ndarray,dtype:str) -> np.ndarray:
+    return to_float32(a,dtype).astype(np.float64) if dtype in RAW_DTYPES else a.astype(np.float64)
+
+def tensor_stats(data,dtype:str,chunk_elements:int=4*1024*1024) -> dict:
+    '''Returns min, max, mean, standard deviation, max absolute value, and counts of NaN,
+    inf and zero elements of a tensor. Elements are converted to float64 a chunk at a time,
+    so the extra memory used doesn't depend on tensor size. Mean and standard deviation are
+    of finite elements only.'''
+    a=raw_array(data,dtype)
+    isFloat=dtype in FLOAT_DTYPES
+    n:int=0 #finite elements so far
+    mean:float=0.0
+    m2:float=0.0 #sum of squared differences from mean
+    vmin=vmax=absmax=None
+    nNaN=nInf=nZero=0
+    for i in range(0,len(a),chunk_elements):
+        c=a[i:i+chunk_elements]
+        x=_to_float64(c,dtype)
+        if isFloat:
+            finite=np.isfinite(x)
+            nf=int(np.count_nonzero(finite))
+            if nf!=len(x):
+                isnan=np.isnan(x)
+                nNaN+=int(np.count_nonzero(isnan))
+                nInf+=len(x)-nf-int(np.count_nonzero(isnan))
+                x=x[finite]
+        nZero+=len(x)-int(np.count_nonzero(x))
+        if len(x)==0: continue
+        cmin=float(x.min()); cmax=float(x.max())
+        vmin=cmin if vmin is None else min(vmin,cmin)
+        vmax=cmax if vmax is None else max(vmax,cmax)
+        cmean=float(x.mean())
+        cm2=float(np.square(x-cmean).sum())
+        # merge with the stats of the previous chunks (Chan et al.)
+        nc=len(x)
+        delta=cmean-mean
+        total=n+nc
+        mean+=delta*nc/total
+        m2+=cm2+delta*delta*n*nc/total
+        n=total
+    if vmin is not None: absmax=max(abs(vmin),abs(vmax))
+    return {"elements":len(a),"min":vmin,"max":vmax,"mean":mean if n>0 else None,
+            "std":(m2/n)**0.5 if n>0 else None,"abs_max":absmax,"nan":nNaN,"inf":nInf,"zero":nZero}
+
+def compare(data_a,dtype_a:str,data_b,dtype_b:str,chunk_elements:int=4*1024*1024) -> dict:
+    '''Compares two tensors with the same number of elements, which may have different dtypes,
+    value by value. Returns the number of elements that differ (NaN is equal to NaN), and
+    the largest absolute and relative difference |a-b|/max(|a|,|b|) of finite elements.'''
+    a=raw_array(data_a,dtype_a)
+    b=raw_array(data_b,dtype_b)
+    if len(a)!=len(b): raise ValueError(f"{len(a)} elements can't be compared with {len(b)} elements")
+    nDiff:int=0
+    abs_err=rel_err=0.0
+    for i in range(0,len(a),chunk_elements):
+        x=_to_float64(a[i:i+chunk_elements],dtype_a)
+        y=_to_float64(b[i:i+chunk_elements],dtype_b)
+        diff=(x!=y)&~(np.isnan(x)&np.isnan(y))
+        nd=int(np.count_nonzero(diff))
+        if nd==0: continue
+        nDiff+=nd
+        x=x[diff]; y=y[diff]
+        d=np.abs(x-y)
+        finite=np.isfinite(d)
+        if nd!=int(np.count_nonzero(finite)):
+            d=d[finite]; x=x[finite]; y=y[finite]
+            if len(d)==0: continue
+        abs_err=max(abs_err,float(d.max()))
+        rel_err=max(rel_err,float((d/np.maximum(np.abs(x),np.abs(y))).max()))
+    return {"differing":nDiff,"max_abs_err":abs_err,"max_rel_err":rel_err}
+
+def check_layout(names:list[str],begins,ends,nbytes,data_length:int,max_problems:int=20) -> list[str]:
+    '''Checks that every tensor's data_offsets span nbytes (shape x dtype size) bytes, and that
+    the tensors, sorted by offset, cover the data section of data_length bytes exactly,
+    without gaps or overlaps. Returns descriptions of the problems found, at most
+    max_problems of each kind.'''
+    problems:list[str]=[]
+    if len(names)==0:
+        if data_length!=0: problems.append(f"no tensors, but data section has {data_length} bytes")
+        return problems
+    b=np.asarray(begins,dtype=np.int64)
+    e=np.asarray(ends,dtype=np.int64)
+    n=np.asarray(nbytes,dtype=np.int64)
+
+    def report(mask,fmt):
+        idx=np.flatnonzero(mask)
+        for i in idx[:max_problems]: problems.append(fmt(int(i)))
+        if len(idx)>max_problems: problems.append(f"... and {len(idx)-max_problems} more")
+
+    report(e<b,lambda i:f"{names[i]}: data_offsets [{b[i]},{e[i]}] end before they begin")
+    report((e>=b)&(e-b!=n),lambda i:f"{names[i]}: data_offsets span {e[i]-b[i]} bytes, shape and dtype need {n[i]}")
+
+    order=np.argsort(b,kind="stable")
+    sb=b[order]
+    se=np.maximum.accumulate(e[order]) #end of the data used by tensors so far
+    report(sb[1:]<se[:-1],lambda i:f"{names[order[i+1]]}: data overlaps data of {names[order[i]]} or an earlier tensor")
+    report(sb[1:]>se[:-1],lambda i:f"{se[i]} to {sb[i+1]}: {sb[i+1]-se[i]} bytes not used by any tensor")
+    if sb[0]>0: problems.append(f"0 to {sb[0]}: {sb[0]} bytes not used by any tensor")
+    if se[-1]<data_length: problems.append(f"{se[-1]} to {data_length}: {data_length-se[-1]} bytes at end of file not used by any tensor")
+    if se[-1]>data_length: problems.append(f"tensor data extends {se[-1]-data_length} bytes past end of file")
+    return problems
+
+_F8_NAN_MASKS={"F8_E5M2":(0x7c,0x7c),"F8_E4M3":(0x7f,0x7f)}
+
+def count_nonfinite(data,dtype:str,chunk_elements:int=16*1024*1024) -> int:
+    '''Returns number of NaN and inf elements of a float tensor, by looking at the exponent
+    bits, without converting to another float type.'''
+    a=raw_array(data,dtype)
+    if dtype=="BF16": mask,bits=0x7f80,0x7f80
+    elif dtype=="F16": a=a.view(np.uint16); mask,bits=0x7c00,0x7c00
+    elif dtype=="F32": a=a.view(np.uint32); mask,bits=0x7f800000,0x7f800000
+    elif dtype=="F64": a=a.view(np.uint64); mask,bits=0x7ff0000000000000,0x7ff0000000000000
+    elif dtype in _F8_NAN_MASKS: mask,bits=_F8_NAN_MASKS[dtype]
+    else: return 0
+    n:int=0
+    for i in range(0,len(a),chunk_elements):
+        n+=int(np.count_nonzero((a[i:i+chunk_elements]&a.dtype.type(mask))==a.dtype.type(bits)))
+    return n
+
+CONVERT_TARGETS=("F16","BF16","F32")
+
+def _convert(a:np.ndarray,src:str,dst:str) -> np.ndarray:
+    if src=="F64" and dst!="BF16": return a.astype(NUMPY_DTYPES[dst])
+    x=a if src=="F32" else to_float32(a,src)
+    if dst=="F32": return x
+    if dst=="F16": return x.astype(NUMPY_DTYPES["F16"])
+    return float32_to_bf16(x)
+
+def convert(data,src:str,dst:str) -> tuple[np.ndarray,int]:
+    '''Converts tensor bytes of dtype src to an array with the bytes of dtype dst, one of
+    CONVERT_TARGETS, rounding to nearest even. Also returns the number of finite values that
+    are out of range of dst and became inf, e.g. above 65504 for F16.'''
+    with np.errstate(over="ignore"): #counted instead of numpy's RuntimeWarning
+        out=_convert(raw_array(data,src),src,dst)
+    return out,count_nonfinite(out,dst)-count_nonfinite(data,src)
+
+def convert_temp_bytes(src:str,dst:str) -> int:
+    '''Returns an upper bound of the bytes per element convert() holds in temporary arrays at
+    the same time, besides its input and output, for sizing chunks.'''
+    isize:int=raw_array(b'',src).itemsize
+    osize:int=raw_array(b'',dst).itemsize
+    count:int=max(isize,osize)+1 #masked copy and bool array in count_nonfinite()
+    if src=="F64" and dst!="BF16": return count
+    n:int=0 if src=="F32" else 4 #float32 array from to_float32()
+    if src=="BF16": n+=4         #uint32 array to_float32() shifts
+    if dst=="BF16": n+=2*4+1     #uint32 rounding terms and NaN mask in float32_to_bf16()
+    return max(n,count)
@@ -28,8 +28,8 @@ $ python3 safetensors_m.py ss_tag_frequency /path/to/file/trina.safetensors
 """
 
 def get_object(tensorsfile: str) -> str:
-	s = SafeTensorsFile.open_file(tensorsfile, quiet=True)
-	js = s.get_header()
+	s = SafeTensorsFile.open_file(tensorsfile, quiet=True, parseHeader=False)
+	js = s.scan_header(["__metadata__", "emp_params"]) # parses only these two items
 	s.close_file()
 
 	if "emp_params" in js:
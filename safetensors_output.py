@@ -0,0 +1,64 @@
+import os, sys, json
+
+# Output for commands that print one line per header entry. Lines are collected in a buffer
+# and written out in large chunks, so printing a header with 100k entries takes a few
+# hundred writes instead of a few hundred thousand, and output reaches a pipe while we
+# are still going through the header.
+
+_encode=json.JSONEncoder(ensure_ascii=False,separators=(',',':')).encode
+
+class BufferedWriter:
+    def __init__(self,fp=None,bufsize:int=256*1024):
+        self.fp=fp if fp is not None else sys.stdout
+        self.bufsize=bufsize
+        self.parts:list[str]=[]
+        self.size:int=0
+        self.closed=False #reader went away, e.g. output piped to head
+
+    def write(self,s:str):
+        self.parts.append(s)
+        self.size+=len(s)
+        if self.size>=self.bufsize: self.flush()
+
+    def flush(self):
+        if len(self.parts)>0 and not self.closed:
+            try:
+                self.fp.write(''.join(self.parts))
+                self.fp.flush()
+            except BrokenPipeError:
+                self.closed=True
+                # stop Python from complaining about stdout when it exits
+                os.dup2(os.open(os.devnull,os.O_WRONLY),self.fp.fileno())
+        self.parts=[]
+        self.size=0
+
+TENSOR_FORMATS=["jsonl","tsv"]
+
+def write_tensor_records(out:BufferedWriter,js:dict,keys,fmt:str):
+    '''Writes one line per tensor in keys: a JSON object, or tab separated
+    name, dtype, shape, begin offset, end offset and number of bytes.'''
+    if fmt=="tsv":
+        out.write("name\tdtype\tshape\tbegin\tend\tnbytes\n")
+    for k in keys:
+        if k=="__metadata__": continue
+        v=js[k]
+        o=v['data_offsets']
+        if fmt=="jsonl":
+            out.write(_encode({"name":k,"dtype":v['dtype'],"shape":v['shape'],"data_offsets":o,"nbytes":o[1]-o[0]}))
+            out.write("\n")
+        else:
+            out.write(f"{k}\t{v['dtype']}\t{','.join(map(str,v['shape']))}\t{o[0]}\t{o[1]}\t{o[1]-o[0]}\n")
+        if out.closed: break
+
+def write_header_json(out:BufferedWriter,js:dict):
+    '''Writes header as JSON, with every key and its value on one line.'''
+    out.write("{\n")
+    firstKey=True
+    for key,value in js.items():
+        if firstKey: firstKey=False
+        else: out.write(",\n")
+        out.write(_encode(key))
+        out.write(": ")
+        out.write(_encode(value))
+        if out.closed: break
+    out.write("\n}\n")
@@ -0,0 +1,143 @@
+import os, sys, json, time, types, threading, functools
+
+# Where a command spends its time, for --profile. enable() replaces the functions of the
+# hot paths with wrappers that count calls, time and bytes of each, so unless --profile
+# is given, nothing here is imported and the program runs exactly the same code. Times
+# are summed over threads, and include the time of phases called inside, e.g. "open"
+# includes "read header" and "parse header". Parsing checks for duplicate keys in the
+# same pass, so that check is part of "parse header".
+
+class PhaseStats:
+    __slots__=("calls","seconds","bytes")
+    def __init__(self):
+        self.calls:int=0
+        self.seconds:float=0.0
+        self.bytes:int=0
+
+_phases:dict[str,PhaseStats]={}
+_lock=threading.Lock()
+_start:float=None
+_io_start:dict=None
+
+def _record(phase:str,seconds:float,nbytes:int):
+    with _lock:
+        p=_phases.get(phase)
+        if p is None: p=_phases[phase]=PhaseStats()
+        p.calls+=1
+        p.seconds+=seconds
+        p.bytes+=nbytes
+
+def _timed(func,phase:str,nbytes=None,arg_bytes=None):
+    '''Wraps func to record its time, and the bytes it handled, which nbytes(return value)
+    or arg_bytes(arguments) returns.'''
+    @functools.wraps(func)
+    def wrapper(*args,**kwargs):
+        n:int=arg_bytes(*args) if arg_bytes is not None else 0
+        t0=time.perf_counter()
+        r=None
+        try:
+            r=func(*args,**kwargs)
+            return r
+        finally:
+            if nbytes is not None and r is not None: n=nbytes(r)
+            _record(phase,time.perf_counter()-t0,n)
+    return wrapper
+
+def _timed_generator(func,phase:str,nbytes):
+    '''Wraps generator function func to record the time and bytes of producing every item.'''
+    @functools.wraps(func)
+    def wrapper(*args,**kwargs):
+        it=func(*args,**kwargs)
+        while True:
+            t0=time.perf_counter()
+            try:
+                item=next(it)
+            except StopIteration:
+                return
+            _record(phase,time.perf_counter()-t0,nbytes(item))
+            yield item
+    return wrapper
+
+def _patch(owner,name:str,wrap):
+    '''Replaces owner.name with wrap(owner.name), also in modules that imported it by name.'''
+    orig=getattr(owner,name)
+    new=wrap(orig)
+    setattr(owner,name,new)
+    if isinstance(owner,types.ModuleType) and owner is not os:
+        for m in list(sys.modules.values()):
+            if m is not owner and getattr(m,name,None) is orig: setattr(m,name,new)
+
+def _read_proc(fn:str) -> dict:
+    '''Returns "name: value" lines of a /proc file as a dict, empty if there is no /proc.'''
+    try:
+        with open(fn,"rt") as f:
+            return {k:v.strip() for k,_,v in (line.partition(":") for line in f)}
+    except OSError:
+        return {}
+
+def enable():
+    global _start,_io_start
+    import safetensors_file, safetensors_hash, safetensors_output, safetensors_http, safetensors_worker
+    from safetensors_file import SafeTensorsFile
+    _patch(os,"stat",lambda f:_timed(f,"stat"))
+    _patch(SafeTensorsFile,"open",lambda f:_timed(f,"open"))
+    _patch(SafeTensorsFile,"_ReadHeader",lambda f:staticmethod(_timed(f,"read header",lambda r:8+len(r[1]))))
+    _patch(SafeTensorsFile,"_ParseHeader",lambda f:_timed(f,"parse header"))
+    _patch(SafeTensorsFile,"_ScanHeaderSQLite",lambda f:_timed(f,"scan header"))
+    _patch(SafeTensorsFile,"load_one_tensor",lambda f:_timed(f,"read tensor",len))
+    _patch(SafeTensorsFile,"read_tensors",lambda f:_timed_generator(f,"read tensors",lambda item:len(item[1])))
+    _patch(SafeTensorsFile,"write_header_in_place",lambda f:_timed(f,"write header in place",arg_bytes=lambda s,b:len(b)))
+    _patch(safetensors_file,"copy_range",lambda f:_timed(f,"copy data",lambda n:n))
+    _patch(safetensors_file,"same_bytes",lambda f:_timed(f,"compare data",arg_bytes=lambda fa,fb,oa,ob,n:n))
+    _patch(safetensors_file,"dedupe_range",lambda f:_timed(f,"share extents",lambda n:n))
+    _patch(safetensors_hash,"hash_file",lambda f:_timed(f,"hash",arg_bytes=lambda s,*a:s.st.st_size))
+    _patch(safetensors_hash,"hash_ranges",lambda f:_timed(f,"hash",arg_bytes=lambda fin,ranges:sum(r[1] for r in ranges)))
+    _patch(safetensors_output.BufferedWriter,"flush",lambda f:_timed(f,"write output",arg_bytes=lambda w:w.size))
+    _patch(safetensors_worker,"_ConvertChunk",lambda f:_timed(f,"convert",arg_bytes=lambda *a:a[6]))
+    _patch(safetensors_http.HTTPRangeFile,"_get",lambda f:_timed(f,"http request",lambda r:len(r[0])))
+    _io_start=_read_proc("/proc/self/io")
+    _start=time.perf_counter()
+
+def _peak_rss_mb() -> float:
+    hwm=_read_proc("/proc/self/status").get("VmHWM")
+    if hwm is not None: return int(hwm.split()[0])/1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss/(1024*1024) if sys.platform=="darwin" else rss/1024 #bytes on macOS, KB on Linux
+
+def results() -> dict:
+    '''Returns wall time, peak RSS, I/O counters of the process since enable(), and calls,
+    time and bytes of every phase.'''
+    wall:float=time.perf_counter()-_start
+    io_end=_read_proc("/proc/self/io")
+    io={k:int(io_end[k])-int(_io_start[k]) for k in ("rchar","wchar","syscr","syscw","read_bytes","write_bytes") if k in io_end and k in _io_start}
+    with _lock:
+        phases={name:{"calls":p.calls,"seconds":p.seconds,"bytes":p.bytes,
+                      "mb_per_s":p.bytes/(1<<20)/p.seconds if p.bytes>0 and p.seconds>0 else None}
+                for name,p in _phases.items()}
+    return {"wall_seconds":wall,"peak_rss_mb":_peak_rss_mb(),"io":io,"phases":phases}
+
+def report(json_file:str=None):
+    '''Prints results() as a table to stderr, or saves them as JSON to json_file ("-" is stderr).'''
+    r=results()
+    if json_file is not None:
+        if json_file=="-":
+            print(json.dumps(r),file=sys.stderr)
+        else:
+            with open(json_file,"w",encoding="utf-8") as f:
+                json.dump(r,f,indent=1)
+        return
+    print(f"\n{'phase':<22} {'calls':>8} {'seconds':>10} {'MB':>10} {'MB/s':>10}",file=sys.stderr)
+    for name,p in r["phases"].items():
+        mbs=f"{p['mb_per_s']:>10.1f}" if p['mb_per_s'] is not None else f"{'':>10}"
+        print(f"{name:<22} {p['calls']:>8} {p['seconds']:>10.4f} {p['bytes']/(1<<20):>10.2f} {mbs}",file=sys.stderr)
+    line=f"wall time {r['wall_seconds']:.4f} s"
+    if r["peak_rss_mb"] is not None: line+=f", peak RSS {r['peak_rss_mb']:.1f} MB"
+    io=r["io"]
+    if "rchar" in io:
+        line+=(f", read {io['rchar']/(1<<20):.2f} MB in {io['syscr']} calls, "
+               f"wrote {io['wchar']/(1<<20):.2f} MB in {io['syscw']} calls")
+    print(line,file=sys.stderr)
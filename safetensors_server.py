@@ -0,0 +1,244 @@
+import os, sys, json, copy, base64, signal, socket, asyncio, threading, collections, concurrent.futures
+from safetensors_file import SafeTensorsFile, read_at
+import safetensors_worker, lora_schemas
+
+# Long-running server that answers header, metadata, listkeys, checklora and extractdata
+# requests on a Unix domain socket, for programs that would otherwise start this tool once
+# per file. Requests and responses are JSON objects, one per line:
+#
+#   {"id":1,"cmd":"metadata","file":"/models/a.safetensors"}
+#   {"id":1,"ok":true,"result":{"ss_network_dim":"32",...}}
+#
+# Open files and their parsed headers are kept in an LRU cache, and used for as long as
+# the file's inode, size and modification time stay the same. Requests are answered on a
+# thread pool, so a slow one doesn't hold up the others, also not on the same connection:
+# responses come in the order they are done, with the id of their request.
+
+_MAX_REQUEST=1024*1024 #longest request line
+
+class _CacheEntry:
+    def __init__(self,key:tuple,s:SafeTensorsFile):
+        self.key=key          #(dev,ino,size,mtime_ns) of the file when it was opened
+        self.s=s
+        self.users:int=0      #requests using the file right now
+        self.evicted=False    #close the file when the last user is done
+        self.header_json:bytes=None
+        self.metadata_json:bytes=None
+
+class FileCache:
+    def __init__(self,max_files:int,max_bytes:int,header_cache=None):
+        self.max_files=max_files
+        self.max_bytes=max_bytes       #limit of the total size of cached headers
+        self.header_cache=header_cache #optional safetensors_cache.HeaderCache for files not open yet
+        self.entries:collections.OrderedDict[str,_CacheEntry]=collections.OrderedDict()
+        self.lock=threading.Lock()
+        self.total_bytes:int=0
+        self.hits:int=0
+        self.misses:int=0
+
+    def acquire(self,fn:str) -> _CacheEntry:
+        '''Returns the cache entry of file fn, opening the file if it's not in the cache or
+        changed since. Every acquire() must be followed by a release().'''
+        path=os.path.abspath(fn)
+        st=os.stat(path)
+        key=(st.st_dev,st.st_ino,st.st_size,st.st_mtime_ns)
+        with self.lock:
+            e=self.entries.get(path)
+            if e is not None and e.key==key:
+                self.entries.move_to_end(path)
+                e.users+=1
+                self.hits+=1
+                return e
+
+        s=SafeTensorsFile.open_file(path,quiet=True,cache=self.header_cache)
+        s.get_header()
+        with self.lock:
+            self.misses+=1
+            e=self.entries.get(path)
+            if e is not None and e.key==key: #another request opened it in the meantime
+                s.close_file()
+            else:
+                if e is not None: self._drop(path,e)
+                e=self.entries[path]=_CacheEntry(key,s)
+                self.total_bytes+=len(s.hdrbuf)
+                while len(self.entries)>1 and (len(self.entries)>self.max_files or self.total_bytes>self.max_bytes):
+                    self._drop(*next(iter(self.entries.items())))
+            self.entries.move_to_end(path)
+            e.users+=1
+        return e
+
+    def release(self,e:_CacheEntry):
+        with self.lock:
+            e.users-=1
+            if e.users==0 and e.evicted: e.s.close_file()
+
+    def _drop(self,path:str,e:_CacheEntry):
+        del self.entries[path]
+        self.total_bytes-=len(e.s.hdrbuf)
+        e.evicted=True
+        if e.users==0: e.s.close_file()
+
+    def close(self):
+        with self.lock:
+            for path,e in list(self.entries.items()): self._drop(path,e)
+
+class _RawJSON:
+    '''A result that is JSON text already.'''
+    def __init__(self,text:bytes):
+        self.text=text
+
+def _header_json(s:SafeTensorsFile) -> bytes:
+    # the header is JSON text already, and newlines can only be whitespace in it, because
+    # they must be escaped in strings, so it can go into a one-line response as it is
+    try:
+        s.hdrbuf.decode('utf-8')
+    except UnicodeDecodeError: #UTF-16/32 header, json.loads() accepts those too
+        return json.dumps(s.get_header(),ensure_ascii=False,separators=(',',':')).encode('utf-8')
+    return s.hdrbuf.replace(b'\n',b' ').replace(b'\r',b' ').strip()
+
+def _cmd_header(e:_CacheEntry,req:dict):
+    if e.header_json is None: e.header_json=_header_json(e.s)
+    return _RawJSON(e.header_json)
+
+def _cmd_metadata(e:_CacheEntry,req:dict):
+    md=e.s.get_metadata()
+    if req.get("parse_more"):
+        md=copy.deepcopy(md)
+        if isinstance(md,dict): safetensors_worker._ParseMore(md)
+        return md
+    if e.metadata_json is None: e.metadata_json=json.dumps(md,ensure_ascii=False,separators=(',',':')).encode('utf-8')
+    return _RawJSON(e.metadata_json)
+
+def _cmd_listkeys(e:_CacheEntry,req:dict):
+    js=e.s.get_header()
+    return sorted([k,js[k]['shape']==[]] for k in js if k!="__metadata__")
+
+def _cmd_checklora(e:_CacheEntry,req:dict):
+    arch=req.get("arch","auto")
+    if arch!="auto" and arch not in lora_schemas.SCHEMAS:
+        raise ValueError(f"arch must be auto or one of {', '.join(lora_schemas.SCHEMAS)}")
+    r=lora_schemas.check(e.s.get_header(),None if arch=="auto" else arch)
+    return {"ok":not r.has_error(),"architecture":lora_schemas.SCHEMAS[r.schema][0] if r.schema else None,"schema":r.schema,
+            "network_type":r.network_type.name if r.network_type else None,"unknowns":r.unknowns,
+            "missing_scalars":r.missing_scalars,"missing_nonscalars":r.missing_nonscalars,
+            "bad_scalars":r.bad_scalars,"bad_nonscalars":r.bad_nonscalars}
+
+def _cmd_extractdata(e:_CacheEntry,req:dict):
+    '''Saves tensor "key" to "output_file" (overwritten only if "force" is true), or returns
+    its bytes base64 encoded if there's no output_file.'''
+    s=e.s
+    name=req.get("key")
+    t=s.get_header().get(name) if name!="__metadata__" else None
+    if t is None: raise ValueError(f'key "{name}" not found in header (key names are case-sensitive)')
+    o=t['data_offsets']
+    data=read_at(s.f,o[1]-o[0],8+s.headerlen+o[0]) #pread, the file is shared with other requests
+    if len(data)!=o[1]-o[0]: raise EOFError(f"{name}: length={o[1]-o[0]}, only read {len(data)} bytes")
+    result={"key":name,"dtype":t['dtype'],"shape":t['shape'],"nbytes":len(data)}
+    output_file=req.get("output_file")
+    if output_file is None:
+        result["data"]=base64.b64encode(data).decode('ascii')
+        return result
+    with open(output_file,"wb" if req.get("force") else "xb") as fo:
+        fo.write(data)
+    result["output_file"]=output_file
+    return result
+
+_COMMANDS={"header":_cmd_header,"metadata":_cmd_metadata,"listkeys":_cmd_listkeys,
+           "checklora":_cmd_checklora,"extractdata":_cmd_extractdata}
+
+class Server:
+    def __init__(self,socket_path:str,cache:FileCache,jobs:int,quiet:bool=False):
+        self.socket_path=socket_path
+        self.cache=cache
+        self.pool=concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+        self.quiet=quiet
+        self.requests:int=0
+
+    def answer(self,line:bytes) -> bytes:
+        '''Returns the response line to request line.'''
+        rid=None
+        try:
+            req=json.loads(line)
+            if not isinstance(req,dict): raise ValueError("request must be a JSON object")
+            rid=req.get("id")
+            cmd=req.get("cmd")
+            if cmd=="status":
+                result={"requests":self.requests,"files":len(self.cache.entries),"header_bytes":self.cache.total_bytes,
+                        "hits":self.cache.hits,"misses":self.cache.misses}
+            else:
+                func=_COMMANDS.get(cmd)
+                if func is None: raise ValueError(f"unknown cmd {cmd!r}, use one of {', '.join(_COMMANDS)}, status")
+                if not isinstance(req.get("file"),str): raise ValueError('"file" is missing')
+                e=self.cache.acquire(req["file"])
+                try:
+                    result=func(e,req)
+                finally:
+                    self.cache.release(e)
+        except Exception as ex:
+            return json.dumps({"id":rid,"ok":False,"error":str(ex)},ensure_ascii=False).encode('utf-8')+b'\n'
+        head=b'{"id":'+json.dumps(rid,ensure_ascii=False).encode('utf-8')+b',"ok":true,"result":'
+        if isinstance(result,_RawJSON): return head+result.text+b'}\n'
+        return head+json.dumps(result,ensure_ascii=False,separators=(',',':')).encode('utf-8')+b'}\n'
+
+    async def _answer(self,line:bytes,writer:asyncio.StreamWriter,lock:asyncio.Lock):
+        self.requests+=1
+        response=await asyncio.get_running_loop().run_in_executor(self.pool,self.answer,line)
+        async with lock: #one response at a time on a connection
+            writer.write(response)
+            await writer.drain()
+
+    async def _client(self,reader:asyncio.StreamReader,writer:asyncio.StreamWriter):
+        lock=asyncio.Lock()
+        tasks=set()
+        try:
+            while True:
+                try:
+                    line=await reader.readline()
+                except ValueError: #request line too long
+                    break
+                if not line: break
+                if line.strip()==b'': continue
+                t=asyncio.ensure_future(self._answer(line,writer,lock))
+                tasks.add(t)
+                t.add_done_callback(tasks.discard)
+            if tasks: await asyncio.gather(*tasks,return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def run(self):
+        stop=asyncio.Event()
+        loop=asyncio.get_running_loop()
+        for sig in (signal.SIGINT,signal.SIGTERM):
+            loop.add_signal_handler(sig,stop.set)
+        old_umask=os.umask(0o177) #only the user running the server can connect
+        try:
+            server=await asyncio.start_unix_server(self._client,path=self.socket_path,limit=_MAX_REQUEST)
+        finally:
+            os.umask(old_umask)
+        if self.quiet==False:
+            print(f"listening on {self.socket_path}",file=sys.stderr)
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            os.unlink(self.socket_path)
+            self.pool.shutdown()
+            self.cache.close()
+
+def socket_in_use(socket_path:str) -> bool:
+    '''Returns True if a server is listening on socket_path.'''
+    with socket.socket(socket.AF_UNIX,socket.SOCK_STREAM) as c:
+        try:
+            c.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+def request(socket_path:str,req:dict) -> dict:
+    '''Sends one request to a server and returns its response, for scripts and tests.'''
+    with socket.socket(socket.AF_UNIX,socket.SOCK_STREAM) as c:
+        c.connect(socket_path)
+        c.sendall(json.dumps(req,ensure_ascii=False).encode('utf-8')+b'\n')
+        with c.makefile("rb") as f:
+            return json.loads(f.readline())
@@ -0,0 +1,149 @@
+import os, json, base64, uuid
+from safetensors_file import SafeTensorsFile, SafeTensorsException, OutputFile, copy_range, read_at, write_at
+import safetensors_hash
+
+# Content-addressed store of tensor data, for model libraries where many files have the
+# same tensors. Every tensor is kept once, in objects/ under its sha256, and a file added
+# to the store can be replaced by a small manifest next to it: the file's header and the
+# sha256 of each tensor in data section order. Small tensors and bytes between tensors
+# are kept in the manifest itself. restore() rebuilds the exact original file.
+
+MANIFEST_SUFFIX=".stmanifest"
+MANIFEST_FORMAT="safetensors-store-1"
+INLINE_SIZE=4096 #ranges smaller than this go into the manifest, not into an object file
+
+def _b64(b:bytes) -> str:
+    return base64.b64encode(b).decode('ascii')
+
+def file_ranges(s:SafeTensorsFile) -> list[tuple[int,int]]:
+    '''Returns (file offset,length) of every tensor and every gap between tensors of the data
+    section, in file order, covering the data section exactly.'''
+    data_start:int=8+s.headerlen
+    size:int=s.st.st_size
+    tensors=sorted({tuple(v['data_offsets']) for k,v in s.get_header().items() if k!="__metadata__"})
+    ranges:list[tuple[int,int]]=[]
+    pos:int=data_start
+    for b,e in tensors:
+        b+=data_start
+        e+=data_start
+        if b<pos: raise SafeTensorsException.invalid_file(s.filename,"tensors overlap, file can't be stored")
+        if b>pos: ranges.append((pos,b-pos))
+        if e>b: ranges.append((b,e-b))
+        pos=e
+    if pos>size: raise SafeTensorsException.invalid_file(s.filename,"tensor data extends past end of file")
+    if pos<size: ranges.append((pos,size-pos))
+    return ranges
+
+class TensorStore:
+    def __init__(self,root:str):
+        self.root=root
+        self.tmpdir=os.path.join(root,"tmp")
+        os.makedirs(os.path.join(root,"objects"),exist_ok=True)
+        os.makedirs(self.tmpdir,exist_ok=True)
+
+    def object_path(self,sha256:str) -> str:
+        return os.path.join(self.root,"objects",sha256[:2],sha256[2:])
+
+    def check_object(self,path:str,sha256:str,n:int) -> bool:
+        '''Returns True if object file path has n bytes with hash sha256.'''
+        with open(path,"rb") as f:
+            return os.fstat(f.fileno()).st_size==n and safetensors_hash.hash_ranges(f,[(0,n)])[0]==sha256
+
+    def _put_object(self,sha256:str,fin,offset:int,n:int,verify:bool=False) -> bool:
+        '''Adds n bytes at offset of file fin as object sha256, returns False if the store
+        already had it. Objects are written to a temporary file and linked into place, so
+        if two threads add the same object, one of them wins and the other knows it. With
+        verify, an existing object is hashed and replaced if it is damaged, and a new one
+        is hashed after it is written, so fin can be deleted afterwards.'''
+        path=self.object_path(sha256)
+        replace:bool=False
+        if os.path.exists(path):
+            if not verify or self.check_object(path,sha256,n): return False
+            replace=True #damaged, this file has the right data
+        tmp=os.path.join(self.tmpdir,uuid.uuid4().hex)
+        try:
+            with open(tmp,"wb") as fo:
+                if copy_range(fin,fo,offset,0,n)!=n: raise EOFError(f"file ends before offset {offset+n}")
+            if verify and not self.check_object(tmp,sha256,n):
+                raise SafeTensorsException(f"{fin.name}: {n} bytes at offset {offset} changed while they were added to the store")
+            os.makedirs(os.path.dirname(path),exist_ok=True)
+            if replace:
+                os.replace(tmp,path)
+                return True
+            try:
+                os.link(tmp,path)
+            except FileExistsError:
+                return False
+        finally:
+            if os.path.exists(tmp): os.unlink(tmp)
+        return True
+
+    def add_file(self,fn:str,remove:bool=False) -> dict:
+        '''Adds tensors of file fn to the store and writes fn+MANIFEST_SUFFIX. With remove, fn
+        is deleted afterwards, if it didn't change in the meantime, and only after every
+        object it needs was hashed in the store. Returns a report with
+        file size, bytes of new objects, manifest size, and bytes saved in the library.'''
+        with SafeTensorsFile.open_file(fn,quiet=True) as s:
+            ranges=file_ranges(s)
+            big=[r for r in ranges if r[1]>=INLINE_SIZE]
+            hashes=dict(zip(big,safetensors_hash.hash_ranges(s.f,big)))
+            parts=[]
+            new_bytes:int=0
+            for offset,n in ranges:
+                if n<INLINE_SIZE:
+                    parts.append({"size":n,"data":_b64(read_at(s.f,n,offset))})
+                    continue
+                h=hashes[(offset,n)]
+                if self._put_object(h,s.f,offset,n,remove): new_bytes+=n
+                parts.append({"size":n,"sha256":h})
+            manifest={"format":MANIFEST_FORMAT,"file":os.path.basename(fn),"size":s.st.st_size,
+                      "mtime_ns":s.st.st_mtime_ns,"header":_b64(read_at(s.f,8+s.headerlen,0)),"parts":parts}
+            st=s.st
+        mfn=fn+MANIFEST_SUFFIX
+        with open(mfn+".tmp","wt",encoding="utf-8") as fo:
+            json.dump(manifest,fo,separators=(',',':'))
+        os.replace(mfn+".tmp",mfn)
+        manifest_size:int=os.path.getsize(mfn)
+
+        removed:bool=False
+        if remove:
+            now=os.stat(fn)
+            if now.st_size!=st.st_size or now.st_mtime_ns!=st.st_mtime_ns:
+                raise SafeTensorsException(f"{fn} changed while it was added to the store, not removed")
+            os.remove(fn)
+            removed=True
+        return {"file":fn,"manifest":mfn,"size":st.st_size,"tensors":len(big),"new_bytes":new_bytes,
+                "manifest_size":manifest_size,"saved_bytes":st.st_size-new_bytes-manifest_size,"removed":removed}
+
+    def restore(self,manifest_file:str,output_file:str,drop_cache:bool=False,direct:bool=False) -> int:
+        '''Rebuilds the file described by manifest_file as output_file, returns its size.
+        Every object is hashed before its data is copied by the OS, output_file is only
+        written if all of them are intact. drop_cache and direct are those of OutputFile.'''
+        manifest=read_manifest(manifest_file)
+        with OutputFile(output_file,manifest["size"],drop_cache,direct) as fo:
+            header=base64.b64decode(manifest["header"])
+            fo.write(header)
+            pos:int=len(header)
+            for p in manifest["parts"]:
+                n:int=p["size"]
+                if "data" in p:
+                    write_at(fo,base64.b64decode(p["data"]),pos)
+                else:
+                    path=self.object_path(p["sha256"])
+                    with open(path,"rb") as fin:
+                        if os.fstat(fin.fileno()).st_size!=n or safetensors_hash.hash_ranges(fin,[(0,n)])[0]!=p["sha256"] \
+                                or copy_range(fin,fo,0,pos,n)!=n:
+                            raise SafeTensorsException(f"{path}: object is damaged, its size or sha256 doesn't match the manifest")
+                pos+=n
+            if pos!=manifest["size"]:
+                raise SafeTensorsException(f"{manifest_file}: parts add up to {pos} bytes, file had {manifest['size']}")
+            os.utime(fo.fileno(),ns=(manifest["mtime_ns"],manifest["mtime_ns"]))
+            fo.commit()
+        return pos
+
+def read_manifest(fn:str) -> dict:
+    with open(fn,"rt",encoding="utf-8") as f:
+        manifest=json.load(f)
+    if not isinstance(manifest,dict) or manifest.get("format")!=MANIFEST_FORMAT:
+        raise SafeTensorsException(f"{fn} is not a {MANIFEST_FORMAT} manifest")
+    return manifest
@@ -8,9 +8,8 @@ TODO: gracefully error out on safetensors files without ["__metadata__"]["ss_tag
 """
 
 def get_tags(tensorsfile: str) -> str:
-	s = SafeTensorsFile.open_file(tensorsfile, quiet=True) # omit the first non-JSON line
-	js = s.get_header()
-	md = js["__metadata__"]
+	s = SafeTensorsFile.open_file(tensorsfile, quiet=True, parseHeader=False) # omit the first non-JSON line
+	md = s.get_metadata() # parses only __metadata__
 	_ParseMore(md) # pretty print the metadata
 	stf = md["ss_tag_frequency"]
 	return json.dumps(stf, ensure_ascii=False, separators=(', ', ': '), indent=4)
@@ -1,11 +1,18 @@
-import sys, click
+import os, sys, re, click
 
 import safetensors_worker
+from safetensors_file import is_url
 # This file deals with command line only. If the command line is parsed successfully,
 # we will call one of the functions in safetensors_worker.py.
 
+class FileOrURL(click.Path):
+    """An existing file, or an http:// or https:// URL, which is read with Range requests."""
+    def convert(self,value,param,ctx):
+        if isinstance(value,str) and is_url(value): return value
+        return super().convert(value,param,ctx)
+
 readonly_input_file=click.argument("input_file", metavar='input_file',
-                                   type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+                                   type=FileOrURL(exists=True, file_okay=True, dir_okay=False, readable=True))
 output_file=click.argument("output_file", metavar='output_file',
                             type=click.Path(file_okay=True, dir_okay=False, writable=True))
 
@@ -19,19 +26,47 @@ quiet_flag=click.option("-q","--quiet",default=False,is_flag=True, show_default=
 @click.group()
 @click.version_option(version=7)
 @quiet_flag
+@click.option("--cache-db",default=None,envvar="SAFETENSORS_UTIL_CACHE",
+              type=click.Path(file_okay=True, dir_okay=False, writable=True),
+              help="SQLite file to cache headers and hashes in, for faster header/metadata/listkeys/checklora/scan/hash")
+@click.option("--cache-max-mb",default=256,type=click.IntRange(min=1), show_default=True,
+              help="evict least recently used headers when cached headers exceed this size")
+
+@click.option("--profile",default=False,is_flag=True, show_default=True,
+              help="print where the time went (per phase time, bytes, MB/s, peak RSS) to stderr")
+@click.option("--profile-json",default=None,type=click.Path(file_okay=True, dir_okay=False, writable=True),
+              help="like --profile, but save the results as JSON to this file, - for stderr")
+@click.option("--drop-cache",default=False,is_flag=True, show_default=True,
+              help="when writing files, drop copied data of input and output files from the OS page cache")
+@click.option("--direct-io",default=False,is_flag=True, show_default=True,
+              help="when writing files, copy data with O_DIRECT writes, past the page cache (Linux)")
 
 @click.pass_context
-def cli(ctx,quiet:bool):
+def cli(ctx,quiet:bool,cache_db:str,cache_max_mb:int,profile:bool,profile_json:str,drop_cache:bool,direct_io:bool):
     # ensure that ctx.obj exists and is a dict (in case `cli()` is called
     # by means other than the `if` block below)
     ctx.ensure_object(dict)
     ctx.obj['quiet'] = quiet
+    ctx.obj['drop_cache'] = drop_cache
+    ctx.obj['direct_io'] = direct_io
+    if profile or profile_json is not None:
+        import safetensors_profile
+        safetensors_profile.enable()
+        ctx.call_on_close(lambda:safetensors_profile.report(profile_json))
+    if cache_db is not None:
+        from safetensors_cache import HeaderCache
+        cache=HeaderCache(cache_db,cache_max_mb*1024*1024)
+        ctx.obj['cache'] = cache
+        ctx.call_on_close(cache.close)
 
 
 @cli.command(name="header",short_help="print file header")
 @readonly_input_file
+@click.option("-F","--format","fmt",default="json",type=click.Choice(["json","jsonl","tsv"]), show_default=True,
+              help="json: whole header, one key per line; jsonl/tsv: one line per tensor")
 @click.pass_context
-def cmd_header(ctx,input_file:str) -> int:
+def cmd_header(ctx,input_file:str,fmt:str) -> int:
+    ctx.obj['format'] = fmt
     sys.exit( safetensors_worker.PrintHeader(ctx.obj,input_file) )
 
 
@@ -46,8 +81,11 @@ def cmd_meta(ctx,input_file:str,parse_more:bool)->int:
 
 @cli.command(name="listkeys",short_help="print header key names (except __metadata__) as a Python list")
 @readonly_input_file
+@click.option("-F","--format","fmt",default="python",type=click.Choice(["python","json","jsonl","tsv"]), show_default=True,
+              help="python/json: list of (name, is scalar); jsonl/tsv: one line per tensor, sorted by name")
 @click.pass_context
-def cmd_keyspy(ctx,input_file:str) -> int:
+def cmd_keyspy(ctx,input_file:str,fmt:str) -> int:
+    ctx.obj['format'] = fmt
     sys.exit( safetensors_worker.HeaderKeysToLists(ctx.obj,input_file) )
 
 
@@ -56,12 +94,19 @@ def cmd_keyspy(ctx,input_file:str) -> int:
                  type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
 @click.argument("in_json_file", metavar='input_json_file',
                  type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
-@output_file
+@click.argument("output_file", metavar='[output_file]', required=False,
+                 type=click.Path(file_okay=True, dir_okay=False, writable=True))
 @force_overwrite_flag
+@click.option("-i","--in-place",default=False,is_flag=True, show_default=True,
+              help="rewrite only the header of input_st_file if the new header fits, no output_file needed")
+@click.option("-r","--reserve",default=0,type=click.IntRange(min=0), show_default=True,
+              help="reserve this many bytes of padding in the header of a newly written file, so later edits can be done in place")
 @click.pass_context
-def cmd_writemd(ctx,in_st_file:str,in_json_file:str,output_file:str,force_overwrite:bool) -> int:
+def cmd_writemd(ctx,in_st_file:str,in_json_file:str,output_file:str,force_overwrite:bool,in_place:bool,reserve:int) -> int:
     """Read "__metadata__" from json file and write to safetensors header"""
     ctx.obj['force_overwrite'] = force_overwrite
+    ctx.obj['in_place'] = in_place
+    ctx.obj['reserve'] = reserve
     sys.exit( safetensors_worker.WriteMetadataToHeader(ctx.obj,in_st_file,in_json_file,output_file) )
 
 
@@ -75,24 +120,434 @@ def cmd_extractheader(ctx,input_file:str,output_file:str,force_overwrite:bool) -
     sys.exit( safetensors_worker.ExtractHeader(ctx.obj,input_file,output_file) )
 
 
-@cli.command(name="extractdata",short_help="extract one tensor and save to file")
+key_select_options=[
+    click.option("-k","--key","keys",multiple=True,help="name of tensor, can be used multiple times"),
+    click.option("-g","--glob","globs",multiple=True,help="select tensors with names matching this wildcard pattern"),
+    click.option("-e","--regex","regexes",multiple=True,help="select tensors with names matching this regular expression"),
+    click.option("-K","--key-file",default=None,type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+                 help="text file with names of tensors, one per line")]
+
+def key_select_flags(f):
+    for o in reversed(key_select_options): f=o(f)
+    return f
+
+@cli.command(name="extractdata",short_help="extract tensors and save to files")
 @readonly_input_file
-@click.argument("key_name", metavar='key_name',type=click.STRING)
-@output_file
+@click.argument("key_name", metavar='[key_name', required=False, type=click.STRING)
+@click.argument("output_file", metavar='output_file]', required=False,
+                type=click.Path(file_okay=True, dir_okay=False, writable=True))
+@key_select_flags
+@click.option("-d","--output-dir",default=None,type=click.Path(file_okay=False, dir_okay=True, writable=True),
+              help="save every selected tensor to a file named after it in this directory")
+@click.option("-a","--archive",default=None,type=click.Path(file_okay=True, dir_okay=False, writable=True),
+              help="save selected tensors as members of this tar file")
 @force_overwrite_flag
 @click.pass_context
-def cmd_extractheader(ctx,input_file:str,key_name:str,output_file:str,force_overwrite:bool) -> int:
+def cmd_extractdata(ctx,input_file:str,key_name:str,output_file:str,keys:list[str],globs:list[str],regexes:list[str],
+                    key_file:str,output_dir:str,archive:str,force_overwrite:bool) -> int:
+    """Extract the tensor key_name to output_file, or extract the tensors selected with
+    -k/-g/-e/-K options to a directory (-d) or a tar file (-a). Selected tensors are read
+    in file order, in one pass over the file."""
     ctx.obj['force_overwrite'] = force_overwrite
-    sys.exit( safetensors_worker.ExtractData(ctx.obj,input_file,key_name,output_file) )
+    if key_name is not None:
+        if output_file is None:
+            raise click.UsageError("output_file is required with key_name")
+        if keys or globs or regexes or key_file or output_dir or archive:
+            raise click.UsageError("key_name and output_file can't be used with -k/-g/-e/-K/-d/-a")
+        sys.exit( safetensors_worker.ExtractData(ctx.obj,input_file,key_name,output_file) )
+    ctx.obj['keys'] = keys
+    ctx.obj['globs'] = globs
+    ctx.obj['regexes'] = regexes
+    ctx.obj['key_file'] = key_file
+    ctx.obj['output_dir'] = output_dir
+    ctx.obj['archive'] = archive
+    sys.exit( safetensors_worker.ExtractTensors(ctx.obj,input_file) )
 
 
-@cli.command(name="checklora",short_help="see if input file is a SD 1.x LoRA file")
+@cli.command(name="checklora",short_help="see if input file is a SD 1.x/2.x/XL LoRA or LyCORIS file")
 @readonly_input_file
+@click.option("-a","--arch",default="auto",type=click.Choice(["auto","sd1","sd2","sdxl"]), show_default=True,
+              help="architecture to check against, auto detected by default")
 @click.pass_context
-def cmd_checklora(ctx,input_file:str)->int:
+def cmd_checklora(ctx,input_file:str,arch:str)->int:
+    ctx.obj['arch'] = arch
     sys.exit( safetensors_worker.CheckLoRA(ctx.obj,input_file) )
 
 
+files_and_dirs=click.argument("paths", metavar='path...', nargs=-1, required=True,
+                              type=FileOrURL(exists=True, file_okay=True, dir_okay=True, readable=True))
+local_files_and_dirs=click.argument("paths", metavar='path...', nargs=-1, required=True,
+                                    type=click.Path(exists=True, file_okay=True, dir_okay=True, readable=True))
+jobs_option=click.option("-j","--jobs",default=8,type=click.IntRange(min=1), show_default=True,
+                         help="number of files to process at the same time")
+suffix_option=click.option("-s","--suffix",default=".safetensors", show_default=True,
+                           help="only process files ending with this in directories")
+
+def _parse_key_value(ctx,param,values:tuple[str,...]) -> list[tuple[str,str]]:
+    result=[]
+    for v in values:
+        k,eq,x=v.partition("=")
+        if eq=="" or k=="": raise click.BadParameter(f'"{v}" is not KEY=VALUE')
+        result.append((k,x))
+    return result
+
+
+@cli.command(name="patchmd",short_help="set, delete and rename __metadata__ keys of many files")
+@click.argument("paths", metavar='path...', nargs=-1, required=True,
+                type=click.Path(exists=True, file_okay=True, dir_okay=True, writable=True))
+@click.option("-p","--patch","patch_file",default=None,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+              help="JSON merge patch file: keys with null are deleted, others are set")
+@click.option("--set","set_",multiple=True,metavar="KEY=VALUE",callback=_parse_key_value,
+              help="set metadata key to value, can be used multiple times")
+@click.option("--delete",multiple=True,metavar="KEY",help="delete metadata key, can be used multiple times")
+@click.option("--rename",multiple=True,metavar="OLD=NEW",callback=_parse_key_value,
+              help="rename metadata key, can be used multiple times")
+@click.option("-r","--reserve",default=0,type=click.IntRange(min=0), show_default=True,
+              help="reserve this many bytes of padding in headers of rewritten files, so later edits can be done in place")
+@click.option("-n","--dry-run",default=False,is_flag=True, show_default=True,
+              help="only report what would be done")
+@jobs_option
+@suffix_option
+@click.pass_context
+def cmd_patchmd(ctx,paths:list[str],patch_file:str,set_:list,delete:tuple,rename:list,reserve:int,dry_run:bool,jobs:int,suffix:str) -> int:
+    """Change __metadata__ of every file (and of every file in directories): rename keys,
+    then apply the patch file, then --set and --delete options. Other keys stay as they
+    are. Values that are not strings are saved as JSON. Headers are rewritten in place when
+    the new header fits, otherwise the file is rewritten. Prints one JSON line per file."""
+    ctx.obj['patch_file'] = patch_file
+    ctx.obj['set'] = set_
+    ctx.obj['delete'] = delete
+    ctx.obj['rename'] = rename
+    ctx.obj['reserve'] = reserve
+    ctx.obj['dry_run'] = dry_run
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    sys.exit( safetensors_worker.PatchMetadataFiles(ctx.obj,paths) )
+
+
+@cli.command(name="scan",short_help="summarize headers of all files in directories as JSON lines")
+@files_and_dirs
+@jobs_option
+@suffix_option
+@click.option("-k","--md-key","md_keys",multiple=True,
+              default=["ss_network_module","ss_network_dim","ss_network_alpha","ss_base_model_version",
+                       "ss_sd_model_name","ss_output_name","modelspec.architecture","modelspec.title"],
+              help="__metadata__ item to include in output, can be used multiple times")
+@click.pass_context
+def cmd_scan(ctx,paths:list[str],jobs:int,suffix:str,md_keys:list[str]) -> int:
+    """Read only the headers of files and directory trees, print one JSON line per file"""
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    ctx.obj['md_keys'] = list(md_keys)
+    sys.exit( safetensors_worker.ScanFiles(ctx.obj,paths) )
+
+
+@cli.command(name="hash",short_help="print sha256, AutoV2 and kohya hashes of files as JSON lines")
+@files_and_dirs
+@jobs_option
+@suffix_option
+@click.option("-t","--per-tensor",default=False,is_flag=True, show_default=True,
+              help="also print sha256 of every tensor")
+@click.pass_context
+def cmd_hash(ctx,paths:list[str],jobs:int,suffix:str,per_tensor:bool) -> int:
+    """Hash files and directory trees reading every file once, results are saved in
+    the --cache-db cache if there is one"""
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    ctx.obj['per_tensor'] = per_tensor
+    sys.exit( safetensors_worker.HashFiles(ctx.obj,paths) )
+
+
+@cli.command(name="stats",short_help="print min/max/mean/std and NaN/inf/zero counts of tensors")
+@readonly_input_file
+@key_select_flags
+@click.option("-j","--jobs",default=os.cpu_count() or 4,type=click.IntRange(min=1), show_default="number of CPUs",
+              help="number of tensors to process at the same time")
+@click.option("-F","--format","fmt",default="jsonl",type=click.Choice(["jsonl","tsv"]), show_default=True,
+              help="output format, one line per tensor")
+@click.pass_context
+def cmd_stats(ctx,input_file:str,keys:list[str],globs:list[str],regexes:list[str],key_file:str,jobs:int,fmt:str) -> int:
+    """Print statistics of all tensors, or of tensors selected with -k/-g/-e/-K options.
+    Exit code is 1 if any tensor has NaN or inf values. Needs numpy."""
+    ctx.obj['keys'] = keys
+    ctx.obj['globs'] = globs
+    ctx.obj['regexes'] = regexes
+    ctx.obj['key_file'] = key_file
+    ctx.obj['jobs'] = jobs
+    ctx.obj['format'] = fmt
+    sys.exit( safetensors_worker.PrintStats(ctx.obj,input_file) )
+
+
+@cli.command(name="verify",short_help="check tensor sizes and offsets, optionally look for NaN/inf")
+@local_files_and_dirs
+@jobs_option
+@suffix_option
+@click.option("-d","--deep",default=False,is_flag=True, show_default=True,
+              help="also read all float tensors and look for NaN and inf values")
+@click.pass_context
+def cmd_verify(ctx,paths:list[str],jobs:int,suffix:str,deep:bool) -> int:
+    """Check that every tensor's data_offsets match its shape and dtype, and that tensors
+    cover the data section without gaps or overlaps. Prints one JSON line per file, exit
+    code is 1 if any file has problems. Needs numpy."""
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    ctx.obj['deep'] = deep
+    sys.exit( safetensors_worker.VerifyFiles(ctx.obj,paths) )
+
+
+@cli.command(name="convert",short_help="convert float tensors to F16, BF16 or F32")
+@readonly_input_file
+@output_file
+@click.option("-t","--to",required=True,type=click.Choice(["F16","BF16","F32"]),help="dtype to convert to")
+@click.option("--from","from_dtypes",multiple=True,type=click.Choice(["F64","F32","F16","BF16","F8_E5M2","F8_E4M3"]),
+              help="only convert tensors of this dtype, can be used multiple times, default is all float dtypes")
+@key_select_flags
+@click.option("-j","--jobs",default=os.cpu_count() or 4,type=click.IntRange(min=1), show_default="number of CPUs",
+              help="number of chunks to convert at the same time")
+@click.option("-b","--buffer-mb",default=256,type=click.IntRange(min=1), show_default=True,
+              help="approximate limit of memory used for tensor data, whatever the model size")
+@force_overwrite_flag
+@click.pass_context
+def cmd_convert(ctx,input_file:str,output_file:str,to:str,from_dtypes:list[str],keys:list[str],globs:list[str],
+                regexes:list[str],key_file:str,jobs:int,buffer_mb:int,force_overwrite:bool) -> int:
+    """Convert float tensors, or only the ones selected with -k/-g/-e/-K options, to another
+    float dtype, rounding to nearest even. Values out of range of the new dtype, e.g. above
+    65504 for F16, become inf, and are counted per tensor. Needs numpy."""
+    ctx.obj['force_overwrite'] = force_overwrite
+    ctx.obj['to'] = to
+    ctx.obj['from_dtypes'] = from_dtypes
+    ctx.obj['keys'] = keys
+    ctx.obj['globs'] = globs
+    ctx.obj['regexes'] = regexes
+    ctx.obj['key_file'] = key_file
+    ctx.obj['jobs'] = jobs
+    ctx.obj['buffer_mb'] = buffer_mb
+    sys.exit( safetensors_worker.ConvertDtype(ctx.obj,input_file,output_file) )
+
+
+_SIZE_UNITS={"":1,"k":10**3,"m":10**6,"g":10**9,"t":10**12,"ki":2**10,"mi":2**20,"gi":2**30,"ti":2**40}
+
+def _parse_size(ctx,param,value:str) -> int:
+    # "5GB" is 5*10^9 bytes like in Hugging Face's max_shard_size, "5GiB" is 5*2^30 bytes
+    m=re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([kmgt]i?)?b?\s*",value,re.IGNORECASE)
+    n:int=int(float(m.group(1))*_SIZE_UNITS[(m.group(2) or "").lower()]) if m is not None else 0
+    if n<1: raise click.BadParameter(f'"{value}" is not a size, use a number of bytes, or e.g. 500MB, 5GB, 4GiB')
+    return n
+
+@cli.command(name="filter",short_help="write a file with only some of the tensors")
+@readonly_input_file
+@output_file
+@key_select_flags
+@click.option("-x","--exclude-glob","exclude_globs",multiple=True,help="leave out tensors with names matching this wildcard pattern")
+@click.option("-X","--exclude-regex","exclude_regexes",multiple=True,help="leave out tensors with names matching this regular expression")
+@click.option("--no-metadata",default=False,is_flag=True, show_default=True,
+              help="don't write __metadata__ to output_file")
+@click.option("-M","--metadata-file",default=None,type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+              help="write the __metadata__ of this JSON file instead of the one of input_file")
+@click.option("-r","--reserve",default=0,type=click.IntRange(min=0), show_default=True,
+              help="reserve this many bytes of padding in the header, so later edits can be done in place")
+@force_overwrite_flag
+@click.pass_context
+def cmd_filter(ctx,input_file:str,output_file:str,keys:tuple,globs:tuple,regexes:tuple,key_file:str,exclude_globs:tuple,
+               exclude_regexes:tuple,no_metadata:bool,metadata_file:str,reserve:int,force_overwrite:bool) -> int:
+    """Write the tensors of input_file selected with -k, -g, -e and -K (all tensors if none of
+    these is given), except those matching -x or -X, to output_file. Tensor data is copied
+    by the OS, not read into memory. __metadata__ is kept unless --no-metadata or -M is given."""
+    ctx.obj['keys'] = keys
+    ctx.obj['globs'] = globs
+    ctx.obj['regexes'] = regexes
+    ctx.obj['key_file'] = key_file
+    ctx.obj['exclude_globs'] = exclude_globs
+    ctx.obj['exclude_regexes'] = exclude_regexes
+    ctx.obj['no_metadata'] = no_metadata
+    ctx.obj['metadata_file'] = metadata_file
+    ctx.obj['reserve'] = reserve
+    ctx.obj['force_overwrite'] = force_overwrite
+    sys.exit( safetensors_worker.FilterTensors(ctx.obj,input_file,output_file) )
+
+
+def _parse_align(ctx,param,value:int) -> int:
+    if value<8 or value&(value-1)!=0: raise click.BadParameter(f"{value} is not a power of two of at least 8")
+    return value
+
+align_option=click.option("-a","--align",default=64,type=int,callback=_parse_align, show_default=True,
+                          help="alignment in bytes, a power of two, e.g. 64 or 4096")
+
+@cli.command(name="repack",short_help="rewrite file with tensors aligned to 64 or 4096 bytes")
+@readonly_input_file
+@output_file
+@align_option
+@click.option("-r","--reserve",default=0,type=click.IntRange(min=0), show_default=True,
+              help="reserve at least this many bytes of padding in the header, so later edits can be done in place")
+@force_overwrite_flag
+@click.pass_context
+def cmd_repack(ctx,input_file:str,output_file:str,align:int,reserve:int,force_overwrite:bool) -> int:
+    """Rewrite input_file as output_file with the data section starting at a multiple of
+    --align bytes, and tensors ordered so that every tensor whose size is a multiple of
+    --align starts at a multiple of it. The format allows no gaps between tensors, so the
+    others start at a multiple of the largest power of two their size is a multiple of."""
+    ctx.obj['align'] = align
+    ctx.obj['reserve'] = reserve
+    ctx.obj['force_overwrite'] = force_overwrite
+    sys.exit( safetensors_worker.RepackFile(ctx.obj,input_file,output_file) )
+
+
+@cli.command(name="alignment",short_help="print histogram of tensor alignment of files as JSON lines")
+@files_and_dirs
+@align_option
+@jobs_option
+@suffix_option
+@click.pass_context
+def cmd_alignment(ctx,paths:list[str],align:int,jobs:int,suffix:str) -> int:
+    """Print one JSON line per file (and per file in directories) with how many tensors and
+    bytes start at a multiple of 4096, 2048, ... 1 bytes, and how many bytes are aligned to
+    --align bytes now and would be after "repack"."""
+    ctx.obj['align'] = align
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    sys.exit( safetensors_worker.AlignmentReport(ctx.obj,paths) )
+
+
+@cli.command(name="shard",short_help="split file into shards with a Hugging Face style index file")
+@readonly_input_file
+@click.argument("output_dir", metavar='output_dir',
+                type=click.Path(file_okay=False, dir_okay=True, writable=True))
+@click.option("-m","--max-size",default="5GB",callback=_parse_size, show_default=True,
+              help="maximum size of tensor data in one shard, e.g. 500MB, 5GB, 4GiB")
+@click.option("-p","--prefix",default="model", show_default=True,
+              help="shards are named PREFIX-00001-of-0000N.safetensors, index file PREFIX.safetensors.index.json")
+@force_overwrite_flag
+@click.pass_context
+def cmd_shard(ctx,input_file:str,output_dir:str,max_size:int,prefix:str,force_overwrite:bool) -> int:
+    """Split input_file into shards in output_dir, and write an index file that maps every
+    tensor to its shard. Tensor data is copied by the OS, not read into memory."""
+    ctx.obj['force_overwrite'] = force_overwrite
+    ctx.obj['max_size'] = max_size
+    ctx.obj['prefix'] = prefix
+    sys.exit( safetensors_worker.ShardFile(ctx.obj,input_file,output_dir) )
+
+
+@cli.command(name="unshard",short_help="join shards listed in an index file into one file")
+@click.argument("index_file", metavar='index_file',
+                type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@output_file
+@force_overwrite_flag
+@click.pass_context
+def cmd_unshard(ctx,index_file:str,output_file:str,force_overwrite:bool) -> int:
+    """Join the shards listed in index_file (e.g. model.safetensors.index.json) into
+    output_file. Tensor data is copied by the OS, not read into memory."""
+    ctx.obj['force_overwrite'] = force_overwrite
+    sys.exit( safetensors_worker.UnshardFiles(ctx.obj,index_file,output_file) )
+
+
+@cli.command(name="diff",short_help="compare headers and tensor data of two files")
+@click.argument("file_a", metavar='file_a',
+                type=FileOrURL(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.argument("file_b", metavar='file_b',
+                type=FileOrURL(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.option("-n","--numeric",default=False,is_flag=True, show_default=True,
+              help="compare differing tensors value by value, print max absolute and relative error (needs numpy)")
+@click.option("-b","--brief",default=False,is_flag=True, show_default=True,
+              help="only report whether the files differ, stop at the first difference")
+@click.option("-j","--jobs",default=8,type=click.IntRange(min=1), show_default=True,
+              help="number of tensors to compare at the same time")
+@click.option("-F","--format","fmt",default="text",type=click.Choice(["text","jsonl"]), show_default=True,
+              help="text: one line per difference; jsonl: one JSON object per difference")
+@click.pass_context
+def cmd_diff(ctx,file_a:str,file_b:str,numeric:bool,brief:bool,jobs:int,fmt:str) -> int:
+    """Compare __metadata__, tensor names, dtypes and shapes of file_a and file_b, then the
+    data of tensors found in both. Exit code is 0 if the files have the same tensors and
+    metadata, 1 if they differ."""
+    ctx.obj['numeric'] = numeric
+    ctx.obj['brief'] = brief
+    ctx.obj['jobs'] = jobs
+    ctx.obj['format'] = fmt
+    sys.exit( safetensors_worker.DiffFiles(ctx.obj,file_a,file_b) )
+
+
+@cli.group(name="dedup",short_help="keep tensors shared by many files only once")
+def cli_dedup():
+    """Deduplicate tensors of a model library: add files to a content-addressed tensor store
+    and keep small manifests in their place, or share identical tensors in place on file
+    systems that support it."""
+    pass
+
+
+@cli_dedup.command(name="add",short_help="add files to a tensor store, write a manifest next to each")
+@click.argument("store_dir", metavar='store_dir', type=click.Path(file_okay=False, dir_okay=True, writable=True))
+@local_files_and_dirs
+@click.option("-r","--remove",default=False,is_flag=True, show_default=True,
+              help="delete every file after its tensors are in the store and its manifest is written")
+@jobs_option
+@suffix_option
+@click.pass_context
+def cmd_dedup_add(ctx,store_dir:str,paths:list[str],remove:bool,jobs:int,suffix:str) -> int:
+    """Store every tensor of the files once in store_dir, and write FILE.stmanifest next to
+    each file, from which "dedup restore" rebuilds the exact file. Prints one JSON line
+    per file with the bytes it saves."""
+    ctx.obj['remove'] = remove
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    sys.exit( safetensors_worker.DedupAdd(ctx.obj,store_dir,paths) )
+
+
+@cli_dedup.command(name="restore",short_help="rebuild files from their manifests")
+@click.argument("store_dir", metavar='store_dir', type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@local_files_and_dirs
+@jobs_option
+@force_overwrite_flag
+@click.pass_context
+def cmd_dedup_restore(ctx,store_dir:str,paths:list[str],jobs:int,force_overwrite:bool) -> int:
+    """Rebuild the original file of every manifest (and of every .stmanifest file in
+    directories) next to the manifest, byte for byte."""
+    ctx.obj['jobs'] = jobs
+    ctx.obj['force_overwrite'] = force_overwrite
+    sys.exit( safetensors_worker.DedupRestore(ctx.obj,store_dir,paths) )
+
+
+@cli_dedup.command(name="report",short_help="print bytes shared and saved by manifests")
+@local_files_and_dirs
+@click.pass_context
+def cmd_dedup_report(ctx,paths:list[str]) -> int:
+    """Print one JSON line per manifest with its bytes shared with other files, and a last
+    line with the totals of the library."""
+    sys.exit( safetensors_worker.DedupReport(ctx.obj,paths) )
+
+
+@cli_dedup.command(name="reflink",short_help="share blocks of identical tensors in place")
+@local_files_and_dirs
+@jobs_option
+@suffix_option
+@click.pass_context
+def cmd_dedup_reflink(ctx,paths:list[str],jobs:int,suffix:str) -> int:
+    """Find tensors that are in more than one file, and let the file system share their
+    blocks, without changing the files (btrfs, XFS). Prints one JSON line per file with
+    the bytes shared."""
+    ctx.obj['jobs'] = jobs
+    ctx.obj['suffix'] = suffix
+    sys.exit( safetensors_worker.DedupReflink(ctx.obj,paths) )
+
+
+@cli.command(name="serve",short_help="answer header/metadata queries on a Unix socket")
+@click.argument("socket_path", metavar='socket_path', type=click.Path(dir_okay=False))
+@click.option("--max-files",default=1024,type=click.IntRange(min=1), show_default=True,
+              help="keep at most this many files open and parsed")
+@click.option("--cache-mb",default=256,type=click.IntRange(min=1), show_default=True,
+              help="close least recently used files when their headers exceed this size")
+@click.option("-j","--jobs",default=8,type=click.IntRange(min=1), show_default=True,
+              help="number of requests to work on at the same time")
+@click.pass_context
+def cmd_serve(ctx,socket_path:str,max_files:int,cache_mb:int,jobs:int) -> int:
+    """Listen on Unix domain socket socket_path and answer header, metadata, listkeys,
+    checklora and extractdata requests, one JSON object per line, until SIGINT or SIGTERM.
+    Files stay open and parsed between requests, until they change on disk."""
+    ctx.obj['max_files'] = max_files
+    ctx.obj['cache_mb'] = cache_mb
+    ctx.obj['jobs'] = jobs
+    sys.exit( safetensors_worker.Serve(ctx.obj,socket_path) )
+
+
 if __name__ == '__main__':
     sys.stdout.reconfigure(encoding='utf-8')
     cli(obj={},max_content_width=96)
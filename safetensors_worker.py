@@ -1,5 +1,6 @@
-import os, sys, json
-from safetensors_file import SafeTensorsFile
+import os, sys, json, re, math, fnmatch, tarfile, io, threading, concurrent.futures
+from safetensors_file import SafeTensorsFile, SafeTensorsException, OutputFile, pad_header, pad_header_like, copy_range, copy_ranges, read_at, write_at, is_url, same_bytes, dedupe_range, DTYPE_SIZES
+import safetensors_hash, safetensors_output, safetensors_store, lora_schemas
 
 def _need_force_overwrite(output_file:str,cmdLine:dict) -> bool:
     if cmdLine["force_overwrite"]==False:
@@ -8,8 +9,21 @@ def _need_force_overwrite(output_file:str,cmdLine:dict) -> bool:
             return True
     return False
 
+def _OutputFile(output_file:str,size:int,cmdLine:dict) -> OutputFile:
+    return OutputFile(output_file,size,cmdLine.get('drop_cache',False),cmdLine.get('direct_io',False))
+
 def WriteMetadataToHeader(cmdLine:dict,in_st_file:str,in_json_file:str,output_file:str) -> int:
-    if _need_force_overwrite(output_file,cmdLine): return -1
+    in_place:bool=cmdLine.get('in_place',False)
+    if in_place:
+        if output_file is not None:
+            print("output file must not be specified when writing in place",file=sys.stderr)
+            return -1
+        output_file=in_st_file
+    else:
+        if output_file is None:
+            print("output file must be specified unless writing in place",file=sys.stderr)
+            return -1
+        if _need_force_overwrite(output_file,cmdLine): return -1
 
     with open(in_json_file,"rt") as f:
         inmeta=json.load(f)
@@ -20,33 +34,38 @@ def WriteMetadataToHeader(cmdLine:dict,in_st_file:str,in_json_file:str,output_fi
     inmeta=inmeta["__metadata__"] #keep only metadata
     #json.dump(inmeta,fp=sys.stdout,indent=2)
 
-    s=SafeTensorsFile.open_file(in_st_file)
-    js=s.get_header()
+    with SafeTensorsFile.open_file(in_st_file) as s:
+        js=s.get_header()
 
-    if inmeta==[]:
-        js.pop("__metadata__",0)
-        print("loaded __metadata__ is an empty list, output file will not contain __metadata__ in header")
-    else:
-        print("adding __metadata__ to header:")
-        json.dump(inmeta,fp=sys.stdout,indent=2)
-        if isinstance(inmeta,dict):
-            for k in inmeta:
-                inmeta[k]=str(inmeta[k])
+        if inmeta==[]:
+            js.pop("__metadata__",0)
+            print("loaded __metadata__ is an empty list, output file will not contain __metadata__ in header")
         else:
-            inmeta=str(inmeta)
-        #js["__metadata__"]=json.dumps(inmeta,ensure_ascii=False)
-        js["__metadata__"]=inmeta
-        print()
-
-    newhdrbuf=json.dumps(js,separators=(',',':'),ensure_ascii=False).encode('utf-8')
-    newhdrlen:int=int(len(newhdrbuf))
-    pad:int=((newhdrlen+7)&(~7))-newhdrlen #pad to multiple of 8
-
-    with open(output_file,"wb") as f:
-        f.write(int(newhdrlen+pad).to_bytes(8,'little'))
-        f.write(newhdrbuf)
-        if pad>0: f.write(bytearray([32]*pad))
-        i:int=s.copy_data_to_file(f)
+            print("adding __metadata__ to header:")
+            json.dump(inmeta,fp=sys.stdout,indent=2)
+            if isinstance(inmeta,dict):
+                for k in inmeta:
+                    inmeta[k]=str(inmeta[k])
+            else:
+                inmeta=str(inmeta)
+            #js["__metadata__"]=json.dumps(inmeta,ensure_ascii=False)
+            js["__metadata__"]=inmeta
+            print()
+
+        newhdrbuf=json.dumps(js,separators=(',',':'),ensure_ascii=False).encode('utf-8')
+        if in_place:
+            if s.write_header_in_place(newhdrbuf):
+                print(f"header of file {output_file} rewritten in place, {s.headerlen-len(newhdrbuf)} bytes of slack left")
+                return 0
+            print(f"new header needs {len(newhdrbuf)} bytes, only {s.headerlen} available, rewriting whole file")
+
+        # written to a temporary file first, which replaces the output (or input) file when done
+        hdr=pad_header_like(newhdrbuf,cmdLine.get('reserve',0),s.headerlen,s.st.st_blksize)
+        with _OutputFile(output_file,len(hdr)+s.st.st_size-8-s.headerlen,cmdLine) as f:
+            f.write(hdr)
+            i:int=s.copy_data_to_file(f)
+            s.close_file() #close it in case user wants to write back to input_file itself
+            if i==0: f.commit()
     if i==0:
         print(f"file {output_file} saved successfully")
     else:
@@ -54,24 +73,20 @@ def WriteMetadataToHeader(cmdLine:dict,in_st_file:str,in_json_file:str,output_fi
     return i
 
 def PrintHeader(cmdLine:dict,input_file:str) -> int:
-    s=SafeTensorsFile.open_file(input_file,cmdLine['quiet'])
+    s=SafeTensorsFile.open_file(input_file,cmdLine['quiet'],cache=cmdLine.get('cache'))
     js=s.get_header()
 
     # All the .safetensors files I've seen have long key names, and as a result,
     # neither json nor pprint package prints text in very readable format,
     # so we print it ourselves, putting key name & value on one long line.
-    # Note the print out is in Python format, not valid JSON format.
-    firstKey=True
-    print("{")
-    for key in js:
-        if firstKey:
-            firstKey=False
-        else:
-            print(",")
-        json.dump(key,fp=sys.stdout,ensure_ascii=False,separators=(',',':'))
-        print(": ",end='')
-        json.dump(js[key],fp=sys.stdout,ensure_ascii=False,separators=(',',':'))
-    print("\n}")
+    sys.stdout.flush() #in case open_file() printed something
+    out=safetensors_output.BufferedWriter()
+    fmt:str=cmdLine.get('format',"json")
+    if fmt=="json":
+        safetensors_output.write_header_json(out,js)
+    else:
+        safetensors_output.write_tensor_records(out,js,js.keys(),fmt)
+    out.flush()
     return 0
 
 def _ParseMore(d:dict):
@@ -103,21 +118,23 @@ def _ParseMore(d:dict):
             _ParseMore(value)
 
 def PrintMetadata(cmdLine:dict,input_file:str) -> int:
-    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
-        js=s.get_header()
+    # without a cache, only __metadata__ is parsed, with one, the whole header is parsed
+    # and cached the first time, later runs don't need to read the file at all
+    cache=cmdLine.get('cache')
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet'],parseHeader=cache is not None,cache=cache) as s:
+        md=s.get_metadata()
 
-        if not "__metadata__" in js:
+        if md is None:
             print("file header does not contain a __metadata__ item",file=sys.stderr)
             return -2
 
-        md=js["__metadata__"]
         if cmdLine['parse_more']:
             _ParseMore(md)
         json.dump({"__metadata__":md},fp=sys.stdout,ensure_ascii=False,separators=(',',':'),indent=1)
     return 0
 
 def HeaderKeysToLists(cmdLine:dict,input_file:str) -> int:
-    s=SafeTensorsFile.open_file(input_file,cmdLine['quiet'])
+    s=SafeTensorsFile.open_file(input_file,cmdLine['quiet'],cache=cmdLine.get('cache'))
     js=s.get_header()
 
     _lora_keys:list[tuple(str,bool)]=[] # use list to sort by name
@@ -132,19 +149,26 @@ def HeaderKeysToLists(cmdLine:dict,input_file:str) -> int:
         _lora_keys.append((key,isScalar))
     _lora_keys.sort(key=lambda x:x[0])
 
-    def printkeylist(kl):
+    fmt:str=cmdLine.get('format',"python")
+    sys.stdout.flush() #in case open_file() printed something
+    out=safetensors_output.BufferedWriter()
+    if fmt in safetensors_output.TENSOR_FORMATS:
+        safetensors_output.write_tensor_records(out,js,[x[0] for x in _lora_keys],fmt)
+    else:
+        if fmt=="json":
+            out.write("[\n")
+            fmtkey=lambda x:json.dumps(list(x),ensure_ascii=False)
+        else:
+            out.write("# use list to keep insertion order\n")
+            out.write("_lora_keys:list[tuple[str,bool]]=[\n")
+            fmtkey=str
         firstKey=True
-        for key in kl:
+        for key in _lora_keys:
             if firstKey: firstKey=False
-            else: print(",")
-            print(key,end='')
-        print()
-
-    print("# use list to keep insertion order")
-    print("_lora_keys:list[tuple[str,bool]]=[")
-    printkeylist(_lora_keys)
-    print("]")
-
+            else: out.write(",\n")
+            out.write(fmtkey(key))
+        out.write("\n]\n")
+    out.flush()
     return 0
 
 
@@ -165,61 +189,39 @@ def ExtractHeader(cmdLine:dict,input_file:str,output_file:str)->int:
     return 0
 
 
-def _CheckLoRA_internal(s:SafeTensorsFile)->int:
-    import lora_keys_sd15 as lora_keys
-    js=s.get_header()
-    set_scalar=set()
-    set_nonscalar=set()
-    for x in lora_keys._lora_keys:
-        if x[1]==True: set_scalar.add(x[0])
-        else: set_nonscalar.add(x[0])
-
-    bad_unknowns:list[str]=[] # unrecognized keys
-    bad_scalars:list[str]=[] #bad scalar
-    bad_nonscalars:list[str]=[] #bad nonscalar
-    for key in js:
-        if key in set_nonscalar:
-            if js[key]['shape']==[]: bad_nonscalars.append(key)
-            set_nonscalar.remove(key)
-        elif key in set_scalar:
-            if js[key]['shape']!=[]: bad_scalars.append(key)
-            set_scalar.remove(key)
-        else:
-            if "__metadata__"!=key:
-                bad_unknowns.append(key)
+def _CheckLoRA_internal(r:lora_schemas.CheckResult)->int:
+    if r.schema is None:
+        print("no LoRA keys of any supported architecture found")
+        return 1
+    print(f"architecture: {lora_schemas.SCHEMAS[r.schema][0]}, network type: {r.network_type.name}")
 
-    hasError=False
-
-    if len(bad_unknowns)!=0:
+    if len(r.unknowns)!=0:
         print("INFO: unrecognized items:")
-        for x in bad_unknowns: print(" ",x)
-        #hasError=True
+        for x in r.unknowns: print(" ",x)
 
-    if len(set_scalar)>0:
+    if len(r.missing_scalars)>0:
         print("missing scalar keys:")
-        for x in set_scalar: print(" ",x)
-        hasError=True
-    if len(set_nonscalar)>0:
+        for x in r.missing_scalars: print(" ",x)
+    if len(r.missing_nonscalars)>0:
         print("missing nonscalar keys:")
-        for x in set_nonscalar: print(" ",x)
-        hasError=True
+        for x in r.missing_nonscalars: print(" ",x)
 
-    if len(bad_scalars)!=0:
+    if len(r.bad_scalars)!=0:
         print("keys expected to be scalar but are nonscalar:")
-        for x in bad_scalars: print(" ",x)
-        hasError=True
+        for x in r.bad_scalars: print(" ",x)
 
-    if len(bad_nonscalars)!=0:
+    if len(r.bad_nonscalars)!=0:
         print("keys expected to be nonscalar but are scalar:")
-        for x in bad_nonscalars: print(" ",x)
-        hasError=True
+        for x in r.bad_nonscalars: print(" ",x)
 
-    return (1 if hasError else 0)
+    return (1 if r.has_error() else 0)
 
 def CheckLoRA(cmdLine:dict,input_file:str)->int:
-    s=SafeTensorsFile.open_file(input_file)
-    i:int=_CheckLoRA_internal(s)
-    if i==0: print("looks like an OK SD 1.x LoRA file")
+    s=SafeTensorsFile.open_file(input_file,cache=cmdLine.get('cache'))
+    arch:str=cmdLine.get('arch')
+    r=lora_schemas.check(s.get_header(),None if arch=="auto" else arch)
+    i:int=_CheckLoRA_internal(r)
+    if i==0: print(f"looks like an OK {lora_schemas.SCHEMAS[r.schema][0]} {r.network_type.name} file")
     return 0
 
 def ExtractData(cmdLine:dict,input_file:str,key_name:str,output_file:str)->int:
@@ -241,3 +243,976 @@ def ExtractData(cmdLine:dict,input_file:str,key_name:str,output_file:str)->int:
             return -1
     if cmdLine['quiet']==False: print(f"{key_name} saved to {output_file}, len={wn}")
     return 0
+
+def _SelectKeys(js:dict,cmdLine:dict) -> list[str]:
+    """Returns header keys selected by the keys, globs, regexes and key_file items of cmdLine,
+    or None if an explicitly named key doesn't exist."""
+    names:list[str]=list(cmdLine.get('keys',[]))
+    if cmdLine.get('key_file') is not None:
+        with open(cmdLine['key_file'],"rt",encoding="utf-8") as f:
+            names.extend(line.strip() for line in f if line.strip()!="")
+    missing=[k for k in names if k not in js or k=="__metadata__"]
+    for k in missing:
+        print(f'key "{k}" not found in header (key names are case-sensitive)',file=sys.stderr)
+    if len(missing)>0: return None
+
+    selected=dict.fromkeys(names)
+    globs=cmdLine.get('globs',[])
+    regexes=[re.compile(x) for x in cmdLine.get('regexes',[])]
+    if len(globs)>0 or len(regexes)>0:
+        for k in js:
+            if k=="__metadata__" or k in selected: continue
+            if any(fnmatch.fnmatchcase(k,g) for g in globs) or any(r.search(k) for r in regexes):
+                selected[k]=None
+    return list(selected)
+
+def _TensorFileName(key_name:str) -> str:
+    fn=key_name.replace('/','_').replace('\\','_')
+    return "_"+fn if fn in ("",".","..") else fn
+
+def _TensorFileNames(names:list[str]) -> dict[str,str]:
+    '''Returns a file name for every tensor name. Names that would give the same file name as
+    an earlier one, e.g. "a/b" and "a_b", or names that differ only in case, which are the
+    same file on Windows and macOS, get a suffix ~2, ~3, ...'''
+    result:dict[str,str]={}
+    used:set[str]=set()
+    for k in names:
+        fn=base=_TensorFileName(k)
+        i:int=1
+        while fn.casefold() in used:
+            i+=1
+            fn=f"{base}~{i}"
+        used.add(fn.casefold())
+        result[k]=fn
+    return result
+
+def ExtractTensors(cmdLine:dict,input_file:str) -> int:
+    """Extracts many tensors in one forward pass over input_file, to files in a directory
+    or to members of a tar archive."""
+    output_dir:str=cmdLine.get('output_dir')
+    archive:str=cmdLine.get('archive')
+    if (output_dir is None)==(archive is None):
+        print("specify either an output directory or an archive file",file=sys.stderr)
+        return -1
+    if archive is not None and _need_force_overwrite(archive,cmdLine): return -1
+
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
+        js=s.get_header()
+        names=_SelectKeys(js,cmdLine)
+        if names is None: return -1
+        if len(names)==0:
+            print("no keys selected",file=sys.stderr)
+            return -1
+        fns=_TensorFileNames(names)
+        for k in names:
+            if fns[k]!=_TensorFileName(k): print(f"{k}: file name {_TensorFileName(k)} is taken, saved as {fns[k]}",file=sys.stderr)
+
+        if output_dir is not None:
+            os.makedirs(output_dir,exist_ok=True)
+            if cmdLine['force_overwrite']==False:
+                for k in names:
+                    if _need_force_overwrite(os.path.join(output_dir,fns[k]),cmdLine): return -1
+            tar=None
+        else:
+            tar=tarfile.open(archive,"w")
+
+        total:int=0
+        try:
+            for name,data in s.read_tensors(names):
+                if tar is not None:
+                    ti=tarfile.TarInfo(fns[name])
+                    ti.size=len(data)
+                    tar.addfile(ti,io.BytesIO(data))
+                else:
+                    with open(os.path.join(output_dir,fns[name]),"wb") as fo:
+                        fo.write(data)
+                total+=len(data)
+        finally:
+            if tar is not None: tar.close()
+
+    if cmdLine['quiet']==False:
+        print(f"{len(names)} tensors, {total} bytes saved to {output_dir if tar is None else archive}")
+    return 0
+
+
+def _IterFiles(paths:list[str],suffix:str):
+    for p in paths:
+        if os.path.isdir(p):
+            for root,dirs,files in os.walk(p):
+                dirs.sort()
+                for fn in sorted(files):
+                    if fn.endswith(suffix): yield os.path.join(root,fn)
+        else:
+            yield p
+
+def _ScanOneFile(fn:str,md_keys:list[str],cache) -> dict:
+    rec={"file":fn}
+    try:
+        with SafeTensorsFile.open_file(fn,quiet=True,cache=cache) as s:
+            rec.update(s.get_summary())
+            md=s.get_metadata()
+            if isinstance(md,dict):
+                rec["metadata"]={k:md[k] for k in md_keys if k in md}
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def _ForEachFileParallel(cmdLine:dict,paths:list[str],func,*args) -> int:
+    """Calls func(file_name,*args) for every file on a thread pool and prints the returned
+    dicts as JSON lines, in the order they are done. Returns number of files, and number
+    of results with an "error" item or "ok" set to false."""
+    jobs:int=cmdLine['jobs']
+    nFiles:int=0
+    nErrors:int=0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+        pending=set()
+        def print_done(return_when):
+            nonlocal pending,nErrors
+            done,pending=concurrent.futures.wait(pending,return_when=return_when)
+            for fut in done:
+                rec=fut.result()
+                if "error" in rec or rec.get("ok",True)==False: nErrors+=1
+                print(json.dumps(rec,ensure_ascii=False))
+            sys.stdout.flush()
+
+        # keep a bounded number of files in flight, so results stream out while we are still walking
+        for fn in _IterFiles(paths,cmdLine['suffix']):
+            nFiles+=1
+            pending.add(ex.submit(func,fn,*args))
+            if len(pending)>=jobs*4: print_done(concurrent.futures.FIRST_COMPLETED)
+        while pending: print_done(concurrent.futures.FIRST_COMPLETED)
+    return nFiles,nErrors
+
+def ScanFiles(cmdLine:dict,paths:list[str]) -> int:
+    """Prints one JSON line per file, in the order the results come in."""
+    nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,_ScanOneFile,cmdLine['md_keys'],cmdLine.get('cache'))
+    if cmdLine['quiet']==False:
+        print(f"scanned {nFiles} files, {nErrors} errors",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def _HashOneFile(fn:str,per_tensor:bool,cache) -> dict:
+    rec={"file":fn}
+    try:
+        if is_url(fn): cache=None #cache entries are keyed by inode
+        if cache is not None:
+            h=cache.get_hashes(os.stat(fn))
+            if h is not None and (per_tensor==False or "tensors" in h):
+                if per_tensor==False: h.pop("tensors",None)
+                rec.update(h)
+                return rec
+        with SafeTensorsFile.open_file(fn,quiet=True) as s:
+            h=safetensors_hash.hash_file(s,per_tensor)
+            # only cache if the file didn't change while we were reading it
+            if cache is not None and os.stat(fn).st_mtime_ns==s.st.st_mtime_ns:
+                cache.put_hashes(s.st,h)
+        rec.update(h)
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def HashFiles(cmdLine:dict,paths:list[str]) -> int:
+    """Prints one JSON line of hashes per file, in the order the results come in."""
+    nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,_HashOneFile,cmdLine['per_tensor'],cmdLine.get('cache'))
+    if cmdLine['quiet']==False:
+        print(f"hashed {nFiles} files, {nErrors} errors",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def _ImportNumpyHelpers():
+    try:
+        import safetensors_numpy
+        return safetensors_numpy
+    except ImportError:
+        print("this command needs numpy, install it with: pip install numpy",file=sys.stderr)
+        return None
+
+def _StatsOneTensor(s:SafeTensorsFile,name:str,sn) -> dict:
+    t=s.get_header()[name]
+    rec={"name":name,"dtype":t['dtype'],"shape":t['shape']}
+    try:
+        rec.update(sn.tensor_stats(s.tensor_view(name),t['dtype']))
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def PrintStats(cmdLine:dict,input_file:str) -> int:
+    """Prints statistics of every selected tensor, in header order. Returns 1 if any
+    tensor has NaN or inf elements, so broken files can be screened in bulk."""
+    sn=_ImportNumpyHelpers()
+    if sn is None: return -1
+
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet'],useMmap=True) as s:
+        js=s.get_header()
+        if cmdLine.get('keys') or cmdLine.get('globs') or cmdLine.get('regexes') or cmdLine.get('key_file'):
+            names=_SelectKeys(js,cmdLine)
+            if names is None: return -1
+        else:
+            names=[k for k in js if k!="__metadata__"]
+
+        sys.stdout.flush()
+        out=safetensors_output.BufferedWriter()
+        fmt:str=cmdLine.get('format',"jsonl")
+        columns=["name","dtype","elements","min","max","mean","std","abs_max","nan","inf","zero"]
+        if fmt=="tsv": out.write("\t".join(columns)+"\n")
+        nBad:int=0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=cmdLine['jobs']) as ex:
+            for rec in ex.map(lambda k:_StatsOneTensor(s,k,sn),names):
+                if rec.get("nan",0)>0 or rec.get("inf",0)>0 or "error" in rec: nBad+=1
+                if fmt=="tsv":
+                    out.write("\t".join("" if rec.get(c) is None else str(rec.get(c)) for c in columns)+"\n")
+                else:
+                    out.write(json.dumps(rec,ensure_ascii=False)+"\n")
+        out.flush()
+    if cmdLine['quiet']==False:
+        print(f"{len(names)} tensors, {nBad} with NaN/inf values or errors",file=sys.stderr)
+    return 0 if nBad==0 else 1
+
+def _VerifyOneFile(fn:str,sn,deep_pool) -> dict:
+    rec={"file":fn}
+    problems:list[str]=[]
+    try:
+        with SafeTensorsFile.open_file(fn,quiet=True,useMmap=deep_pool is not None) as s:
+            js=s.get_header()
+            names,begins,ends,nbytes=[],[],[],[]
+            for k,v in js.items():
+                if k=="__metadata__": continue
+                try:
+                    dt,shape,o=v['dtype'],v['shape'],v['data_offsets']
+                    if dt not in DTYPE_SIZES: raise ValueError(f"unknown dtype {dt}")
+                    if not all(isinstance(x,int) and x>=0 for x in shape): raise ValueError(f"bad shape {shape}")
+                    if len(o)!=2 or not all(isinstance(x,int) and x>=0 for x in o): raise ValueError(f"bad data_offsets {o}")
+                except (KeyError,TypeError,ValueError) as e:
+                    problems.append(f"{k}: {e}")
+                    continue
+                names.append(k)
+                begins.append(o[0])
+                ends.append(o[1])
+                nbytes.append(math.prod(shape)*DTYPE_SIZES[dt])
+            problems.extend(sn.check_layout(names,begins,ends,nbytes,s.st.st_size-8-s.headerlen))
+
+            if deep_pool is not None and len(problems)==0:
+                floats=[k for k in names if js[k]['dtype'] in sn.FLOAT_DTYPES]
+                counts=deep_pool.map(lambda k:sn.count_nonfinite(s.tensor_view(k),js[k]['dtype']),floats)
+                for k,n in zip(floats,counts):
+                    if n>0: problems.append(f"{k}: {n} NaN/inf values")
+    except Exception as e:
+        problems.append(str(e))
+    rec["ok"]=len(problems)==0
+    if len(problems)>0: rec["problems"]=problems
+    return rec
+
+def VerifyFiles(cmdLine:dict,paths:list[str]) -> int:
+    """Checks the layout of the data section of files, and with deep option, looks for NaN
+    and inf values. Prints one JSON line per file, in the order the results come in."""
+    sn=_ImportNumpyHelpers()
+    if sn is None: return -1
+    deep_pool=concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4) if cmdLine['deep'] else None
+    try:
+        nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,_VerifyOneFile,sn,deep_pool)
+    finally:
+        if deep_pool is not None: deep_pool.shutdown()
+    if cmdLine['quiet']==False:
+        print(f"verified {nFiles} files, {nErrors} with problems",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def _ConvertChunk(fin,fout,sn,src:str,dst:str,offset_in:int,nbytes_in:int,offset_out:int) -> int:
+    """Converts one chunk, returns the number of values out of range of dst, saved as inf."""
+    buf=read_at(fin,nbytes_in,offset_in) #also works for files on a web server
+    if len(buf)!=nbytes_in: raise OSError(f"tried to read {nbytes_in} bytes at offset {offset_in}, only read {len(buf)} bytes")
+    out,overflows=sn.convert(buf,src,dst)
+    write_at(fout,out,offset_out)
+    return overflows
+
+def ConvertDtype(cmdLine:dict,input_file:str,output_file:str) -> int:
+    """Converts float tensors to another float dtype. Tensors are converted in chunks on a
+    thread pool, at most buffer_mb of input, output and intermediate arrays is in memory at
+    any time, and tensors that are not converted are copied by the OS."""
+    if _need_force_overwrite(output_file,cmdLine): return -1
+    sn=_ImportNumpyHelpers()
+    if sn is None: return -1
+    dst:str=cmdLine['to']
+    from_dtypes=set(cmdLine['from_dtypes'] or [x for x in sn.FLOAT_DTYPES if x!=dst])
+    jobs:int=cmdLine['jobs']
+
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
+        js=s.get_header()
+        if cmdLine.get('keys') or cmdLine.get('globs') or cmdLine.get('regexes') or cmdLine.get('key_file'):
+            selected=_SelectKeys(js,cmdLine)
+            if selected is None: return -1
+            selected=set(selected)
+        else:
+            selected=None
+
+        # new header, tensors stay in the same order in the data section
+        names=sorted((k for k in js if k!="__metadata__"),key=lambda k:js[k]['data_offsets'][0])
+        entries={}
+        convert:dict[str,bool]={}
+        offset:int=0
+        for k in names:
+            t=js[k]
+            conv:bool=t['dtype'] in from_dtypes and t['dtype']!=dst and (selected is None or k in selected)
+            dtype=dst if conv else t['dtype']
+            n:int=math.prod(t['shape'])*DTYPE_SIZES[dtype] if conv else t['data_offsets'][1]-t['data_offsets'][0]
+            entries[k]={"dtype":dtype,"shape":t['shape'],"data_offsets":[offset,offset+n]}
+            convert[k]=conv
+            offset+=n
+        newjs={k:(js[k] if k=="__metadata__" else entries[k]) for k in js} #same key order as input file
+
+        # split converted tensors into chunks, so every job holds at most its share of the buffer
+        chunk_bytes:int=max(cmdLine['buffer_mb']*1024*1024//jobs,1024)
+        data_in:int=8+s.headerlen
+        hdr=pad_header(json.dumps(newjs,separators=(',',':'),ensure_ascii=False).encode('utf-8'))
+        nConverted:int=0
+        overflows:dict[str,int]={} #values out of range of dst, per tensor
+        with _OutputFile(output_file,len(hdr)+offset,cmdLine) as fo:
+            fo.write(hdr)
+            data_out:int=len(hdr)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+                pending=set()
+                tensor_of:dict[concurrent.futures.Future,str]={}
+                def collect(done):
+                    for fut in done:
+                        n=fut.result()
+                        if n>0: overflows[tensor_of[fut]]=overflows.get(tensor_of[fut],0)+n
+                        del tensor_of[fut]
+                for k in names:
+                    t=js[k]
+                    b0:int=t['data_offsets'][0]
+                    o0:int=entries[k]['data_offsets'][0]
+                    if not convert[k]:
+                        n=t['data_offsets'][1]-b0
+                        if copy_range(s.f,fo,data_in+b0,data_out+o0,n)!=n:
+                            print(f"{k}: failed to copy {n} bytes",file=sys.stderr)
+                            return -1
+                        continue
+                    nConverted+=1
+                    isize:int=DTYPE_SIZES[t['dtype']]
+                    osize:int=DTYPE_SIZES[dst]
+                    nelem:int=math.prod(t['shape'])
+                    step:int=max(chunk_bytes//(isize+osize+sn.convert_temp_bytes(t['dtype'],dst)),1)
+                    for i in range(0,nelem,step):
+                        m=min(step,nelem-i)
+                        fut=ex.submit(_ConvertChunk,s.f,fo,sn,t['dtype'],dst,data_in+b0+i*isize,m*isize,data_out+o0+i*osize)
+                        tensor_of[fut]=k
+                        pending.add(fut)
+                        if len(pending)>=jobs:
+                            done,pending=concurrent.futures.wait(pending,return_when=concurrent.futures.FIRST_COMPLETED)
+                            collect(done)
+                collect(concurrent.futures.as_completed(pending))
+            fo.truncate(data_out+offset)
+            s.close_file() #close it in case output_file is input_file
+            fo.commit()
+    for k in names:
+        if k in overflows: print(f"{k}: {overflows[k]} values out of range of {dst}, saved as inf",file=sys.stderr)
+    if cmdLine['quiet']==False:
+        total:str=f", {sum(overflows.values())} values in {len(overflows)} tensors out of range saved as inf" if overflows else ""
+        print(f"{nConverted} tensors converted to {dst}{total}, file {output_file} saved successfully")
+    return 0
+
+def _PackTensors(js:dict,names:list[str],metadata) -> tuple[dict,list[tuple[int,int,int]],int]:
+    """Returns a new header with tensors names of js placed one after another in the given
+    order, and metadata as __metadata__ if it isn't None; (begin in old data section, begin
+    in new data section, size) of every tensor; and the size of the new data section."""
+    newjs={} if metadata is None else {"__metadata__":metadata}
+    ranges:list[tuple[int,int,int]]=[]
+    offset:int=0
+    for k in names:
+        t=js[k]
+        b,e=t['data_offsets']
+        newjs[k]={"dtype":t['dtype'],"shape":t['shape'],"data_offsets":[offset,offset+e-b]}
+        ranges.append((b,offset,e-b))
+        offset+=e-b
+    return newjs,ranges,offset
+
+def _CloseIfReplaced(s:SafeTensorsFile,output_file:str):
+    """Closes s if it is output_file, which OutputFile.commit() replaces, and open files can't
+    be replaced on Windows. Other sources stay open, shard uses them again."""
+    if s.f is None or not os.path.exists(output_file): return
+    if os.path.samestat(s.st,os.stat(output_file)): s.close_file()
+
+def _WritePacked(cmdLine:dict,output_file:str,newjs:dict,sources:list[tuple[SafeTensorsFile,list[tuple[int,int,int]]]],datalen:int) -> bool:
+    """Writes header newjs, with cmdLine['reserve'] bytes of padding if given and the data
+    section aligned to cmdLine['align'] bytes if given, and the tensor ranges of every source
+    file, see _PackTensors(), to output_file."""
+    hdr=pad_header(json.dumps(newjs,separators=(',',':'),ensure_ascii=False).encode('utf-8'),
+                   cmdLine.get('reserve',0),cmdLine.get('align',8))
+    with _OutputFile(output_file,len(hdr)+datalen,cmdLine) as fo:
+        fo.write(hdr)
+        for s,ranges in sources:
+            data_in:int=8+s.headerlen
+            n:int=sum(r[2] for r in ranges)
+            if copy_ranges(s.f,fo,[(data_in+b,len(hdr)+o,c) for b,o,c in ranges])!=n:
+                print(f"{s.filename}: failed to copy {n} bytes of tensor data",file=sys.stderr)
+                return False
+        fo.truncate(len(hdr)+datalen)
+        for s,_ in sources: _CloseIfReplaced(s,output_file)
+        fo.commit()
+    return True
+
+def _ShardFileName(prefix:str,i:int,n:int) -> str:
+    return f"{prefix}-{i:05d}-of-{n:05d}.safetensors"
+
+def ShardFile(cmdLine:dict,input_file:str,output_dir:str) -> int:
+    """Splits input_file into files with at most max_size bytes of tensor data each, plus an
+    index file in the format used by Hugging Face, mapping every tensor to its file. Tensors
+    stay in file order, one bigger than max_size gets a file of its own. Every shard gets
+    the __metadata__ of input_file, tensor data is copied by the OS."""
+    max_size:int=cmdLine['max_size']
+    prefix:str=cmdLine['prefix']
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
+        js=s.get_header()
+        names=sorted((k for k in js if k!="__metadata__"),key=lambda k:js[k]['data_offsets'][0])
+        shards:list[list[str]]=[[]]
+        size:int=0
+        for k in names:
+            o=js[k]['data_offsets']
+            if len(shards[-1])>0 and size+o[1]-o[0]>max_size:
+                shards.append([])
+                size=0
+            shards[-1].append(k)
+            size+=o[1]-o[0]
+
+        fns=[_ShardFileName(prefix,i+1,len(shards)) for i in range(len(shards))]
+        index_file=os.path.join(output_dir,prefix+".safetensors.index.json")
+        for fn in [os.path.join(output_dir,x) for x in fns]+[index_file]:
+            if _need_force_overwrite(fn,cmdLine): return -1
+        os.makedirs(output_dir,exist_ok=True)
+
+        weight_map={}
+        total_size:int=0
+        for fn,keys in zip(fns,shards):
+            newjs,ranges,datalen=_PackTensors(js,keys,js.get("__metadata__"))
+            if not _WritePacked(cmdLine,os.path.join(output_dir,fn),newjs,[(s,ranges)],datalen): return -1
+            weight_map.update((k,fn) for k in keys)
+            total_size+=datalen
+    with open(index_file,"w",encoding="utf-8") as fo:
+        json.dump({"metadata":{"total_size":total_size},"weight_map":dict(sorted(weight_map.items()))},fo,indent=2,ensure_ascii=False)
+        fo.write("\n")
+    if cmdLine['quiet']==False:
+        print(f"{len(names)} tensors saved to {len(fns)} files in {output_dir}, index file {index_file}")
+    return 0
+
+def UnshardFiles(cmdLine:dict,index_file:str,output_file:str) -> int:
+    """Joins the shards listed in a Hugging Face style index file into output_file. Tensors
+    are placed in shard order, and in file order within a shard; __metadata__ is taken from
+    the first shard that has one. Tensor data is copied by the OS."""
+    if _need_force_overwrite(output_file,cmdLine): return -1
+    try:
+        with open(index_file,"rt",encoding="utf-8") as f:
+            index=json.load(f)
+    except ValueError as e:
+        print(f"{index_file}: not a JSON file: {e}",file=sys.stderr)
+        return -1
+    weight_map=index.get("weight_map") if isinstance(index,dict) else None
+    if not isinstance(weight_map,dict):
+        print(f'{index_file}: no "weight_map" in index file',file=sys.stderr)
+        return -1
+    base_dir:str=os.path.dirname(index_file)
+    shard_keys:dict[str,list[str]]={}
+    for k,fn in weight_map.items(): shard_keys.setdefault(fn,[]).append(k)
+
+    files:list[SafeTensorsFile]=[]
+    try:
+        metadata=None
+        newjs={}
+        sources=[]
+        datalen:int=0
+        for fn in sorted(shard_keys):
+            s=SafeTensorsFile.open_file(os.path.join(base_dir,fn),cmdLine['quiet'])
+            files.append(s)
+            js=s.get_header()
+            missing=[k for k in shard_keys[fn] if k not in js or k=="__metadata__"]
+            for k in missing:
+                print(f'{fn}: tensor "{k}" listed in index file not found',file=sys.stderr)
+            if len(missing)>0: return -1
+            if cmdLine['quiet']==False:
+                for k in js:
+                    if k!="__metadata__" and weight_map.get(k)!=fn:
+                        print(f'{fn}: tensor "{k}" not listed in index file for this shard, skipped',file=sys.stderr)
+            if metadata is None: metadata=js.get("__metadata__")
+            names=sorted(shard_keys[fn],key=lambda k:js[k]['data_offsets'][0])
+            shardjs,ranges,n=_PackTensors(js,names,None)
+            for k in names:
+                o=shardjs[k]['data_offsets']
+                shardjs[k]['data_offsets']=[o[0]+datalen,o[1]+datalen]
+            newjs.update(shardjs)
+            sources.append((s,[(b,o+datalen,c) for b,o,c in ranges]))
+            datalen+=n
+        if metadata is not None: newjs={"__metadata__":metadata,**newjs}
+        if not _WritePacked(cmdLine,output_file,newjs,sources,datalen): return -1
+    finally:
+        for s in files: s.close_file()
+    if cmdLine['quiet']==False:
+        print(f"{len(newjs)-(metadata is not None)} tensors from {len(sources)} files saved to {output_file}")
+    return 0
+
+def _DiffOneTensor(sa:SafeTensorsFile,sb:SafeTensorsFile,name:str,sn) -> dict:
+    """Returns a record if tensor name differs between the files, None if it's the same.
+    sn is safetensors_numpy for numeric comparison, or None."""
+    ta=sa.get_header()[name]
+    tb=sb.get_header()[name]
+    if ta['dtype']==tb['dtype']:
+        oa,ob=ta['data_offsets'],tb['data_offsets']
+        if oa[1]-oa[0]==ob[1]-ob[0] and same_bytes(sa.f,sb.f,8+sa.headerlen+oa[0],8+sb.headerlen+ob[0],oa[1]-oa[0]): return None
+    rec={"name":name,"change":"data" if ta['dtype']==tb['dtype'] else "dtype"}
+    if rec["change"]=="dtype": rec.update(a=ta['dtype'],b=tb['dtype'])
+    if sn is not None:
+        try:
+            rec.update(sn.compare(sa.tensor_view(name),ta['dtype'],sb.tensor_view(name),tb['dtype']))
+        except Exception as e:
+            rec["error"]=str(e)
+    return rec
+
+def _DiffText(rec:dict) -> str:
+    c=rec["change"]
+    if c=="only_in_a": return f"only in A: {rec['name']}"
+    if c=="only_in_b": return f"only in B: {rec['name']}"
+    if c=="metadata":
+        if "a" not in rec: return f"__metadata__ only in B: {rec['name']}"
+        if "b" not in rec: return f"__metadata__ only in A: {rec['name']}"
+        return f"__metadata__ {rec['name']}: {json.dumps(rec['a'],ensure_ascii=False)} != {json.dumps(rec['b'],ensure_ascii=False)}"
+    line=f"{rec['name']}: "+("data differs" if c=="data" else f"{c} {rec['a']} != {rec['b']}")
+    if "differing" in rec:
+        line+=f", {rec['differing']} elements differ, max abs error {rec['max_abs_err']:.6g}, max rel error {rec['max_rel_err']:.6g}"
+    if "error" in rec: line+=f", {rec['error']}"
+    return line
+
+def DiffFiles(cmdLine:dict,file_a:str,file_b:str) -> int:
+    """Compares headers of file_a and file_b, then the data of tensors in both files with the
+    same dtype and shape, in parallel, each tensor only up to its first differing block.
+    With numeric, differing tensors (and tensors with the same shape but another dtype) are
+    compared value by value. Prints one line per difference, returns 0 if the files have
+    the same tensors and metadata, 1 if not."""
+    numeric:bool=cmdLine.get('numeric',False)
+    brief:bool=cmdLine.get('brief',False)
+    sn=None
+    if numeric:
+        sn=_ImportNumpyHelpers()
+        if sn is None: return -1
+
+    with SafeTensorsFile.open_file(file_a,True,useMmap=numeric) as sa, SafeTensorsFile.open_file(file_b,True,useMmap=numeric) as sb:
+        ja,jb=sa.get_header(),sb.get_header()
+        sys.stdout.flush()
+        out=safetensors_output.BufferedWriter()
+        fmt:str=cmdLine.get('format',"text")
+        nDiff:int=0
+        def emit(rec:dict):
+            nonlocal nDiff
+            nDiff+=1
+            if brief: return
+            out.write((_DiffText(rec) if fmt=="text" else json.dumps(rec,ensure_ascii=False))+"\n")
+
+        ma,mb=ja.get("__metadata__") or {},jb.get("__metadata__") or {}
+        for k in dict.fromkeys([*ma,*mb]):
+            if ma.get(k)!=mb.get(k) or (k in ma)!=(k in mb):
+                rec={"name":k,"change":"metadata"}
+                if k in ma: rec["a"]=ma[k]
+                if k in mb: rec["b"]=mb[k]
+                emit(rec)
+        common:list[str]=[]
+        for k,v in ja.items():
+            if k=="__metadata__": continue
+            w=jb.get(k)
+            if w is None: emit({"name":k,"change":"only_in_a"})
+            elif v['shape']!=w['shape']: emit({"name":k,"change":"shape","a":v['shape'],"b":w['shape']})
+            elif v['dtype']==w['dtype'] or numeric: common.append(k)
+            else: emit({"name":k,"change":"dtype","a":v['dtype'],"b":w['dtype']})
+        for k in jb:
+            if k!="__metadata__" and k not in ja: emit({"name":k,"change":"only_in_b"})
+
+        # files on a web server have no device and inode, never take them for the same file
+        samefile:bool=not hasattr(sa.f,"pread") and not hasattr(sb.f,"pread") and os.path.samestat(sa.st,sb.st)
+        if not (brief and nDiff>0) and not samefile:
+            common.sort(key=lambda k:ja[k]['data_offsets'][0]) #read file A sequentially
+            with concurrent.futures.ThreadPoolExecutor(max_workers=cmdLine['jobs']) as ex:
+                futures=[ex.submit(_DiffOneTensor,sa,sb,k,sn) for k in common]
+                for fut in futures:
+                    rec=fut.result()
+                    if rec is None: continue
+                    emit(rec)
+                    if brief:
+                        for f in futures: f.cancel()
+                        break
+        out.flush()
+    if brief and nDiff>0: print(f"files {file_a} and {file_b} differ")
+    if cmdLine['quiet']==False and not brief:
+        print(f"{len(common)} tensors compared, {nDiff} differences",file=sys.stderr)
+    return 0 if nDiff==0 else 1
+
+def _DedupAddOneFile(fn:str,store:safetensors_store.TensorStore,remove:bool,totals:dict) -> dict:
+    rec={"file":fn}
+    try:
+        rec.update(store.add_file(fn,remove))
+        with totals["lock"]:
+            for k in ("size","new_bytes","manifest_size","saved_bytes"): totals[k]+=rec[k]
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def DedupAdd(cmdLine:dict,store_dir:str,paths:list[str]) -> int:
+    """Adds files to the tensor store in store_dir, writes a manifest next to each file,
+    and prints one JSON line per file with the bytes it saves."""
+    store=safetensors_store.TensorStore(store_dir)
+    totals={"lock":threading.Lock(),"size":0,"new_bytes":0,"manifest_size":0,"saved_bytes":0}
+    nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,_DedupAddOneFile,store,cmdLine['remove'],totals)
+    if cmdLine['quiet']==False:
+        print(f"added {nFiles} files, {nErrors} errors: {totals['size']} bytes, {totals['new_bytes']} bytes of new objects, "
+              f"{totals['manifest_size']} bytes of manifests, {totals['saved_bytes']} bytes saved",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def _DedupRestoreOneFile(fn:str,store:safetensors_store.TensorStore,cmdLine:dict) -> dict:
+    output_file:str=fn[:-len(safetensors_store.MANIFEST_SUFFIX)] if fn.endswith(safetensors_store.MANIFEST_SUFFIX) else fn+".safetensors"
+    rec={"file":output_file,"manifest":fn}
+    try:
+        if _need_force_overwrite(output_file,cmdLine):
+            rec["error"]="file exists"
+            return rec
+        rec["size"]=store.restore(fn,output_file,cmdLine.get('drop_cache',False),cmdLine.get('direct_io',False))
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def DedupRestore(cmdLine:dict,store_dir:str,paths:list[str]) -> int:
+    """Rebuilds the original file of every manifest, next to the manifest."""
+    store=safetensors_store.TensorStore(store_dir)
+    nFiles,nErrors=_ForEachFileParallel(dict(cmdLine,suffix=safetensors_store.MANIFEST_SUFFIX),paths,_DedupRestoreOneFile,store,cmdLine)
+    if cmdLine['quiet']==False:
+        print(f"restored {nFiles-nErrors} files, {nErrors} errors",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def DedupReport(cmdLine:dict,paths:list[str]) -> int:
+    """Prints one JSON line per manifest with the bytes of its tensors that are shared with
+    other files, and a last line with the totals of the library."""
+    manifests:list[tuple[str,dict[str,int],int]]=[] #(manifest,{object:size},file size)
+    refs:dict[str,int]={} #object -> number of files using it
+    sizes:dict[str,int]={}
+    nErrors:int=0
+    for fn in _IterFiles(paths,safetensors_store.MANIFEST_SUFFIX):
+        try:
+            m=safetensors_store.read_manifest(fn)
+        except Exception as e:
+            print(json.dumps({"manifest":fn,"error":str(e)},ensure_ascii=False))
+            nErrors+=1
+            continue
+        objects={p["sha256"]:p["size"] for p in m["parts"] if "sha256" in p}
+        for h,n in objects.items():
+            refs[h]=refs.get(h,0)+1
+            sizes[h]=n
+        manifests.append((fn,objects,m["size"]))
+
+    total=dict(files=len(manifests),size=0,object_bytes=sum(sizes.values()),manifest_size=0)
+    for fn,objects,size in manifests:
+        manifest_size:int=os.path.getsize(fn)
+        shared:int=sum(n for h,n in objects.items() if refs[h]>1)
+        print(json.dumps({"manifest":fn,"size":size,"manifest_size":manifest_size,"objects":len(objects),
+                          "shared_bytes":shared,"unique_bytes":sum(objects.values())-shared},ensure_ascii=False))
+        total["size"]+=size
+        total["manifest_size"]+=manifest_size
+    total["saved_bytes"]=total["size"]-total["object_bytes"]-total["manifest_size"]
+    print(json.dumps({"library":total}))
+    return 0 if nErrors==0 else 1
+
+def _RangeHashes(fn:str) -> dict:
+    rec={"file":fn}
+    try:
+        with SafeTensorsFile.open_file(fn,quiet=True) as s:
+            ranges=[r for r in safetensors_store.file_ranges(s) if r[1]>=s.st.st_blksize]
+            rec.update(dev=s.st.st_dev,blksize=s.st.st_blksize,ranges=list(zip(ranges,safetensors_hash.hash_ranges(s.f,ranges))))
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def _DedupeOneFile(fn:str,pairs:list[tuple[str,int,int,int]],blksize:int) -> dict:
+    """Shares the extents of ranges of fn with the same ranges of other files, pairs has
+    (source file,source offset,offset in fn,length)."""
+    rec={"file":fn,"shared_bytes":0}
+    try:
+        with open(fn,"rb") as fdst:
+            sources={}
+            try:
+                for src,offset_src,offset_dst,n in pairs:
+                    # only whole blocks can be shared, and only if both ranges start at the same offset in a block
+                    if (offset_src-offset_dst)%blksize!=0: continue
+                    skip:int=-offset_dst%blksize
+                    n=(n-skip)//blksize*blksize
+                    if n<=0: continue
+                    if src not in sources: sources[src]=open(src,"rb")
+                    rec["shared_bytes"]+=dedupe_range(sources[src],fdst,offset_src+skip,offset_dst+skip,n)
+            finally:
+                for f in sources.values(): f.close()
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def DedupReflink(cmdLine:dict,paths:list[str]) -> int:
+    """Finds tensors that are in more than one file, and asks the file system to share their
+    blocks in place, so the files stay where they are and stay the same. Needs a file system
+    with extent sharing (btrfs, XFS), and only works for tensors that start at the same
+    offset within a block in both files, e.g. files repacked with 4096 byte alignment."""
+    jobs:int=cmdLine['jobs']
+    files=list(_IterFiles(paths,cmdLine['suffix']))
+    first:dict[tuple,tuple[str,int]]={} #(device,size,sha256) -> (file,offset) where the tensor was first seen
+    work:dict[str,list]={}
+    blksizes:dict[str,int]={}
+    nErrors:int=0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+        for rec in ex.map(_RangeHashes,files):
+            if "error" in rec:
+                print(json.dumps(rec,ensure_ascii=False))
+                nErrors+=1
+                continue
+            fn=rec["file"]
+            blksizes[fn]=rec["blksize"]
+            for (offset,n),h in rec["ranges"]:
+                key=(rec["dev"],n,h)
+                if key in first:
+                    work.setdefault(fn,[]).append((*first[key],offset,n))
+                else:
+                    first[key]=(fn,offset)
+        total:int=0
+        for rec in ex.map(lambda fn:_DedupeOneFile(fn,work[fn],blksizes[fn]),list(work)):
+            if "error" in rec: nErrors+=1
+            else: total+=rec["shared_bytes"]
+            print(json.dumps(rec,ensure_ascii=False))
+    if cmdLine['quiet']==False:
+        print(f"{len(files)} files, {sum(len(x) for x in work.values())} duplicate tensors, {total} bytes shared, {nErrors} errors",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def Serve(cmdLine:dict,socket_path:str) -> int:
+    """Answers header, metadata, listkeys, checklora and extractdata requests on a Unix
+    domain socket until SIGINT or SIGTERM, keeping recently used files open and parsed."""
+    import asyncio, stat, safetensors_server
+    if os.path.lexists(socket_path):
+        if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+            print(f"{socket_path}: path exists and is not a socket",file=sys.stderr)
+            return -1
+        if safetensors_server.socket_in_use(socket_path):
+            print(f"a server is already listening on {socket_path}",file=sys.stderr)
+            return -1
+        os.unlink(socket_path) #left behind by a server that was killed
+    cache=safetensors_server.FileCache(cmdLine['max_files'],cmdLine['cache_mb']*1024*1024,cmdLine.get('cache'))
+    server=safetensors_server.Server(socket_path,cache,cmdLine['jobs'],cmdLine['quiet'])
+    asyncio.run(server.run())
+    return 0
+
+def _MetadataString(v) -> str:
+    # metadata values must be strings, objects and lists are saved as JSON like kohya-ss does
+    return v if isinstance(v,str) else json.dumps(v,ensure_ascii=False)
+
+def _PatchMetadata(md:dict,renames:list[tuple[str,str]],patch:dict) -> tuple[dict,dict]:
+    """Returns md with keys renamed, then JSON merge patch (RFC 7386) patch applied to it: null
+    deletes a key, anything else sets it. Also returns the number of keys renamed, set and
+    deleted. Renamed keys keep their place, new keys are added at the end."""
+    counts={"renamed":0,"set":0,"deleted":0}
+    for old,new in renames:
+        if old not in md or old==new: continue
+        md={(new if k==old else k):v for k,v in md.items() if k!=new}
+        counts["renamed"]+=1
+    md=dict(md)
+    for k,v in patch.items():
+        if v is None:
+            if md.pop(k,None) is not None: counts["deleted"]+=1
+        elif md.get(k)!=_MetadataString(v):
+            md[k]=_MetadataString(v)
+            counts["set"]+=1
+    return md,counts
+
+def _PatchOneFile(fn:str,renames:list[tuple[str,str]],patch:dict,cmdLine:dict) -> dict:
+    rec={"file":fn}
+    try:
+        with SafeTensorsFile.open_file(fn,quiet=True) as s:
+            js=s.get_header()
+            md=js.get("__metadata__",{})
+            if not isinstance(md,dict): raise SafeTensorsException("__metadata__ is not a JSON object")
+            newmd,counts=_PatchMetadata(md,renames,patch)
+            rec.update(counts)
+            if newmd==md and list(newmd)==list(md):
+                rec["method"]="unchanged"
+                return rec
+            # __metadata__ stays where it was in the header, a new one goes first
+            newjs={"__metadata__":newmd} if "__metadata__" not in js else {}
+            newjs.update((k,newmd if k=="__metadata__" else v) for k,v in js.items())
+            if len(newmd)==0: del newjs["__metadata__"]
+            newhdrbuf=json.dumps(newjs,separators=(',',':'),ensure_ascii=False).encode('utf-8')
+            if len(newhdrbuf)<=s.headerlen:
+                rec["method"]="in place"
+                if not cmdLine['dry_run']: s.write_header_in_place(newhdrbuf)
+                rec["slack"]=s.headerlen-len(newhdrbuf)
+                return rec
+            rec["method"]="rewritten"
+            hdr=pad_header_like(newhdrbuf,cmdLine['reserve'],s.headerlen,s.st.st_blksize)
+            rec["slack"]=len(hdr)-8-len(newhdrbuf)
+            if cmdLine['dry_run']: return rec
+            with _OutputFile(fn,len(hdr)+s.st.st_size-8-s.headerlen,cmdLine) as fo:
+                fo.write(hdr)
+                if s.copy_data_to_file(fo)!=0: raise SafeTensorsException("failed to copy the data section")
+                s.close_file() #open files can't be replaced on Windows
+                fo.commit()
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def PatchMetadataFiles(cmdLine:dict,paths:list[str]) -> int:
+    """Renames, sets and deletes __metadata__ keys of many files, leaving other keys as they
+    are. A header is rewritten in place if the new one fits, otherwise the file is rewritten
+    with its data section copied by the OS. Prints one JSON line per file."""
+    patch:dict={}
+    if cmdLine['patch_file'] is not None:
+        try:
+            with open(cmdLine['patch_file'],"rt",encoding="utf-8") as f:
+                patch=json.load(f)
+        except ValueError as e:
+            print(f"{cmdLine['patch_file']}: not a JSON file: {e}",file=sys.stderr)
+            return -1
+        if isinstance(patch,dict) and list(patch)==["__metadata__"]: patch=patch["__metadata__"] #same as input of writemd
+        if not isinstance(patch,dict):
+            print(f"{cmdLine['patch_file']}: patch must be a JSON object",file=sys.stderr)
+            return -1
+    patch=dict(patch)
+    for k,v in cmdLine['set']: patch[k]=v
+    for k in cmdLine['delete']: patch[k]=None
+    renames:list[tuple[str,str]]=list(cmdLine['rename'])
+    if len(patch)==0 and len(renames)==0:
+        print("nothing to do, give a patch file, or --set, --delete or --rename options",file=sys.stderr)
+        return -1
+
+    lock=threading.Lock()
+    totals:dict[str,int]={"in place":0,"rewritten":0,"unchanged":0}
+    def patch_one(fn:str) -> dict:
+        rec=_PatchOneFile(fn,renames,patch,cmdLine)
+        if "method" in rec:
+            with lock: totals[rec["method"]]+=1
+        return rec
+    nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,patch_one)
+    if cmdLine['quiet']==False:
+        would="would be " if cmdLine['dry_run'] else ""
+        print(f"{nFiles} files: {totals['in place']} {would}patched in place, {totals['rewritten']} {would}rewritten, "
+              f"{totals['unchanged']} unchanged, {nErrors} errors",file=sys.stderr)
+    return 0 if nErrors==0 else 1
+
+def FilterTensors(cmdLine:dict,input_file:str,output_file:str) -> int:
+    """Writes the tensors of input_file selected by the keys, globs, regexes and key_file
+    items of cmdLine (all if there are none), minus those matching exclude_globs or
+    exclude_regexes, to output_file. Tensor data is copied by the OS, adjacent tensors with
+    one copy, and never read into memory. __metadata__ is kept, dropped, or replaced by the
+    __metadata__ of metadata_file."""
+    if _need_force_overwrite(output_file,cmdLine): return -1
+    if cmdLine['no_metadata'] and cmdLine['metadata_file'] is not None:
+        print("use either --no-metadata or --metadata-file, not both",file=sys.stderr)
+        return -1
+    newmd=None
+    if cmdLine['metadata_file'] is not None:
+        with open(cmdLine['metadata_file'],"rt",encoding="utf-8") as f:
+            newmd=json.load(f)
+        if not isinstance(newmd,dict) or not isinstance(newmd.get("__metadata__"),dict):
+            print(f"file {cmdLine['metadata_file']} does not contain a top-level __metadata__ object",file=sys.stderr)
+            return -2
+        newmd={k:_MetadataString(v) for k,v in newmd["__metadata__"].items()}
+
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
+        js=s.get_header()
+        if cmdLine.get('keys') or cmdLine.get('globs') or cmdLine.get('regexes') or cmdLine.get('key_file'):
+            selected=_SelectKeys(js,cmdLine)
+            if selected is None: return -1
+        else:
+            selected=[k for k in js if k!="__metadata__"]
+        exclude_globs=cmdLine['exclude_globs']
+        exclude_regexes=[re.compile(x) for x in cmdLine['exclude_regexes']]
+        keep=set(k for k in selected if not any(fnmatch.fnmatchcase(k,g) for g in exclude_globs)
+                                    and not any(r.search(k) for r in exclude_regexes))
+        if len(keep)==0:
+            print("no tensors selected, nothing to write",file=sys.stderr)
+            return -1
+
+        if cmdLine['no_metadata']: metadata=None
+        elif newmd is not None: metadata=newmd
+        else: metadata=js.get("__metadata__")
+        # tensors stay in file order, header keys in the order of the input file
+        names=sorted(keep,key=lambda k:js[k]['data_offsets'][0])
+        packed,ranges,datalen=_PackTensors(js,names,metadata)
+        newjs={k:packed[k] for k in js if k in packed}
+        if "__metadata__" in packed and "__metadata__" not in newjs: newjs={"__metadata__":metadata,**newjs}
+        if not _WritePacked(cmdLine,output_file,newjs,[(s,ranges)],datalen): return -1
+        nTensors:int=sum(1 for k in js if k!="__metadata__")
+        nbytes:int=sum(js[k]['data_offsets'][1]-js[k]['data_offsets'][0] for k in js if k!="__metadata__")
+    if cmdLine['quiet']==False:
+        print(f"{len(names)} of {nTensors} tensors ({datalen} of {nbytes} bytes) saved to {output_file}")
+    return 0
+
+_MAX_ALIGN=4096 #alignments are counted up to this in the alignment report
+
+def _Alignment(x:int,align:int) -> int:
+    """Returns the largest power of two that divides x, at most align."""
+    return min(x&-x,align) if x>0 else align
+
+def _AlignedOrder(js:dict,names:list[str],align:int) -> list[str]:
+    """Returns names in the order that aligns most tensor data, when tensors are placed one
+    after another from an offset aligned to align: tensors that are a multiple of align
+    bytes long first, then by the largest power of two their size is a multiple of, each
+    group in file order. Every tensor then starts at a multiple of align, or of the largest
+    power of two its size is a multiple of. The format allows no gaps between tensors, so
+    no order can do better."""
+    order=sorted(names,key=lambda k:js[k]['data_offsets'][0])
+    return sorted(order,key=lambda k:-_Alignment(js[k]['data_offsets'][1]-js[k]['data_offsets'][0],align))
+
+def RepackFile(cmdLine:dict,input_file:str,output_file:str) -> int:
+    """Rewrites input_file as output_file with the data section starting at a multiple of
+    align bytes, and tensors ordered so that as many as possible start at a multiple of
+    align, see _AlignedOrder(). Header keys stay in the same order, data is copied by the OS."""
+    if _need_force_overwrite(output_file,cmdLine): return -1
+    align:int=cmdLine['align']
+    with SafeTensorsFile.open_file(input_file,cmdLine['quiet']) as s:
+        js=s.get_header()
+        names=_AlignedOrder(js,[k for k in js if k!="__metadata__"],align)
+        packed,ranges,datalen=_PackTensors(js,names,js.get("__metadata__"))
+        newjs={k:packed[k] for k in js}
+        if not _WritePacked(cmdLine,output_file,newjs,[(s,ranges)],datalen): return -1
+    if cmdLine['quiet']==False:
+        aligned=[k for k in names if packed[k]['data_offsets'][0]%align==0]
+        nbytes:int=sum(packed[k]['data_offsets'][1]-packed[k]['data_offsets'][0] for k in aligned)
+        print(f"{len(aligned)} of {len(names)} tensors ({nbytes} of {datalen} bytes) aligned to {align} bytes, saved to {output_file}")
+    return 0
+
+def _AlignmentOneFile(fn:str,align:int,cache) -> dict:
+    rec={"file":fn}
+    try:
+        with SafeTensorsFile.open_file(fn,quiet=True,cache=cache) as s:
+            js=s.get_header()
+            base:int=8+s.headerlen
+            names=[k for k in js if k!="__metadata__"]
+            hist:dict[int,list[int]]={}
+            aligned:int=0
+            total:int=0
+            for k in names:
+                b,e=js[k]['data_offsets']
+                a=_Alignment(base+b,_MAX_ALIGN)
+                h=hist.setdefault(a,[0,0])
+                h[0]+=1
+                h[1]+=e-b
+                total+=e-b
+                if (base+b)%align==0: aligned+=e-b
+            packed,_,_=_PackTensors(js,_AlignedOrder(js,names,align),None)
+            after:int=sum(t['data_offsets'][1]-t['data_offsets'][0] for t in packed.values() if t['data_offsets'][0]%align==0)
+        rec.update({"tensors":len(names),"bytes":total,"aligned_bytes":aligned,"aligned_bytes_after_repack":after,
+                    "histogram":{str(a):{"tensors":n,"bytes":nb} for a,(n,nb) in sorted(hist.items(),reverse=True)}})
+    except Exception as e:
+        rec["error"]=str(e)
+    return rec
+
+def AlignmentReport(cmdLine:dict,paths:list[str]) -> int:
+    """Prints one JSON line per file with a histogram of where its tensors start: how many
+    tensors and bytes start at a multiple of 4096, 2048, ... 1 bytes but not of the next
+    bigger power of two; and the bytes aligned to align bytes now and after repacking."""
+    align:int=cmdLine['align']
+    lock=threading.Lock()
+    gain:list[int]=[0,0]
+    def one(fn:str) -> dict:
+        rec=_AlignmentOneFile(fn,align,cmdLine.get('cache'))
+        if rec.get("aligned_bytes_after_repack",0)>rec.get("aligned_bytes",0):
+            with lock:
+                gain[0]+=1
+                gain[1]+=rec["aligned_bytes_after_repack"]-rec["aligned_bytes"]
+        return rec
+    nFiles,nErrors=_ForEachFileParallel(cmdLine,paths,one)
+    if cmdLine['quiet']==False:
+        print(f"{nFiles} files, {nErrors} errors, repacking would align {gain[1]} more bytes to {align} bytes in {gain[0]} files",file=sys.stderr)
+    return 0 if nErrors==0 else 1